@@ -0,0 +1,24 @@
+# benchmarks/conftest.py
+
+import matplotlib
+import pytest
+
+from brfss_diabetes.config import SEED
+from brfss_diabetes.synthetic import write_cleaned_years
+
+from .data import SIZES, YEARS
+
+matplotlib.use("Agg")
+
+
+@pytest.fixture(params=SIZES, ids=lambda n: f"{n:_}rows")
+def n_rows(request):
+    return request.param
+
+
+@pytest.fixture
+def cleaned_dir(tmp_path_factory, n_rows):
+    data_dir = tmp_path_factory.getbasetemp() / f"cleaned_{n_rows}"
+    if not data_dir.exists():
+        write_cleaned_years(YEARS, n_rows // len(YEARS), data_dir, seed=SEED)
+    return data_dir
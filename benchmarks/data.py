@@ -0,0 +1,36 @@
+# benchmarks/data.py
+
+import os
+from functools import lru_cache
+
+import numpy as np
+
+from brfss_diabetes.cleaning import clean_brfss
+from brfss_diabetes.config import SEED
+from brfss_diabetes.synthetic import make_raw_brfss
+
+YEARS = [2019, 2020, 2021, 2022, 2023]
+
+# Total rows per benchmark; override with e.g. BRFSS_BENCH_SIZES=10000,100000
+SIZES = [
+    int(size)
+    for size in os.environ.get("BRFSS_BENCH_SIZES", "10000,100000,2000000").split(",")
+]
+
+
+@lru_cache(maxsize=None)
+def raw_frame(n_rows, year=2023):
+    return make_raw_brfss(year, n_rows, seed=SEED)
+
+
+@lru_cache(maxsize=None)
+def cleaned_frame(n_rows, year=2023):
+    return clean_brfss(raw_frame(n_rows, year).copy(), year)
+
+
+@lru_cache(maxsize=None)
+def scores(n_rows):
+    rng = np.random.default_rng(SEED)
+    y_true = (rng.random(n_rows) < 0.13).astype(np.int64)
+    y_probs = np.clip(0.25 * y_true + 0.75 * rng.random(n_rows), 0, 1)
+    return y_true, y_probs
@@ -0,0 +1,51 @@
+# benchmarks/test_bench_cascade.py
+
+import numpy as np
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from sklearn.linear_model import LogisticRegression
+from xgboost import XGBClassifier
+
+from brfss_diabetes.cascade import cascade_predict, make_cascade, tune_band
+from brfss_diabetes.config import SEED
+from brfss_diabetes.evaluation import find_optimal_threshold
+from brfss_diabetes.inference import export_kernel
+
+N_FEATURES = 10
+
+
+def make_data(n, seed):
+    rng = np.random.default_rng([SEED, seed])
+    X = rng.normal(size=(n, N_FEATURES)).astype(np.float32)
+    z = 2 * X[:, 0] + X[:, 1] - 3 + 4 * (X[:, 2] * X[:, 3] > 0.5)
+    return X, (rng.random(n) < 1 / (1 + np.exp(-z))).astype(int)
+
+
+@pytest.fixture(scope="module")
+def cascade():
+    X_train, y_train = make_data(50_000, 0)
+    X_valid, y_valid = make_data(50_000, 1)
+    logistic = LogisticRegression(max_iter=1000).fit(X_train, y_train)
+    xgb = XGBClassifier(n_estimators=300, max_depth=6, random_state=SEED)
+    xgb.fit(X_train, y_train)
+
+    p_log = logistic.predict_proba(X_valid)[:, 1]
+    p_xgb = xgb.predict_proba(X_valid)[:, 1]
+    t_log = find_optimal_threshold(y_valid, p_log, 2.0)
+    t_xgb = find_optimal_threshold(y_valid, p_xgb, 2.0)
+    band = tune_band(y_valid, p_log, p_xgb, t_log, t_xgb)
+
+    kernel = export_kernel(logistic, [f"x{i}" for i in range(N_FEATURES)], t_log)
+    return make_cascade(kernel, xgb, band["low"], band["high"], t_xgb)
+
+
+def test_cascade_predict(benchmark, cascade, n_rows):
+    X, _ = make_data(n_rows, 2)
+    benchmark.pedantic(cascade_predict, args=(cascade, X), rounds=3)
+
+
+def test_xgboost_only_predict(benchmark, cascade, n_rows):
+    X, _ = make_data(n_rows, 2)
+    benchmark.pedantic(cascade["model"].predict_proba, args=(X,), rounds=3)
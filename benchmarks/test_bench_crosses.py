@@ -0,0 +1,57 @@
+# benchmarks/test_bench_crosses.py
+
+from functools import reduce
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from brfss_diabetes.cleaning import to_cleaned_layout
+from brfss_diabetes.crosses import CROSS_BINS, hash_crosses, make_crosses
+
+from .data import cleaned_frame
+
+COMMON_FEATURES = ["age", "sex", "educa", "bmi", "bmi_cat", "smoke_100", "exercise_any"]
+# The explicit crosses are dense, so their rows are capped
+MAX_EXPLICIT_ROWS = 100_000
+
+
+def cleaned(n_rows):
+    df = to_cleaned_layout(cleaned_frame(n_rows).copy())
+    return df.dropna(subset=COMMON_FEATURES + ["diabetes"])
+
+
+def test_hash_crosses(benchmark, n_rows):
+    df = cleaned(n_rows)[COMMON_FEATURES]
+    crosses = make_crosses(COMMON_FEATURES)
+    X = benchmark.pedantic(hash_crosses, args=(df, crosses), rounds=3)
+    benchmark.extra_info.update(
+        rows=X.shape[0],
+        crosses=len(crosses),
+        nbytes=X.data.nbytes + X.indices.nbytes + X.indptr.nbytes,
+    )
+
+
+def test_explicit_crosses(benchmark, n_rows):
+    # The get_dummies alternative over the same pairs and triples
+    df = cleaned(min(n_rows, MAX_EXPLICIT_ROWS))
+    edges = [-float("inf"), *CROSS_BINS["bmi"], float("inf")]
+    df = df.assign(bmi=pd.cut(df["bmi"], edges))[COMMON_FEATURES].astype(str)
+    crosses = make_crosses(COMMON_FEATURES)
+
+    def explicit():
+        crossed = pd.DataFrame(
+            {
+                "*".join(cross): reduce(
+                    lambda a, b: a + "|" + b, (df[f] for f in cross)
+                )
+                for cross in crosses
+            }
+        )
+        return pd.get_dummies(crossed)
+
+    X = benchmark.pedantic(explicit, rounds=3)
+    benchmark.extra_info.update(
+        rows=len(X), crosses=len(crosses), nbytes=int(X.memory_usage().sum())
+    )
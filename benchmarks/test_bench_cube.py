@@ -0,0 +1,34 @@
+# benchmarks/test_bench_cube.py
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from brfss_diabetes.cube import build_cube, marginal
+from brfss_diabetes.io import load_all_years
+
+from .data import YEARS
+
+
+def test_build_cube(benchmark, cleaned_dir):
+    benchmark.pedantic(
+        build_cube,
+        args=(YEARS, cleaned_dir),
+        kwargs={"weight_col": "survey_weight"},
+        rounds=3,
+    )
+
+
+def test_cube_prevalence_query(benchmark, cleaned_dir):
+    cube = build_cube(YEARS, cleaned_dir)
+    benchmark(marginal, cube, ["year", "sex"], age=[62, 67], bmi_cat="Obese")
+
+
+def test_groupby_prevalence_query(benchmark, cleaned_dir):
+    df_all = load_all_years(YEARS, data_dir=cleaned_dir)
+
+    def query():
+        rows = df_all[df_all["age"].isin([62, 67]) & (df_all["bmi_cat"] == "Obese")]
+        return rows.groupby(["year", "sex", "diabetes"]).size()
+
+    benchmark(query)
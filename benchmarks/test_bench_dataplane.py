@@ -0,0 +1,69 @@
+# benchmarks/test_bench_dataplane.py
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from brfss_diabetes.cleaning import to_cleaned_layout
+from brfss_diabetes.dataplane import attach, detach, publish_frame, release
+from brfss_diabetes.preprocessing import prepare_common_features
+
+from .data import cleaned_frame
+
+COMMON_FEATURES = ["age", "sex", "educa", "bmi", "bmi_cat", "smoke_100"]
+N_TASKS = 8
+
+
+@pytest.fixture(scope="module")
+def pool():
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        # Start the workers outside the timed rounds
+        list(executor.map(abs, range(2)))
+        yield executor
+
+
+def encoded(n_rows):
+    df = to_cleaned_layout(cleaned_frame(n_rows).copy())
+    return prepare_common_features(df, COMMON_FEATURES)
+
+
+def _pickled_task(args):
+    X, y, column = args
+    return float(X[y == 1, column].mean())
+
+
+def _shared_task(args):
+    spec, column = args
+    attached = attach(spec)
+    X, y = attached["arrays"]["X"], attached["arrays"]["y"]
+    mean = float(X[y == 1, column].mean())
+    del X, y
+    detach(attached)
+    return mean
+
+
+def test_dispatch_pickled(benchmark, pool, n_rows):
+    df_common = encoded(n_rows)
+    X = df_common.drop(columns="diabetes").to_numpy(dtype=np.float64)
+    y = df_common["diabetes"].to_numpy(dtype=np.int8)
+    tasks = [(X, y, i % X.shape[1]) for i in range(N_TASKS)]
+    benchmark.pedantic(lambda: list(pool.map(_pickled_task, tasks)), rounds=3)
+
+
+def test_dispatch_shared_memory(benchmark, pool, n_rows):
+    df_common = encoded(n_rows)
+
+    def run():
+        # Publishing and releasing are part of every round
+        plane = publish_frame(df_common)
+        try:
+            n_columns = len(plane["spec"]["columns"])
+            tasks = [(plane["spec"], i % n_columns) for i in range(N_TASKS)]
+            return list(pool.map(_shared_task, tasks))
+        finally:
+            release(plane)
+
+    benchmark.pedantic(run, rounds=3)
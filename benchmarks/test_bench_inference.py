@@ -0,0 +1,45 @@
+# benchmarks/test_bench_inference.py
+
+import numpy as np
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from sklearn.linear_model import LogisticRegression
+
+from brfss_diabetes.config import SEED
+from brfss_diabetes.inference import export_kernel, predict_proba
+
+BATCH_SIZES = [1, 100, 10_000, 1_000_000]
+N_FEATURES = 20
+
+
+@pytest.fixture(scope="module")
+def fitted():
+    rng = np.random.default_rng(SEED)
+    X = rng.random((20_000, N_FEATURES), dtype=np.float32)
+    y = (X[:, 0] + 0.5 * rng.random(len(X)) > 0.8).astype(int)
+    model = LogisticRegression(max_iter=1000).fit(X, y)
+    kernel = export_kernel(model, [f"x{i}" for i in range(N_FEATURES)])
+    return model, kernel
+
+
+def batch(n_rows):
+    rng = np.random.default_rng(SEED)
+    return rng.random((n_rows, N_FEATURES), dtype=np.float32)
+
+
+@pytest.mark.parametrize("n_rows", BATCH_SIZES)
+def test_kernel_predict_proba(benchmark, fitted, n_rows):
+    _, kernel = fitted
+    X = batch(n_rows)
+    benchmark.extra_info["rows"] = n_rows
+    benchmark(predict_proba, kernel, X)
+
+
+@pytest.mark.parametrize("n_rows", BATCH_SIZES)
+def test_sklearn_predict_proba(benchmark, fitted, n_rows):
+    model, _ = fitted
+    X = batch(n_rows)
+    benchmark.extra_info["rows"] = n_rows
+    benchmark(model.predict_proba, X)
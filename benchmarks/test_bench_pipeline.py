@@ -0,0 +1,65 @@
+# benchmarks/test_bench_pipeline.py
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+import matplotlib.pyplot as plt
+
+from brfss_diabetes.cleaning import clean_brfss, to_cleaned_layout
+from brfss_diabetes.evaluation import find_optimal_threshold, plot_classification_report
+from brfss_diabetes.io import load_all_years
+from brfss_diabetes.preprocessing import prepare_common_features
+
+from .data import YEARS, cleaned_frame, raw_frame, scores
+
+common_features = ["age", "sex", "educa", "bmi", "bmi_cat", "smoke_100", "exercise_any"]
+
+
+def test_clean_brfss(benchmark, n_rows):
+    df = raw_frame(n_rows)
+    # clean_brfss mutates its input, so every round gets a fresh copy
+    benchmark.pedantic(
+        clean_brfss, setup=lambda: ((df.copy(), 2023), {}), rounds=3, iterations=1
+    )
+
+
+def test_load_all_years(benchmark, cleaned_dir):
+    benchmark.pedantic(
+        load_all_years, args=(YEARS,), kwargs={"data_dir": cleaned_dir}, rounds=3
+    )
+
+
+def test_load_all_years_sample(benchmark, cleaned_dir, n_rows):
+    benchmark.pedantic(
+        load_all_years,
+        args=(YEARS,),
+        kwargs={"data_dir": cleaned_dir, "sample_size": max(n_rows // 100, 1)},
+        rounds=3,
+    )
+
+
+def test_prepare_common_features(benchmark, n_rows):
+    df = to_cleaned_layout(cleaned_frame(n_rows).copy())
+    benchmark.pedantic(prepare_common_features, args=(df, common_features), rounds=3)
+
+
+def test_find_optimal_threshold(benchmark, n_rows):
+    y_true, y_probs = scores(n_rows)
+    benchmark.pedantic(
+        find_optimal_threshold, args=(y_true, y_probs), kwargs={"beta": 2.0}, rounds=5
+    )
+
+
+def test_plot_classification_report(benchmark, n_rows, tmp_path):
+    y_true, y_probs = scores(n_rows)
+    y_pred = (y_probs >= 0.5).astype(int)
+    save_path = tmp_path / "report.png"
+
+    benchmark.pedantic(
+        plot_classification_report,
+        args=(y_true, y_pred),
+        kwargs={"save_path": save_path},
+        teardown=lambda *args, **kwargs: plt.close("all"),
+        rounds=3,
+    )
@@ -0,0 +1,84 @@
+# benchmarks/test_bench_resources.py
+
+# Wall time of a 5-fold XGBoost CV run on a process pool, with every worker
+# left to claim all cores (XGBoost's default nthread and BLAS's own pools)
+# versus workers and threads sized from the package CPU budget.
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from sklearn.model_selection import StratifiedKFold
+
+from brfss_diabetes.cleaning import to_cleaned_layout
+from brfss_diabetes.config import SEED
+from brfss_diabetes.dataplane import attach, detach, publish_frame, release
+from brfss_diabetes.preprocessing import prepare_common_features
+from brfss_diabetes.resources import available_cores, init_worker_threads, plan
+
+from .data import cleaned_frame
+
+COMMON_FEATURES = ["age", "sex", "educa", "bmi", "bmi_cat", "smoke_100"]
+N_FOLDS = 5
+# CV fits are much slower than the other stages, so rows are capped
+MAX_ROWS = 200_000
+
+
+def _fit_fold(task):
+    from sklearn.metrics import roc_auc_score
+    from xgboost import XGBClassifier
+
+    spec, train, test, threads = task
+    attached = attach(spec)
+    X, y = attached["arrays"]["X"], attached["arrays"]["y"]
+    model = XGBClassifier(n_estimators=100, random_state=SEED, n_jobs=threads)
+    model.fit(X[train], y[train])
+    auc = roc_auc_score(y[test], model.predict_proba(X[test])[:, 1])
+    del X, y
+    detach(attached)
+    return auc
+
+
+def run_cv(df_common, workers, threads, initializer=None):
+    plane = publish_frame(df_common)
+    try:
+        y = df_common["diabetes"].to_numpy()
+        folds = StratifiedKFold(N_FOLDS, shuffle=True, random_state=SEED)
+        tasks = [
+            (plane["spec"], train, test, threads)
+            for train, test in folds.split(np.zeros(len(y)), y)
+        ]
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=initializer,
+            initargs=(threads,) if initializer else (),
+        ) as pool:
+            return list(pool.map(_fit_fold, tasks))
+    finally:
+        release(plane)
+
+
+@pytest.fixture
+def df_common(n_rows):
+    df = to_cleaned_layout(cleaned_frame(min(n_rows, MAX_ROWS)).copy())
+    return prepare_common_features(df, COMMON_FEATURES)
+
+
+def test_cv_unmanaged_threads(benchmark, df_common):
+    # One worker per fold, each with XGBoost's default of every core
+    benchmark.extra_info["cores"] = available_cores()
+    benchmark.pedantic(run_cv, args=(df_common, N_FOLDS, None), rounds=3)
+
+
+def test_cv_budgeted_threads(benchmark, df_common):
+    resources = plan(N_FOLDS)
+    benchmark.extra_info.update(cores=available_cores(), **resources)
+    benchmark.pedantic(
+        run_cv,
+        args=(df_common, resources["workers"], resources["threads"]),
+        kwargs={"initializer": init_worker_threads},
+        rounds=3,
+    )
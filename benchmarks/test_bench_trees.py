@@ -0,0 +1,86 @@
+# benchmarks/test_bench_trees.py
+
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from xgboost import XGBClassifier
+
+from brfss_diabetes.config import SEED
+from brfss_diabetes.trees import export_trees, predict_proba
+
+BATCH_SIZES = [1, 100, 10_000, 100_000]
+N_FEATURES = 20
+
+
+@pytest.fixture(scope="module")
+def fitted(tmp_path_factory):
+    rng = np.random.default_rng(SEED)
+    X = rng.normal(size=(50_000, N_FEATURES)).astype(np.float32)
+    y = (X[:, 0] + X[:, 1] * X[:, 2] + rng.normal(size=len(X)) > 0.5).astype(int)
+    model = XGBClassifier(n_estimators=300, max_depth=6, random_state=SEED)
+    model.fit(X, y)
+
+    model_dir = tmp_path_factory.mktemp("trees")
+    model.save_model(model_dir / "model.ubj")
+    trees = export_trees(model, model_dir / "trees.npz")
+    return model, trees, model_dir
+
+
+def batch(n_rows):
+    rng = np.random.default_rng(SEED)
+    return rng.normal(size=(n_rows, N_FEATURES)).astype(np.float32)
+
+
+@pytest.mark.parametrize("n_rows", BATCH_SIZES)
+def test_trees_predict_proba(benchmark, fitted, n_rows):
+    _, trees, _ = fitted
+    X = batch(n_rows)
+    benchmark.extra_info["rows"] = n_rows
+    benchmark.pedantic(predict_proba, args=(trees, X), rounds=3)
+
+
+@pytest.mark.parametrize("n_rows", BATCH_SIZES)
+def test_xgboost_predict_proba(benchmark, fitted, n_rows):
+    model, _, _ = fitted
+    X = batch(n_rows)
+    benchmark.extra_info["rows"] = n_rows
+    benchmark.pedantic(model.predict_proba, args=(X,), rounds=3)
+
+
+# Cold start: a fresh interpreter that loads the model and scores one row,
+# as a scoring worker or CLI call would
+COLD_START = {
+    "trees": (
+        "import numpy as np\n"
+        "from brfss_diabetes.trees import load_trees, predict_proba\n"
+        "trees = load_trees({path!r})\n"
+        "predict_proba(trees, np.zeros((1, {n}), dtype=np.float32))\n",
+        "trees.npz",
+    ),
+    "xgboost": (
+        "import numpy as np\n"
+        "from xgboost import XGBClassifier\n"
+        "model = XGBClassifier()\n"
+        "model.load_model({path!r})\n"
+        "model.predict_proba(np.zeros((1, {n}), dtype=np.float32))\n",
+        "model.ubj",
+    ),
+}
+
+
+@pytest.mark.parametrize("scorer", list(COLD_START))
+def test_cold_start(benchmark, fitted, scorer):
+    _, _, model_dir = fitted
+    template, name = COLD_START[scorer]
+    code = template.format(path=str(model_dir / name), n=N_FEATURES)
+    benchmark.pedantic(
+        subprocess.run,
+        args=([sys.executable, "-c", code],),
+        kwargs={"check": True},
+        rounds=3,
+    )
@@ -0,0 +1,43 @@
+# benchmarks/test_bench_xport.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from brfss_diabetes.config import SEED, SURVEY_DESIGN_VARS, VARS_BY_YEAR, VARS_COMMON
+from brfss_diabetes.xport import read_xport, write_xport
+
+from .data import raw_frame
+
+KEEP = VARS_COMMON + SURVEY_DESIGN_VARS + VARS_BY_YEAR[2023]
+
+# An LLCP file has ~350 variables, of which load_data.py keeps ~15
+N_VARIABLES = 350
+
+
+@pytest.fixture
+def xpt_path(n_rows, tmp_path_factory):
+    if n_rows > 200_000:
+        pytest.skip("XPT fixture is ~2.8 kB per row")
+    rng = np.random.default_rng(SEED)
+    raw = raw_frame(n_rows)
+    filler = pd.DataFrame(
+        rng.integers(1, 10, (n_rows, N_VARIABLES - raw.shape[1])).astype(float),
+        columns=[f"X{i:03d}" for i in range(N_VARIABLES - raw.shape[1])],
+    )
+    path = tmp_path_factory.mktemp("xpt") / "LLCP2023.XPT"
+    write_xport(pd.concat([filler, raw], axis=1), path)
+    return path
+
+
+def test_read_xport_selected(benchmark, xpt_path):
+    benchmark.pedantic(read_xport, args=(xpt_path, KEEP), rounds=3)
+
+
+def test_read_sas_then_subset(benchmark, xpt_path):
+    def read_sas():
+        return pd.read_sas(xpt_path, format="xport", encoding="utf-8")[KEEP]
+
+    benchmark.pedantic(read_sas, rounds=3)
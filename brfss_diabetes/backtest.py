@@ -0,0 +1,360 @@
+# brfss_diabetes/backtest.py
+
+import hashlib
+import json
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .config import SEED
+from .eda import file_hash
+from .incremental import encode_chunk
+from .instrumentation import instrument
+from .io import _csv_source, iter_csv_chunks
+from .resources import init_worker_threads, limit_threads, plan
+
+_CACHE_VERSION = 1
+
+# Share of each training window held out to tune the thresholds on
+VALID_FRACTION = 0.2
+_ARRAYS = ("X", "y", "w")
+
+
+def make_windows(years, mode="expanding", train_size=1) -> list:
+    """
+    Train-on-past / test-on-future windows: every year after the first
+    train_size years is a test year, trained on all earlier years
+    ("expanding") or on the train_size years right before it ("rolling").
+
+    Parameters:
+        years (list of int): Years available, in any order.
+        mode (str): "expanding" or "rolling".
+        train_size (int): Training years of a rolling window, and the
+            minimum of an expanding one.
+
+    Returns:
+        list of tuple: (train_years, test_year), oldest test year first.
+    """
+    if not isinstance(years, list) or not all(isinstance(y, int) for y in years):
+        raise ValueError("`years` must be a list of integers")
+
+    if mode not in ("expanding", "rolling"):
+        raise ValueError(f"`mode` must be 'expanding' or 'rolling', got {mode}")
+
+    if not isinstance(train_size, int) or train_size <= 0:
+        raise ValueError(f"`train_size` must be a positive int, got {train_size}")
+
+    years = sorted(set(years))
+    windows = []
+    for i in range(train_size, len(years)):
+        start = 0 if mode == "expanding" else i - train_size
+        windows.append((years[start:i], years[i]))
+    return windows
+
+
+@instrument()
+def encode_year(
+    year,
+    common_features,
+    data_dir=Path("../data/cleaned"),
+    cache_dir=None,
+    weight_col=None,
+    chunksize=100_000,
+) -> dict:
+    """
+    Encode one year's cleaned file with the fixed layout of encode_chunk and
+    store X, y and w as .npy files, keyed by the file's content hash, the
+    features and the weight column. Later calls (and other windows or
+    worker processes) load the stored arrays instead of re-encoding.
+
+    Parameters:
+        year (int): Year to encode.
+        common_features (list[str]): Feature names to encode.
+        data_dir (Path): Directory containing cleaned CSVs.
+        cache_dir (Path): Where the encoded arrays are kept.
+        weight_col (str, optional): Survey weight column for w.
+        chunksize (int): Rows per chunk when the year has to be encoded.
+
+    Returns:
+        dict: year, feature_names and the .npy paths of X, y and w.
+    """
+    if not isinstance(cache_dir, Path):
+        raise ValueError(f"`cache_dir` must be a pathlib.Path, got {type(cache_dir)}")
+
+    source = _csv_source(year, data_dir)
+    if not isinstance(source, Path):
+        raise ValueError(f"Cannot cache remote data for {year}: {source}")
+
+    key = _encoding_key(source, common_features, weight_col)
+    year_dir = cache_dir / f"encoded_{year}_{key}"
+    meta_path = year_dir / "meta.json"
+    entry = {
+        "year": year,
+        **{name: year_dir / f"{name}.npy" for name in _ARRAYS},
+    }
+    if meta_path.exists():
+        with open(meta_path) as f:
+            entry["feature_names"] = json.load(f)["feature_names"]
+        return entry
+
+    usecols = common_features + ([weight_col] if weight_col else []) + ["diabetes"]
+    parts = {name: [] for name in _ARRAYS}
+    names = None
+    for chunk in iter_csv_chunks(
+        year, data_dir=data_dir, chunksize=chunksize, usecols=usecols
+    ):
+        X, y, names, w = encode_chunk(chunk, common_features, weight_col)
+        for name, array in zip(_ARRAYS, (X, y, w)):
+            parts[name].append(array)
+
+    if names is None:
+        raise ValueError(f"No rows found for {year}")
+
+    year_dir.mkdir(parents=True, exist_ok=True)
+    for name in _ARRAYS:
+        np.save(entry[name], np.concatenate(parts[name]))
+    # meta.json last: its presence marks the arrays as complete
+    with open(meta_path, "w") as f:
+        json.dump({"year": year, "feature_names": names}, f)
+
+    entry["feature_names"] = names
+    return entry
+
+
+@instrument()
+def backtest(
+    years,
+    common_features,
+    data_dir=Path("../data/cleaned"),
+    mode="expanding",
+    train_size=1,
+    models=("logistic", "xgboost"),
+    n_jobs=1,
+    cache_dir=None,
+    weight_col=None,
+    seed=SEED,
+) -> pd.DataFrame:
+    """
+    Fit every model on every train-on-past window and score it on the
+    following year. Each year is encoded once (see encode_year); the fits
+    run in a process pool that memory-maps the stored arrays, sized from
+    the package CPU budget (see resources.plan) so workers x threads stays
+    within it.
+
+    Thresholds (best F2 and the precision/recall crossover) are tuned on a
+    stratified validation slice of the training window (VALID_FRACTION of
+    its rows, left out of the fit) and then applied to the test year, next
+    to the threshold that would have been best on the test year itself.
+
+    Parameters:
+        years (list of int): Years to backtest over.
+        common_features (list[str]): Feature names to encode.
+        data_dir (Path): Directory containing cleaned CSVs.
+        mode (str): "expanding" or "rolling" windows (see make_windows).
+        train_size (int): Training years per rolling window / minimum.
+        models (tuple of str): Any of "logistic" and "xgboost".
+        n_jobs (int): Worker processes, capped at the CPU budget; 1 fits in
+            this process.
+        cache_dir (Path, optional): Where encoded years are kept. A temporary
+            directory is used (and removed) if not given.
+        weight_col (str, optional): Survey weight column; rows are weighted
+            in the fits, the metrics and the thresholds.
+        seed (int): Seed for the models.
+
+    Returns:
+        pd.DataFrame: One row per (window, model) with train_years, test_year,
+        model, n_train (rows fitted), n_valid (rows tuned on), n_test, auc, pr_auc, threshold_f2, crosspoint,
+        test_threshold_f2, f2 (at the tuned threshold) and test_f2 (at the
+        test year's best).
+    """
+    unknown = [name for name in models if name not in _MODELS]
+    if unknown:
+        raise ValueError(f"Unknown models {unknown}; choose from {list(_MODELS)}")
+
+    if not isinstance(n_jobs, int) or n_jobs <= 0:
+        raise ValueError(f"`n_jobs` must be a positive int, got {n_jobs}")
+
+    if cache_dir is not None and not isinstance(cache_dir, Path):
+        raise ValueError(f"`cache_dir` must be a pathlib.Path, got {type(cache_dir)}")
+
+    windows = make_windows(years, mode=mode, train_size=train_size)
+    if not windows:
+        raise ValueError(f"{years} leaves no test year with train_size={train_size}")
+
+    resources = plan(n_jobs)
+    cleanup = cache_dir is None
+    cache_dir = Path(tempfile.mkdtemp()) if cleanup else cache_dir
+
+    try:
+        encoded = {
+            year: encode_year(year, common_features, data_dir, cache_dir, weight_col)
+            for year in sorted({y for train, test in windows for y in [*train, test]})
+        }
+        tasks = [
+            (
+                [encoded[y] for y in train],
+                encoded[test],
+                name,
+                seed,
+                weight_col is not None,
+                resources["threads"],
+            )
+            for train, test in windows
+            for name in models
+        ]
+        if resources["workers"] == 1:
+            with limit_threads(resources["threads"]):
+                rows = [_fit_window(task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(
+                max_workers=resources["workers"],
+                initializer=init_worker_threads,
+                initargs=(resources["threads"],),
+            ) as pool:
+                rows = list(pool.map(_fit_window, tasks))
+    finally:
+        if cleanup:
+            shutil.rmtree(cache_dir, ignore_errors=True)
+
+    return pd.DataFrame(rows)
+
+
+def threshold_stability(report: pd.DataFrame) -> pd.DataFrame:
+    """
+    How much each model's tuned thresholds move across windows, and how much
+    F2 is lost by using the threshold tuned on the training window on the
+    next year.
+
+    Parameters:
+        report (pd.DataFrame): Output of backtest.
+
+    Returns:
+        pd.DataFrame: One row per model with the mean, std and range of
+        threshold_f2 and crosspoint, the mean AUC and PR-AUC, and the mean
+        f2_regret (test_f2 - f2).
+    """
+    if not isinstance(report, pd.DataFrame):
+        raise ValueError(f"`report` must be a pandas DataFrame, got {type(report)}")
+
+    report = report.assign(f2_regret=report["test_f2"] - report["f2"])
+    grouped = report.groupby("model", sort=False)
+    summary = pd.DataFrame(
+        {
+            "windows": grouped.size(),
+            "auc_mean": grouped["auc"].mean(),
+            "pr_auc_mean": grouped["pr_auc"].mean(),
+            "threshold_f2_mean": grouped["threshold_f2"].mean(),
+            "threshold_f2_std": grouped["threshold_f2"].std(ddof=0),
+            "threshold_f2_range": grouped["threshold_f2"].agg(np.ptp),
+            "crosspoint_mean": grouped["crosspoint"].mean(),
+            "crosspoint_std": grouped["crosspoint"].std(ddof=0),
+            "crosspoint_range": grouped["crosspoint"].agg(np.ptp),
+            "f2_regret_mean": grouped["f2_regret"].mean(),
+        }
+    )
+    return summary.reset_index()
+
+
+def _encoding_key(source, common_features, weight_col):
+    digest = hashlib.sha256(file_hash(source).encode())
+    digest.update(json.dumps([_CACHE_VERSION, common_features, weight_col]).encode())
+    return digest.hexdigest()[:16]
+
+
+def _load_years(entries):
+    arrays = {
+        name: [np.load(entry[name], mmap_mode="r") for entry in entries]
+        for name in _ARRAYS
+    }
+    return tuple(
+        parts[0] if len(parts) == 1 else np.concatenate(parts)
+        for parts in arrays.values()
+    )
+
+
+def _logistic(seed, **_):
+    from sklearn.linear_model import LogisticRegression
+
+    # Its BLAS threads are capped by the pool initializer / limit_threads
+    return LogisticRegression(max_iter=1000, class_weight="balanced", random_state=seed)
+
+
+def _xgboost(seed, y, w, threads):
+    from xgboost import XGBClassifier
+
+    # Class balance on (weighted) totals, like class_weight="balanced"
+    positives = w[y == 1].sum()
+    if positives <= 0:
+        raise ValueError(
+            "The training window has no positive (weighted) rows, so "
+            "scale_pos_weight is undefined"
+        )
+
+    return XGBClassifier(
+        random_state=seed,
+        eval_metric="logloss",
+        scale_pos_weight=(w.sum() - positives) / positives,
+        n_jobs=threads,
+    )
+
+
+_MODELS = {"logistic": _logistic, "xgboost": _xgboost}
+
+
+def _fit_window(task):
+    from sklearn.metrics import average_precision_score, fbeta_score, roc_auc_score
+    from sklearn.model_selection import train_test_split
+
+    from .evaluation import find_crosspoint_threshold, find_optimal_threshold
+
+    train_entries, test_entry, name, seed, weighted, threads = task
+    X_window, y_window, w_window = _load_years(train_entries)
+    X_test, y_test, w_test = _load_years([test_entry])
+    w_window = np.asarray(w_window)
+    w_test = np.asarray(w_test) if weighted else None
+
+    # Scores of rows the model was fitted on are over-confident, so the
+    # thresholds are tuned on rows it has not seen
+    fit_idx, valid_idx = train_test_split(
+        np.arange(len(y_window)),
+        test_size=VALID_FRACTION,
+        stratify=y_window,
+        random_state=seed,
+    )
+    fit_idx.sort()
+    valid_idx.sort()
+    y_train, w_train = y_window[fit_idx], w_window[fit_idx]
+    y_valid = y_window[valid_idx]
+    valid_weight = w_window[valid_idx] if weighted else None
+
+    model = _MODELS[name](seed=seed, y=y_train, w=w_train, threads=threads)
+    model.fit(X_window[fit_idx], y_train, sample_weight=w_train if weighted else None)
+
+    p_valid = model.predict_proba(X_window[valid_idx])[:, 1]
+    p_test = model.predict_proba(X_test)[:, 1]
+
+    threshold_f2 = float(find_optimal_threshold(y_valid, p_valid, 2.0, valid_weight))
+    test_threshold_f2 = float(find_optimal_threshold(y_test, p_test, 2.0, w_test))
+
+    def f2(threshold):
+        return fbeta_score(y_test, p_test >= threshold, beta=2.0, sample_weight=w_test)
+
+    return {
+        "train_years": [entry["year"] for entry in train_entries],
+        "test_year": test_entry["year"],
+        "model": name,
+        "n_train": len(y_train),
+        "n_valid": len(y_valid),
+        "n_test": len(y_test),
+        "auc": roc_auc_score(y_test, p_test, sample_weight=w_test),
+        "pr_auc": average_precision_score(y_test, p_test, sample_weight=w_test),
+        "threshold_f2": threshold_f2,
+        "crosspoint": float(find_crosspoint_threshold(y_valid, p_valid, valid_weight)),
+        "test_threshold_f2": test_threshold_f2,
+        "f2": f2(threshold_f2),
+        "test_f2": f2(test_threshold_f2),
+    }
@@ -0,0 +1,225 @@
+# brfss_diabetes/cascade.py
+
+# Two-stage scoring: the logistic kernel scores every row, and only rows
+# whose logistic probability falls inside an uncertainty band go on to the
+# second-stage model (XGBoost). Rows below the band are negative, rows above
+# it positive; the band is tuned offline so F-beta stays within a tolerance
+# of scoring everything with the second-stage model.
+
+import time
+
+import numpy as np
+
+from .inference import predict_proba as kernel_predict_proba
+
+
+def make_cascade(kernel: dict, model, low, high, threshold) -> dict:
+    """
+    Bundle a logistic kernel and a second-stage model into a cascade.
+
+    Parameters:
+        kernel (dict): Logistic kernel from inference.export_kernel.
+        model: Second-stage classifier with predict_proba, e.g. XGBClassifier,
+            fit on the same encoded columns.
+        low (float): Logistic probabilities below this are negative.
+        high (float): Logistic probabilities above this are positive.
+        threshold (float): Decision threshold of the second-stage model.
+
+    Returns:
+        dict: The cascade.
+    """
+    if not isinstance(kernel, dict) or "coef" not in kernel:
+        raise ValueError("`kernel` must be an inference kernel")
+
+    if not hasattr(model, "predict_proba"):
+        raise ValueError(f"`model` must have predict_proba, got {type(model)}")
+
+    if not 0 <= low <= high <= 1:
+        raise ValueError(f"Need 0 <= low <= high <= 1, got low={low}, high={high}")
+
+    if not 0 <= threshold <= 1:
+        raise ValueError(f"`threshold` must be between 0 and 1, got {threshold}")
+
+    return {
+        "kernel": kernel,
+        "model": model,
+        "low": float(low),
+        "high": float(high),
+        "threshold": float(threshold),
+    }
+
+
+def cascade_predict_proba(cascade: dict, X):
+    """
+    Score rows with the cascade: logistic probabilities outside the band,
+    second-stage probabilities inside it.
+
+    Parameters:
+        cascade (dict): Output of make_cascade.
+        X (array-like or pd.DataFrame): Encoded rows.
+
+    Returns:
+        tuple: (probs, escalated) with the float64 probabilities and a bool
+        mask of the rows scored by the second stage.
+    """
+    probs = kernel_predict_proba(cascade["kernel"], X).astype(np.float64)
+    escalated = (probs >= cascade["low"]) & (probs <= cascade["high"])
+
+    rows = np.flatnonzero(escalated)
+    if len(rows):
+        band = X.iloc[rows] if hasattr(X, "iloc") else np.asarray(X)[rows]
+        probs[rows] = cascade["model"].predict_proba(band)[:, 1]
+    return probs, escalated
+
+
+def cascade_predict(cascade: dict, X) -> np.ndarray:
+    """
+    0/1 predictions: the band's side outside it, the second-stage threshold
+    inside it.
+
+    Returns:
+        np.ndarray: int8 labels, one per row.
+    """
+    probs, escalated = cascade_predict_proba(cascade, X)
+    return _decide(probs, escalated, cascade["high"], cascade["threshold"])
+
+
+def tune_band(
+    y_true,
+    p_logistic,
+    p_model,
+    threshold_logistic,
+    threshold_model,
+    beta=2.0,
+    tolerance=0.005,
+    sample_weight=None,
+    grid=41,
+) -> dict:
+    """
+    Pick the narrowest uncertainty band around the logistic threshold whose
+    cascade keeps F-beta within `tolerance` of the second-stage model alone,
+    from validation-set predictions of both models. Band edges are searched
+    over quantiles of the logistic probabilities on either side of the
+    threshold.
+
+    Parameters:
+        y_true (array-like): 0/1 validation labels.
+        p_logistic (array-like): Logistic probabilities.
+        p_model (array-like): Second-stage probabilities.
+        threshold_logistic (float): Tuned logistic threshold (e.g. best F2).
+        threshold_model (float): Tuned second-stage threshold.
+        beta (float): F-beta to preserve (2.0 for F2, 0.5 for F0.5).
+        tolerance (float): Allowed F-beta loss against the second stage alone.
+        sample_weight (array-like, optional): Row weights.
+        grid (int): Candidate edges per side.
+
+    Returns:
+        dict: low, high, escalated (weighted share of rows in the band),
+        f_beta (cascade) and f_beta_model (second stage alone).
+    """
+    y = np.asarray(y_true).astype(bool)
+    p_log = np.asarray(p_logistic, dtype=np.float64)
+    p_mod = np.asarray(p_model, dtype=np.float64)
+    if not (len(y) == len(p_log) == len(p_mod)) or len(y) == 0:
+        raise ValueError(
+            "`y_true`, `p_logistic` and `p_model` must be non-empty and aligned"
+        )
+
+    if not isinstance(tolerance, (int, float)) or tolerance < 0:
+        raise ValueError(f"`tolerance` must be a non-negative number, got {tolerance}")
+
+    w = np.ones(len(y)) if sample_weight is None else np.asarray(sample_weight, float)
+    model_positive = p_mod >= threshold_model
+    target = _f_beta(y, model_positive, w, beta)
+
+    below = p_log[p_log < threshold_logistic]
+    above = p_log[p_log >= threshold_logistic]
+    levels = np.linspace(0, 1, grid)
+    lows = np.unique(
+        np.r_[np.quantile(below, levels) if len(below) else [], 0.0, threshold_logistic]
+    )
+    highs = np.unique(
+        np.r_[np.quantile(above, levels) if len(above) else [], 1.0, threshold_logistic]
+    )
+
+    # low=0, high=1 escalates every row and always qualifies
+    best = None
+    total = w.sum()
+    for low in lows:
+        for high in highs:
+            escalated = (p_log >= low) & (p_log <= high)
+            share = w[escalated].sum() / total
+            if best is not None and share >= best["escalated"]:
+                continue
+            positive = np.where(escalated, model_positive, p_log > high)
+            score = _f_beta(y, positive, w, beta)
+            if score >= target - tolerance:
+                best = {
+                    "low": float(low),
+                    "high": float(high),
+                    "escalated": float(share),
+                    "f_beta": score,
+                    "f_beta_model": target,
+                }
+    return best
+
+
+def cascade_report(cascade: dict, X, y_true=None, beta=2.0, sample_weight=None) -> dict:
+    """
+    Time the cascade against the second-stage model alone on the same rows
+    and, given labels, compare their F-beta.
+
+    Parameters:
+        cascade (dict): Output of make_cascade.
+        X (array-like or pd.DataFrame): Encoded rows.
+        y_true (array-like, optional): 0/1 labels.
+        beta (float): F-beta to report.
+        sample_weight (array-like, optional): Row weights for F-beta.
+
+    Returns:
+        dict: rows, escalated (share of rows), seconds_cascade, seconds_model,
+        throughput_gain (seconds_model / seconds_cascade) and, with labels,
+        f_beta and f_beta_model.
+    """
+    start = time.perf_counter()
+    probs, escalated = cascade_predict_proba(cascade, X)
+    predicted = _decide(probs, escalated, cascade["high"], cascade["threshold"])
+    seconds_cascade = time.perf_counter() - start
+
+    start = time.perf_counter()
+    p_model = cascade["model"].predict_proba(X)[:, 1]
+    seconds_model = time.perf_counter() - start
+
+    report = {
+        "rows": len(probs),
+        "escalated": float(escalated.mean()) if len(probs) else 0.0,
+        "seconds_cascade": seconds_cascade,
+        "seconds_model": seconds_model,
+        "throughput_gain": seconds_model / seconds_cascade,
+    }
+    if y_true is not None:
+        y = np.asarray(y_true).astype(bool)
+        w = (
+            np.ones(len(y))
+            if sample_weight is None
+            else np.asarray(sample_weight, float)
+        )
+        report["f_beta"] = _f_beta(y, predicted.astype(bool), w, beta)
+        report["f_beta_model"] = _f_beta(y, p_model >= cascade["threshold"], w, beta)
+    return report
+
+
+def _decide(probs, escalated, high, threshold):
+    positive = np.where(escalated, probs >= threshold, probs > high)
+    return positive.astype(np.int8)
+
+
+def _f_beta(y, positive, w, beta):
+    tp = w[y & positive].sum()
+    predicted = w[positive].sum()
+    actual = w[y].sum()
+    if tp == 0:
+        return 0.0
+    precision = tp / predicted
+    recall = tp / actual
+    return float((1 + beta**2) * precision * recall / (beta**2 * precision + recall))
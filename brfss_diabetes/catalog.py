@@ -0,0 +1,182 @@
+# brfss_diabetes/catalog.py
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .eda import file_hash
+from .io import _csv_source, iter_csv_chunks
+
+# Default catalog location, next to the cleaned files it describes
+CATALOG_FILE = "catalog.json"
+_CATALOG_VERSION = 1
+
+
+def build_catalog(
+    years, data_dir=Path("../data/cleaned"), catalog_path=None, chunksize=100_000
+) -> dict:
+    """
+    Describe the cleaned file of every year: columns, dtypes, row count,
+    non-null counts and content hash. With a catalog path, the stored
+    catalog is updated in place; a year whose file size and modification
+    time are unchanged is taken from it without opening the file.
+
+    Parameters:
+        years (list of int): Years to catalog.
+        data_dir (Path): Directory containing cleaned CSVs.
+        catalog_path (Path, optional): Where the catalog is persisted.
+        chunksize (int): Rows per chunk when a file has to be read.
+
+    Returns:
+        dict: {"version": ..., "files": {"<year>": entry}}.
+    """
+    if not isinstance(years, list) or not all(isinstance(y, int) for y in years):
+        raise ValueError("`years` must be a list of integers")
+
+    if catalog_path is not None and not isinstance(catalog_path, Path):
+        raise ValueError(
+            f"`catalog_path` must be a pathlib.Path, got {type(catalog_path)}"
+        )
+
+    catalog = {"version": _CATALOG_VERSION, "files": {}}
+    if catalog_path is not None and catalog_path.exists():
+        stored = load_catalog(catalog_path)
+        if stored.get("version") == _CATALOG_VERSION:
+            catalog = stored
+
+    changed = False
+    for year in years:
+        source = _csv_source(year, data_dir)
+        if not isinstance(source, Path):
+            raise ValueError(f"Cannot catalog remote data for {year}: {source}")
+
+        entry = catalog["files"].get(str(year))
+        stat = source.stat()
+        if entry and (entry["size"], entry["mtime_ns"]) == (
+            stat.st_size,
+            stat.st_mtime_ns,
+        ):
+            continue
+
+        digest = file_hash(source)
+        if entry and entry["hash"] == digest:
+            entry.update(size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+        else:
+            entry = _describe(year, data_dir, chunksize)
+            entry.update(
+                file=source.name,
+                hash=digest,
+                size=stat.st_size,
+                mtime_ns=stat.st_mtime_ns,
+            )
+        catalog["files"][str(year)] = entry
+        changed = True
+
+    if catalog_path is not None and (changed or not catalog_path.exists()):
+        save_catalog(catalog, catalog_path)
+    return catalog
+
+
+def save_catalog(catalog: dict, path):
+    """
+    Write a catalog to a JSON file.
+
+    Parameters:
+        catalog (dict): Output of build_catalog.
+        path (Path or str): Output file; parent directories are created.
+    """
+    if not isinstance(path, (str, Path)):
+        raise ValueError("`path` must be a string or Path object.")
+
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(catalog, f, indent=2)
+
+
+def load_catalog(path) -> dict:
+    """
+    Read a catalog written by save_catalog.
+
+    Parameters:
+        path (Path or str): Catalog file.
+
+    Returns:
+        dict: The catalog.
+    """
+    if not isinstance(path, (str, Path)):
+        raise ValueError("`path` must be a string or Path object.")
+
+    with open(path) as f:
+        return json.load(f)
+
+
+def years_with_features(catalog: dict, features, years=None) -> list:
+    """
+    Years whose cleaned file has every requested feature with at least one
+    non-null value.
+
+    Parameters:
+        catalog (dict): Output of build_catalog.
+        features (list[str]): Cleaned column names, e.g. ["age", "fruit_low"].
+        years (list of int, optional): Only consider these years.
+
+    Returns:
+        list of int: Matching years, ascending.
+    """
+    if not isinstance(features, list) or not all(isinstance(f, str) for f in features):
+        raise ValueError("`features` must be a list of strings")
+
+    return sorted(
+        int(year)
+        for year, entry in catalog["files"].items()
+        if (years is None or int(year) in years)
+        and all(entry["columns"].get(f, {}).get("non_null", 0) > 0 for f in features)
+    )
+
+
+def availability_table(catalog: dict) -> pd.DataFrame:
+    """
+    Share of non-null values of every column in every year, with NaN where
+    a year's file does not have the column.
+
+    Returns:
+        pd.DataFrame: One row per column (in first-seen order), one column
+        per year.
+    """
+    shares = {
+        int(year): {
+            col: info["non_null"] / entry["rows"] if entry["rows"] else 0.0
+            for col, info in entry["columns"].items()
+        }
+        for year, entry in sorted(catalog["files"].items())
+    }
+    return pd.DataFrame(shares)
+
+
+def _describe(year, data_dir, chunksize):
+    rows = 0
+    columns = {}
+    for chunk in iter_csv_chunks(year, data_dir=data_dir, chunksize=chunksize):
+        rows += len(chunk)
+        for col, count in chunk.notna().sum().items():
+            info = columns.setdefault(col, {"dtype": None, "non_null": 0})
+            info["non_null"] += int(count)
+            info["dtype"] = _merge_dtype(info["dtype"], chunk[col].dtype)
+
+    return {
+        "rows": rows,
+        "columns": {
+            col: {"dtype": str(info["dtype"]), "non_null": info["non_null"]}
+            for col, info in columns.items()
+        },
+    }
+
+
+def _merge_dtype(current, new):
+    if current is None or current == new:
+        return new
+    if pd.api.types.is_numeric_dtype(current) and pd.api.types.is_numeric_dtype(new):
+        return np.result_type(current, new)
+    return np.dtype(object)
@@ -1,34 +1,44 @@
 # brfss_diabetes/cleaning.py
 
 import pandas as pd
+from .config import CLEANED_COLUMN_NAMES, CLEANED_COLUMN_ORDER, SURVEY_DESIGN_VARS
+from .instrumentation import instrument
+from .io import finalize_columns
 from .preprocessing import (
-    recode_missing,
-    recode_binary,
-    normalize_numeric,
-    convert_implied_decimal,
-    recode_bmi_category,
+    _convert_implied_decimal,
+    _normalize_numeric,
+    _recode_binary,
+    _recode_bmi_category,
+    _recode_missing,
+    move_column_to_end,
 )
+from .schema import validate_raw
 
+# The recode helpers above are the unchecked variants: the frame is validated
+# once at pipeline entry (clean_brfss -> validate_raw) rather than on each of
+# the ~20 recode calls per year.
 
+
+@instrument()
 def clean_common_fields(df: pd.DataFrame) -> pd.DataFrame:
 
     if not isinstance(df, pd.DataFrame):
         raise ValueError(f"`df` must be a pandas DataFrame, got {type(df)}")
 
     # Diabetes uses 7/8/9 for missing
-    df = recode_missing(df, "DIABETE4", [7, 8, 9])
-    df = recode_binary(df, "DIABETE4", yes_codes=[1, 2], no_codes=[3, 4])
+    df = _recode_missing(df, "DIABETE4", [7, 8, 9])
+    df = _recode_binary(df, "DIABETE4", yes_codes=[1, 2], no_codes=[3, 4])
 
     # _AGEG5YR uses 14 for don't know/refused/missing
-    df = recode_missing(df, "_AGEG5YR", [14])
-    df = normalize_numeric(df, "_AGEG5YR", "AGE")
+    df = _recode_missing(df, "_AGEG5YR", [14])
+    df = _normalize_numeric(df, "_AGEG5YR", "AGE")
 
     # SEXVAR has no missing code
     sex_map = {1: "Male", 2: "Female"}
     df["SEX"] = df["SEXVAR"].map(sex_map).astype("category")
 
     # EDUCA uses 9 for missing
-    df = recode_missing(df, "EDUCA", [9])
+    df = _recode_missing(df, "EDUCA", [9])
     edu_map = {
         1: "Less than HS",
         2: "Less than HS",
@@ -40,23 +50,24 @@ def clean_common_fields(df: pd.DataFrame) -> pd.DataFrame:
     df["EDUCA"] = df["EDUCA"].map(edu_map).astype("category")
 
     # _BMI5 uses 9 for missing
-    df = recode_missing(df, "_BMI5", [9])
-    df = convert_implied_decimal(df, column="_BMI5", new_column="BMI")
+    df = _recode_missing(df, "_BMI5", [9])
+    df = _convert_implied_decimal(df, column="_BMI5", new_column="BMI")
 
     # _BMICAT has no missing code
-    df = recode_bmi_category(df, column="_BMI5CAT", new_column="BMICAT")
+    df = _recode_bmi_category(df, column="_BMI5CAT", new_column="BMICAT")
 
     # SMOKE100 uses 7/9 for missing
-    df = recode_missing(df, "SMOKE100", [7, 9])
-    df = recode_binary(df, "SMOKE100", yes_codes=[1], no_codes=[2])
+    df = _recode_missing(df, "SMOKE100", [7, 9])
+    df = _recode_binary(df, "SMOKE100", yes_codes=[1], no_codes=[2])
 
     # EXERANY2  uses 7/9 for missing
-    df = recode_missing(df, "EXERANY2", [7, 9])
-    df = recode_binary(df, "EXERANY2", yes_codes=[1], no_codes=[2])
+    df = _recode_missing(df, "EXERANY2", [7, 9])
+    df = _recode_binary(df, "EXERANY2", yes_codes=[1], no_codes=[2])
 
     return df
 
 
+@instrument()
 def clean_year_specific(df, year):
     if not isinstance(df, pd.DataFrame):
         raise ValueError(f"`df` must be a pandas DataFrame, got {type(df)}")
@@ -65,28 +76,28 @@ def clean_year_specific(df, year):
         raise ValueError(f"`year` must be an int, got {type(df)}")
 
     if year in [2019, 2020, 2021]:
-        df = recode_missing(df, "DRNKANY5", [7, 9])
-        df = recode_binary(df, "DRNKANY5", yes_codes=[1], no_codes=[2])
+        df = _recode_missing(df, "DRNKANY5", [7, 9])
+        df = _recode_binary(df, "DRNKANY5", yes_codes=[1], no_codes=[2])
         df["drink_any"] = df["DRNKANY5"]
     else:
-        df = recode_missing(df, "DRNKANY6", [7, 9])
-        df = recode_binary(df, "DRNKANY6", yes_codes=[1], no_codes=[2])
+        df = _recode_missing(df, "DRNKANY6", [7, 9])
+        df = _recode_binary(df, "DRNKANY6", yes_codes=[1], no_codes=[2])
         df["drink_any"] = df["DRNKANY6"]
 
     if year in [2019, 2021]:
-        df = recode_missing(df, "_FRTLT1A", [9])
+        df = _recode_missing(df, "_FRTLT1A", [9])
         fruit_map = {1: ">= 1x per day", 2: "< 1x per day"}
         df["fruit_low"] = df["_FRTLT1A"].map(fruit_map).astype("category")
 
-        df = convert_implied_decimal(df, "_VEGESU1", "veg_servings")
+        df = _convert_implied_decimal(df, "_VEGESU1", "veg_servings")
 
     if year in [2019, 2022, 2023]:
-        df = recode_missing(df, "FOODSTMP", [7, 9])
-        df = recode_binary(df, "FOODSTMP", yes_codes=[1], no_codes=[2])
+        df = _recode_missing(df, "FOODSTMP", [7, 9])
+        df = _recode_binary(df, "FOODSTMP", yes_codes=[1], no_codes=[2])
         df["snap_used"] = df["FOODSTMP"]
 
     if year in [2022, 2023]:
-        df = recode_missing(df, "SDHFOOD1", [7, 9])
+        df = _recode_missing(df, "SDHFOOD1", [7, 9])
         food_map = {
             1: "Always",
             2: "Usually",
@@ -99,14 +110,77 @@ def clean_year_specific(df, year):
     return df
 
 
-def clean_brfss(df: pd.DataFrame, year: int) -> pd.DataFrame:
+def clean_survey_design(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Carry the complex-survey design variables (_LLCPWT, _STSTR, _PSU) through
+    cleaning as numeric columns. A weight that is missing or not positive is
+    set to pd.NA so it cannot silently zero out a respondent.
+
+    Parameters:
+        df: DataFrame
+
+    Returns:
+        DataFrame with whichever design variables are present coerced to numeric.
+    """
+    if not isinstance(df, pd.DataFrame):
+        raise ValueError(f"`df` must be a pandas DataFrame, got {type(df)}")
+
+    for col in SURVEY_DESIGN_VARS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype("Float64")
+
+    if "_LLCPWT" in df.columns:
+        df.loc[df["_LLCPWT"] <= 0, "_LLCPWT"] = pd.NA
+
+    return df
+
+
+@instrument()
+def clean_brfss(df: pd.DataFrame, year: int, validate=True) -> pd.DataFrame:
+    """
+    Clean one year of raw-coded BRFSS data.
+
+    Parameters:
+        df: DataFrame with the raw columns load_data.py keeps for the year
+        year: int representation of the year
+        validate: check the frame against schema.raw_schema(year) first and
+            raise a SchemaError listing every violation
+
+    Returns:
+        DataFrame with the recoded and derived columns and a 'year' column.
+    """
     if not isinstance(df, pd.DataFrame):
         raise ValueError(f"`df` must be a pandas DataFrame, got {type(df)}")
 
     if not isinstance(year, int):
         raise ValueError(f"`year` must be an int, got {type(df)}")
 
+    if validate:
+        validate_raw(df, year)
+
     df = clean_common_fields(df)
     df = clean_year_specific(df, year)
+    df = clean_survey_design(df)
     df["year"] = year
     return df
+
+
+def to_cleaned_layout(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Put the output of clean_brfss into the layout of the cleaned per-year files:
+    keep and order the cleaned columns, drop rows without a diabetes status,
+    snake_case the names and put the target last.
+
+    Parameters:
+        df: DataFrame returned by clean_brfss
+
+    Returns:
+        DataFrame in the brfss_cleaned_{year}.csv layout.
+    """
+    if not isinstance(df, pd.DataFrame):
+        raise ValueError(f"`df` must be a pandas DataFrame, got {type(df)}")
+
+    df = finalize_columns(df, CLEANED_COLUMN_ORDER)
+    df = df.dropna(subset=["DIABETE4"])
+    df = df.rename(columns=CLEANED_COLUMN_NAMES)
+    return move_column_to_end(df, "diabetes")
@@ -0,0 +1,146 @@
+# brfss_diabetes/compression.py
+
+import numpy as np
+import pandas as pd
+
+
+def compress_patterns(
+    df_common: pd.DataFrame,
+    target: str = "diabetes",
+    bmi_decimals=None,
+    weight_col=None,
+) -> pd.DataFrame:
+    """
+    Collapse identical encoded feature rows into unique patterns with class counts.
+    The common feature set has far fewer distinct rows than respondents, so fitting
+    on the patterns with frequency weights gives the same model much faster.
+
+    Parameters:
+        df_common (pd.DataFrame): Output of prepare_common_features (features + target).
+        target (str): Name of the 0/1 target column.
+        bmi_decimals (int, optional): If given, round 'bmi' to this many decimals
+            before grouping to shrink the pattern count further.
+        weight_col (str, optional): Survey weight column. When given, 'n_pos' and
+            'n_neg' are weighted totals instead of respondent counts.
+
+    Returns:
+        pd.DataFrame: One row per unique feature pattern with the feature columns
+        followed by 'n_pos' and 'n_neg' counts.
+    """
+    if not isinstance(df_common, pd.DataFrame):
+        raise ValueError(
+            f"`df_common` must be a pandas DataFrame, got {type(df_common)}"
+        )
+
+    if target not in df_common.columns:
+        raise ValueError(f"Missing required target column: '{target}'")
+
+    if bmi_decimals is not None and (
+        not isinstance(bmi_decimals, int) or bmi_decimals < 0
+    ):
+        raise ValueError(
+            f"`bmi_decimals` must be a non-negative int or None, got {bmi_decimals}"
+        )
+
+    if weight_col is not None and weight_col not in df_common.columns:
+        raise ValueError(f"Missing survey weight column: '{weight_col}'")
+
+    feature_cols = [col for col in df_common.columns if col not in (target, weight_col)]
+    if not feature_cols:
+        raise ValueError("`df_common` has no feature columns to compress")
+
+    df = df_common
+    if bmi_decimals is not None and "bmi" in df.columns:
+        df = df.assign(bmi=df["bmi"].round(bmi_decimals))
+
+    if weight_col is None:
+        grouped = df.groupby(feature_cols, sort=False, observed=True, dropna=False)[
+            target
+        ].agg(["sum", "count"])
+        patterns = grouped.reset_index()
+        patterns["n_pos"] = patterns.pop("sum").astype(np.int64)
+        patterns["n_neg"] = patterns.pop("count").astype(np.int64) - patterns["n_pos"]
+    else:
+        w = df[weight_col].astype("float64")
+        df = df[feature_cols].assign(n_pos=w * df[target], n_neg=w * (1 - df[target]))
+        patterns = (
+            df.groupby(feature_cols, sort=False, observed=True, dropna=False)[
+                ["n_pos", "n_neg"]
+            ]
+            .sum()
+            .reset_index()
+        )
+
+    return patterns
+
+
+def expand_patterns(patterns: pd.DataFrame):
+    """
+    Turn compressed patterns into a weighted training set. Each pattern becomes
+    at most two rows, one per observed class, weighted by its count.
+
+    Parameters:
+        patterns (pd.DataFrame): Output of compress_patterns.
+
+    Returns:
+        tuple: (X, y, sample_weight) ready for
+        model.fit(X, y, sample_weight=sample_weight).
+    """
+    if not isinstance(patterns, pd.DataFrame):
+        raise ValueError(f"`patterns` must be a pandas DataFrame, got {type(patterns)}")
+
+    missing = [col for col in ["n_pos", "n_neg"] if col not in patterns.columns]
+    if missing:
+        raise ValueError(f"`patterns` is missing count columns: {missing}")
+
+    features = patterns.drop(columns=["n_pos", "n_neg"])
+    pos = patterns["n_pos"].to_numpy() > 0
+    neg = patterns["n_neg"].to_numpy() > 0
+
+    X = pd.concat([features[pos], features[neg]], ignore_index=True)
+    y = pd.Series(
+        np.concatenate(
+            [np.ones(pos.sum(), dtype=np.int64), np.zeros(neg.sum(), dtype=np.int64)]
+        ),
+        name="diabetes",
+    )
+    sample_weight = np.concatenate(
+        [patterns["n_pos"].to_numpy()[pos], patterns["n_neg"].to_numpy()[neg]]
+    ).astype(np.float64)
+
+    return X, y, sample_weight
+
+
+def compression_report(n_rows: int, patterns: pd.DataFrame) -> dict:
+    """
+    Summarize how much compress_patterns shrank the training set.
+
+    Parameters:
+        n_rows (int): Number of rows before compression.
+        patterns (pd.DataFrame): Output of compress_patterns.
+
+    Returns:
+        dict: rows, patterns, weighted training rows, and the compression ratio
+        (rows per weighted training row).
+    """
+    if not isinstance(n_rows, (int, np.integer)) or n_rows < 0:
+        raise ValueError(f"`n_rows` must be a non-negative int, got {n_rows}")
+
+    if not isinstance(patterns, pd.DataFrame):
+        raise ValueError(f"`patterns` must be a pandas DataFrame, got {type(patterns)}")
+
+    n_patterns = len(patterns)
+    n_weighted = int((patterns["n_pos"] > 0).sum() + (patterns["n_neg"] > 0).sum())
+    ratio = n_rows / n_weighted if n_weighted else float("nan")
+
+    report = {
+        "rows": int(n_rows),
+        "patterns": n_patterns,
+        "weighted_rows": n_weighted,
+        "compression_ratio": ratio,
+    }
+    print(
+        f"Compressed {n_rows:,} rows into {n_patterns:,} patterns "
+        f"({n_weighted:,} weighted rows, {ratio:.1f}x)"
+    )
+    return report
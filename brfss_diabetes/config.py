@@ -1,5 +1,7 @@
 # brfss_diabetes/config.py
 
+SEED = 22
+
 AGE_CATEGORY_MIDPOINTS = {
     1: 22,
     2: 27,
@@ -15,3 +17,77 @@ AGE_CATEGORY_MIDPOINTS = {
     12: 77,
     13: 85,
 }
+
+# Levels of the cleaned categorical columns, in the sorted order pd.get_dummies
+# uses for the string columns read back from the cleaned csvs
+FEATURE_LEVELS = {
+    "sex": ["Female", "Male"],
+    "educa": ["College graduate", "HS or GED", "Less than HS", "Some college"],
+    "bmi_cat": ["Normal", "Obese", "Overweight", "Underweight"],
+    "fruit_low": ["< 1x per day", ">= 1x per day"],
+    "food_insecurity": ["Always", "Never", "Rarely", "Sometimes", "Usually"],
+}
+
+# Raw LLCP variables kept for every year
+VARS_COMMON = [
+    "DIABETE4",
+    "_AGEG5YR",
+    "SEXVAR",
+    "EDUCA",
+    "_BMI5",
+    "_BMI5CAT",
+    "SMOKE100",
+    "EXERANY2",
+]
+
+# Complex-survey design: final weight, stratum and primary sampling unit
+SURVEY_DESIGN_VARS = ["_LLCPWT", "_STSTR", "_PSU"]
+
+# Year-specific variables
+# DRNKANY5 (used 2019–2021), renamed to DRNKANY6 in 2022+
+VARS_BY_YEAR = {
+    2019: ["DRNKANY5", "_FRTLT1A", "_VEGESU1", "FOODSTMP"],
+    2020: ["DRNKANY5"],
+    2021: ["DRNKANY5", "_FRTLT1A", "_VEGESU1"],
+    2022: ["DRNKANY6", "SDHFOOD1", "FOODSTMP"],
+    2023: ["DRNKANY6", "SDHFOOD1", "FOODSTMP"],
+}
+
+# Name of the final survey weight once cleaned and snake_cased
+SURVEY_WEIGHT_COL = "survey_weight"
+
+# Column order of the cleaned per-year files (raw/intermediate names)
+CLEANED_COLUMN_ORDER = [
+    "year",
+    "AGE",
+    "SEX",
+    "EDUCA",
+    "BMI",
+    "BMICAT",
+    "drink_any",
+    "fruit_low",
+    "veg_servings",
+    "snap_used",
+    "food_insecurity",
+    "SMOKE100",
+    "EXERANY2",
+    "_LLCPWT",
+    "_STSTR",
+    "_PSU",
+    "DIABETE4",
+]
+
+# snake_case names used in the cleaned per-year files
+CLEANED_COLUMN_NAMES = {
+    "AGE": "age",
+    "SEX": "sex",
+    "EDUCA": "educa",
+    "BMI": "bmi",
+    "BMICAT": "bmi_cat",
+    "SMOKE100": "smoke_100",
+    "EXERANY2": "exercise_any",
+    "_LLCPWT": SURVEY_WEIGHT_COL,
+    "_STSTR": "strata",
+    "_PSU": "psu",
+    "DIABETE4": "diabetes",
+}
@@ -0,0 +1,209 @@
+# brfss_diabetes/crosses.py
+
+# Interaction features with the hashing trick. Every cross (e.g. age x bmi)
+# maps each row's combination of levels to one of n_features columns, so the
+# width stays fixed however many crosses and levels there are. Levels are
+# identified by name ("educa=HS or GED", "bmi#2"), not by position, so a
+# cell lands in the same column in every year even when a year lacks some
+# levels. Levels are therefore read from the cleaned columns (e.g. "educa"),
+# not from get_dummies output, whose dropped first level depends on the data.
+# Hashing is done once per distinct cell, not per row.
+
+import hashlib
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+from .instrumentation import instrument
+from .preprocessing import BINARY_FEATURES, CATEGORICAL_FEATURES
+
+# Bin edges of the continuous features that can be crossed; age is already
+# in 5-year groups and is crossed by group
+CROSS_BINS = {
+    "bmi": [18.5, 25.0, 30.0, 35.0, 40.0],
+    "veg_servings": [1.0, 2.0, 3.0, 5.0],
+}
+
+# Columns with more distinct values than this need bins to be crossed
+_MAX_LEVELS = 64
+
+# Yes/No columns read the same cleaned ("Yes") or encoded (1)
+_BINARY_NAMES = {"Yes": "Yes", "No": "No", "1": "Yes", "0": "No"}
+
+_MIX_1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX_2 = np.uint64(0x94D049BB133111EB)
+
+
+def make_crosses(features, degrees=(2, 3), bins=None) -> list:
+    """
+    Every pair / triple (per `degrees`) of the crossable features among
+    `features`: categoricals, Yes/No columns, age and the columns in `bins`.
+    Pass a year's own feature list (e.g. from catalog.years_with_features)
+    to get only the crosses that year can build.
+
+    Parameters:
+        features (list[str]): Cleaned feature names available.
+        degrees (tuple of int): Cross sizes to generate.
+        bins (dict, optional): Bin edges per continuous column, defaults to
+            CROSS_BINS.
+
+    Returns:
+        list of tuple: Crosses, in the order of `features`.
+    """
+    if not isinstance(features, list) or not all(isinstance(f, str) for f in features):
+        raise ValueError("`features` must be a list of strings")
+
+    if not degrees or not all(isinstance(d, int) and d >= 2 for d in degrees):
+        raise ValueError(f"`degrees` must be ints >= 2, got {degrees}")
+
+    bins = CROSS_BINS if bins is None else bins
+    crossable = [
+        f
+        for f in features
+        if f in CATEGORICAL_FEATURES
+        or (f in BINARY_FEATURES and f != "diabetes")
+        or f == "age"
+        or f in bins
+    ]
+    return [cross for d in degrees for cross in combinations(crossable, d)]
+
+
+@instrument()
+def hash_crosses(df, crosses, n_features=2**18, bins=None, dtype=np.float64):
+    """
+    Hashed cross features as a fixed-width sparse matrix with one 1 per row
+    and cross (summed where two crosses of a row collide). Pass the cleaned
+    rows behind the encoded features, e.g. df.loc[df_common.index], and
+    stack the result next to them with sparse.hstack([X, X_crosses]).
+
+    Parameters:
+        df (pd.DataFrame): One cleaned column per crossed feature, without
+            missing values; Yes/No columns may already be 0/1 encoded.
+        crosses (list of tuple): Feature names to cross, e.g. from
+            make_crosses.
+        n_features (int): Width of the hashed space.
+        bins (dict, optional): Bin edges per continuous column, defaults to
+            CROSS_BINS.
+        dtype: Value dtype of the matrix.
+
+    Returns:
+        scipy.sparse.csr_matrix: Shape (rows, n_features).
+    """
+    from scipy import sparse
+
+    if not isinstance(df, pd.DataFrame):
+        raise ValueError(f"`df` must be a pandas DataFrame, got {type(df)}")
+
+    if not isinstance(n_features, int) or not 0 < n_features < 2**31:
+        raise ValueError(f"`n_features` must be an int in [1, 2**31), got {n_features}")
+
+    if not isinstance(crosses, list) or not all(
+        isinstance(c, tuple) and len(c) >= 2 for c in crosses
+    ):
+        raise ValueError("`crosses` must be a list of tuples of 2+ feature names")
+
+    bins = CROSS_BINS if bins is None else bins
+    n_rows = len(df)
+    levels = {
+        feature: _levels(df, feature, bins)
+        for feature in dict.fromkeys(f for cross in crosses for f in cross)
+    }
+
+    # Filled one cross per row of a (crosses, rows) array, then transposed to
+    # one matrix row per data row
+    columns = np.empty((len(crosses), n_rows), dtype=np.int32)
+    for j, cross in enumerate(crosses):
+        # Sorted, so (age, bmi) and (bmi, age) are the same cross
+        cross = sorted(cross)
+        codes = [levels[f][0] for f in cross]
+        shape = [len(levels[f][1]) for f in cross]
+        table = _cell_columns([levels[f][1] for f in cross], n_features)
+        columns[j] = table[np.ravel_multi_index(codes, shape)]
+
+    # Sorting every row with NumPy is faster than scipy's per-row sort, and
+    # leaves only the (rare) in-row collisions for sum_duplicates
+    columns = np.sort(columns.T, axis=1)
+    X = sparse.csr_matrix(
+        (
+            np.ones(columns.size, dtype=dtype),
+            columns.ravel(),
+            np.arange(n_rows + 1) * len(crosses),
+        ),
+        shape=(n_rows, n_features),
+    )
+    X.has_sorted_indices = True
+    X.sum_duplicates()
+    return X
+
+
+def _levels(df, feature, bins):
+    # (code per row, uint64 token per code) for one feature
+    if feature not in df.columns:
+        if any(col.startswith(f"{feature}_") for col in df.columns):
+            raise ValueError(
+                f"Feature '{feature}' is one-hot encoded in `df`; pass its cleaned "
+                f"column, the dummies do not show which level was dropped"
+            )
+        raise ValueError(f"Feature '{feature}' not found in `df`")
+
+    series = df[feature]
+    if series.isna().any():
+        raise ValueError(f"Column '{feature}' has missing values")
+
+    if feature in bins:
+        values = series.to_numpy(dtype=np.float64)
+        codes = np.digitize(values, bins[feature])
+        names = [f"{feature}#{i}" for i in range(len(bins[feature]) + 1)]
+        return codes.astype(np.intp), _tokens(names)
+
+    codes, uniques = pd.factorize(series, sort=True)
+    if len(uniques) > _MAX_LEVELS:
+        raise ValueError(
+            f"Column '{feature}' has {len(uniques)} distinct values; "
+            f"give it bin edges in `bins` to cross it"
+        )
+
+    # Named per distinct value, then merged where two values name one level
+    labels = [_level_name(value) for value in uniques]
+    if feature in BINARY_FEATURES:
+        labels = [_BINARY_NAMES.get(label) for label in labels]
+        if None in labels:
+            raise ValueError(f"Column '{feature}' has values other than Yes/No")
+    labels, merged = np.unique(labels, return_inverse=True)
+    names = [f"{feature}={label}" for label in labels]
+    return merged[codes].astype(np.intp), _tokens(names)
+
+
+def _level_name(value):
+    # 62 and 62.0 (int or float ages) name the same level
+    if isinstance(value, (int, float, np.number)) and not isinstance(value, bool):
+        return f"{value:g}"
+    return str(value)
+
+
+def _tokens(names):
+    return np.array(
+        [
+            int.from_bytes(
+                hashlib.blake2b(n.encode(), digest_size=8).digest(), "little"
+            )
+            for n in names
+        ],
+        dtype=np.uint64,
+    )
+
+
+def _cell_columns(tokens, n_features):
+    # Column of every cell of the cross, in np.ravel_multi_index order
+    h = np.zeros(1, dtype=np.uint64)
+    for feature_tokens in tokens:
+        h = _mix(h[:, np.newaxis] ^ feature_tokens[np.newaxis, :]).ravel()
+    return (h % np.uint64(n_features)).astype(np.int32)
+
+
+def _mix(x):
+    # splitmix64 finalizer; uint64 arithmetic wraps around
+    x = (x ^ (x >> np.uint64(30))) * _MIX_1
+    x = (x ^ (x >> np.uint64(27))) * _MIX_2
+    return x ^ (x >> np.uint64(31))
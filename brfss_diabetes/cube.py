@@ -0,0 +1,305 @@
+# brfss_diabetes/cube.py
+
+# Diabetes No/Yes counts per year x age x sex x educa x bmi_cat cell, kept in
+# one dense array so prevalence by any combination of those columns is a sum
+# over axes of a few thousand cells per year instead of a groupby over the
+# merged frame. Every axis except diabetes ends with a None level for missing
+# (or unknown) values, so marginals add up to the files' row counts.
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .config import AGE_CATEGORY_MIDPOINTS, FEATURE_LEVELS
+from .eda import file_hash, file_stamp
+from .instrumentation import instrument
+from .io import _csv_source, iter_csv_chunks
+
+# Default cube location, next to the cleaned files it summarizes
+CUBE_FILE = "prevalence_cube.npz"
+CUBE_AXES = ("year", "age", "sex", "educa", "bmi_cat", "diabetes")
+_CUBE_VERSION = 1
+
+# Levels of the axes after year, in cube order
+_LEVELS = {
+    "age": list(AGE_CATEGORY_MIDPOINTS.values()) + [None],
+    "sex": FEATURE_LEVELS["sex"] + [None],
+    "educa": FEATURE_LEVELS["educa"] + [None],
+    "bmi_cat": FEATURE_LEVELS["bmi_cat"] + [None],
+    "diabetes": ["No", "Yes"],
+}
+
+
+def build_cube(
+    years,
+    data_dir=Path("../data/cleaned"),
+    cube_path=None,
+    weight_col=None,
+    chunksize=100_000,
+) -> dict:
+    """
+    Count diabetes No/Yes per cell for every year. With a cube path, the
+    stored cube is updated in place: years whose file hash is unchanged keep
+    their slice, and only new or changed years are read. A file is only
+    hashed when its size or modification time differs from the stored one.
+
+    Parameters:
+        years (list of int): Years to include.
+        data_dir (Path): Directory containing cleaned CSVs.
+        cube_path (Path, optional): Where the cube is persisted.
+        weight_col (str, optional): Survey weight column; the cube then also
+            holds weighted counts (rows with a missing weight add 0).
+        chunksize (int): Rows per chunk when a file is read.
+
+    Returns:
+        dict: axes, labels per axis, counts (int64), weighted (float64 or
+        None), weight_col, and the file hash and [size, mtime_ns] of every
+        year.
+    """
+    if not isinstance(years, list) or not all(isinstance(y, int) for y in years):
+        raise ValueError("`years` must be a list of integers")
+
+    if cube_path is not None and not isinstance(cube_path, Path):
+        raise ValueError(f"`cube_path` must be a pathlib.Path, got {type(cube_path)}")
+
+    cube = _empty_cube(weight_col)
+    if cube_path is not None and cube_path.exists():
+        stored = load_cube(cube_path)
+        if stored["version"] == _CUBE_VERSION and stored["weight_col"] == weight_col:
+            cube = stored
+
+    changed = False
+    for year in years:
+        source = _csv_source(year, data_dir)
+        if not isinstance(source, Path):
+            raise ValueError(f"Cannot build the cube from remote data: {source}")
+
+        stamps = cube.setdefault("stamps", {})
+        stamp = file_stamp(source)
+        if stamps.get(str(year)) == stamp:
+            continue
+
+        stored = cube["hashes"].get(str(year))
+        if stored is not None and stored == file_hash(source):
+            # Touched but not changed
+            stamps[str(year)] = stamp
+        else:
+            cube = add_year(cube, year, data_dir, chunksize)
+        changed = True
+
+    if cube_path is not None and (changed or not cube_path.exists()):
+        save_cube(cube, cube_path)
+    return cube
+
+
+@instrument()
+def add_year(cube: dict, year, data_dir=Path("../data/cleaned"), chunksize=100_000):
+    """
+    Count one year's file and insert its slice into the cube, replacing the
+    year's slice if it is already there. No other year is read.
+
+    Parameters:
+        cube (dict): Output of build_cube / load_cube.
+        year (int): Year to add.
+        data_dir (Path): Directory containing cleaned CSVs.
+        chunksize (int): Rows per chunk.
+
+    Returns:
+        dict: A new cube with the year's slice, years ascending.
+    """
+    if not isinstance(year, int):
+        raise ValueError(f"`year` must be an int, got {type(year)}")
+
+    shape = tuple(len(_LEVELS[axis]) for axis in CUBE_AXES[1:])
+    counts = np.zeros(shape, dtype=np.int64)
+    weighted = np.zeros(shape) if cube["weight_col"] is not None else None
+    usecols = list(_LEVELS) + ([cube["weight_col"]] if weighted is not None else [])
+    for chunk in iter_csv_chunks(
+        year, data_dir=data_dir, chunksize=chunksize, usecols=usecols
+    ):
+        cells, keep = _cell_index(chunk, shape)
+        counts += np.bincount(cells, minlength=counts.size).reshape(shape)
+        if weighted is not None:
+            w = pd.to_numeric(chunk[cube["weight_col"]]).to_numpy(float, na_value=0)
+            weighted += np.bincount(
+                cells, weights=w[keep], minlength=counts.size
+            ).reshape(shape)
+
+    years = [y for y in cube["labels"]["year"] if y != year]
+    position = int(np.searchsorted(years, year))
+    stored = [y in years for y in cube["labels"]["year"]]
+    new = dict(cube)
+    new["labels"] = {
+        **cube["labels"],
+        "year": years[:position] + [year] + years[position:],
+    }
+    new["counts"] = np.insert(cube["counts"][stored], position, counts, axis=0)
+    if weighted is not None:
+        new["weighted"] = np.insert(
+            cube["weighted"][stored], position, weighted, axis=0
+        )
+    source = _csv_source(year, data_dir)
+    new["stamps"] = {**cube.get("stamps", {}), str(year): file_stamp(source)}
+    new["hashes"] = {**cube["hashes"], str(year): file_hash(source)}
+    return new
+
+
+def save_cube(cube: dict, path):
+    """
+    Write a cube to an .npz file.
+
+    Parameters:
+        cube (dict): Output of build_cube.
+        path (Path or str): Output file; parent directories are created.
+    """
+    if not isinstance(path, (str, Path)):
+        raise ValueError("`path` must be a string or Path object.")
+
+    meta = {key: cube[key] for key in ("version", "labels", "weight_col", "hashes")}
+    meta["stamps"] = cube.get("stamps", {})
+    arrays = {"counts": cube["counts"]}
+    if cube["weighted"] is not None:
+        arrays["weighted"] = cube["weighted"]
+
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    np.savez(path, meta=np.array(json.dumps(meta)), **arrays)
+
+
+def load_cube(path) -> dict:
+    """
+    Read a cube written by save_cube.
+
+    Parameters:
+        path (Path or str): Cube file.
+
+    Returns:
+        dict: The cube.
+    """
+    if not isinstance(path, (str, Path)):
+        raise ValueError("`path` must be a string or Path object.")
+
+    with np.load(path) as data:
+        cube = json.loads(str(data["meta"]))
+        cube["counts"] = data["counts"]
+        cube["weighted"] = data["weighted"] if "weighted" in data else None
+    cube["axes"] = list(CUBE_AXES)
+    return cube
+
+
+def marginal(cube: dict, by=(), weighted=False, **filters) -> np.ndarray:
+    """
+    No/Yes totals grouped by some axes, over the rows matching the filters.
+
+    Parameters:
+        cube (dict): Output of build_cube / load_cube.
+        by (list[str]): Axes to keep, in output order, e.g. ["year", "sex"].
+        weighted (bool): Sum survey weights instead of counting rows.
+        **filters: Axis name to one label or a list of labels to keep, e.g.
+            sex="Female", age=[62, 67]. None selects the missing level.
+
+    Returns:
+        np.ndarray: Shape (levels of each `by` axis..., 2), last axis No/Yes.
+    """
+    values = _values(cube, weighted)
+    by = list(by)
+    unknown = [axis for axis in by + list(filters) if axis not in CUBE_AXES[:-1]]
+    if unknown:
+        raise ValueError(f"Unknown axes {unknown}, expected {list(CUBE_AXES[:-1])}")
+
+    for axis, labels in filters.items():
+        positions = _positions(cube, axis, labels)
+        values = np.take(values, positions, axis=CUBE_AXES.index(axis))
+
+    summed = tuple(i for i, axis in enumerate(CUBE_AXES[:-1]) if axis not in by)
+    values = values.sum(axis=summed)
+    kept = [axis for axis in CUBE_AXES[:-1] if axis in by]
+    order = [kept.index(axis) for axis in by] + [len(kept)]
+    return values.transpose(order)
+
+
+def prevalence_table(cube: dict, by=("year",), weighted=False, **filters):
+    """
+    Prevalence per combination of the `by` axes, laid out as
+    eda.target_rate_table: rows, positives and rate (NaN for empty cells).
+
+    Parameters:
+        cube (dict): Output of build_cube / load_cube.
+        by (list[str]): Axes to group by.
+        weighted (bool): Use survey-weighted totals.
+        **filters: As in marginal.
+
+    Returns:
+        pd.DataFrame: Indexed by the `by` axes' labels.
+    """
+    totals = marginal(cube, by, weighted, **filters)
+    index = pd.MultiIndex.from_product(
+        [_filtered_labels(cube, axis, filters) for axis in by], names=list(by)
+    )
+    table = pd.DataFrame(
+        {
+            "rows": totals.sum(axis=-1).ravel(),
+            "positives": totals[..., 1].ravel(),
+        },
+        index=index.get_level_values(0) if len(by) == 1 else index,
+    )
+    table["rate"] = table["positives"] / table["rows"].where(table["rows"] > 0)
+    return table
+
+
+def _empty_cube(weight_col):
+    shape = (0,) + tuple(len(_LEVELS[axis]) for axis in CUBE_AXES[1:])
+    return {
+        "version": _CUBE_VERSION,
+        "axes": list(CUBE_AXES),
+        "labels": {"year": [], **_LEVELS},
+        "counts": np.zeros(shape, dtype=np.int64),
+        "weighted": np.zeros(shape) if weight_col is not None else None,
+        "weight_col": weight_col,
+        "hashes": {},
+        "stamps": {},
+    }
+
+
+def _cell_index(chunk, shape):
+    # Flat cell of every row; rows without a known diabetes status are dropped
+    codes = []
+    for axis, levels in _LEVELS.items():
+        if axis == "age":
+            index = pd.Index(levels[:-1], dtype=float)
+            column = pd.to_numeric(chunk[axis]).to_numpy(float, na_value=np.nan)
+        else:
+            index = pd.Index(levels[:-1] if None in levels else levels)
+            column = chunk[axis].astype(object).to_numpy()
+        code = index.get_indexer(column)
+        if None in levels:
+            code[code == -1] = len(levels) - 1
+        codes.append(code)
+
+    keep = codes[-1] != -1
+    cells = np.ravel_multi_index([code[keep] for code in codes], shape)
+    return cells, keep
+
+
+def _values(cube, weighted):
+    if not weighted:
+        return cube["counts"]
+    if cube["weighted"] is None:
+        raise ValueError("The cube was built without `weight_col`")
+    return cube["weighted"]
+
+
+def _positions(cube, axis, labels):
+    labels = labels if isinstance(labels, (list, tuple)) else [labels]
+    levels = cube["labels"][axis]
+    missing = [label for label in labels if label not in levels]
+    if missing:
+        raise ValueError(f"Unknown {axis} labels {missing}, expected {levels}")
+    return [levels.index(label) for label in labels]
+
+
+def _filtered_labels(cube, axis, filters):
+    if axis not in filters:
+        return cube["labels"][axis]
+    return [cube["labels"][axis][i] for i in _positions(cube, axis, filters[axis])]
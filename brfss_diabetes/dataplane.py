@@ -0,0 +1,148 @@
+# brfss_diabetes/dataplane.py
+
+# Arrays published once in multiprocessing.shared_memory for process pools.
+# The parent publishes the encoded matrix, target and weights and hands
+# workers a small picklable spec (block names, shapes, dtypes, column
+# names); workers attach NumPy views over the same memory instead of
+# receiving a pickled copy per task or per worker.
+
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+
+def publish(arrays: dict, columns=None) -> dict:
+    """
+    Copy arrays into shared memory, one block per array. The caller owns
+    the blocks and must release the plane (or use shared_arrays).
+
+    Parameters:
+        arrays (dict): Name -> np.ndarray, e.g. {"X": X, "y": y}.
+        columns (list[str], optional): Column names of "X", passed on to
+            workers with the spec.
+
+    Returns:
+        dict: The plane: handles (name -> SharedMemory) and spec, the
+        picklable description workers pass to attach.
+    """
+    if not isinstance(arrays, dict) or not arrays:
+        raise ValueError("`arrays` must be a non-empty dict of arrays")
+
+    handles = {}
+    spec = {"arrays": {}, "columns": list(columns) if columns is not None else None}
+    try:
+        for key, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            if array.dtype.hasobject:
+                raise ValueError(
+                    f"Array '{key}' has dtype object, which cannot be shared"
+                )
+            # Zero-size blocks are not allowed, so empty arrays get one byte
+            shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            handles[key] = shm
+            np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[...] = array
+            spec["arrays"][key] = (shm.name, array.shape, array.dtype.str)
+    except BaseException:
+        release({"handles": handles})
+        raise
+    return {"handles": handles, "spec": spec}
+
+
+def publish_frame(df_common: pd.DataFrame, target="diabetes", weight_col=None):
+    """
+    Publish the output of prepare_common_features: X (float64 features),
+    y (int8 target), optionally w (float64 weights), and the feature names.
+
+    Parameters:
+        df_common (pd.DataFrame): Encoded frame with the target column.
+        target (str): Target column.
+        weight_col (str, optional): Weight column, kept out of X.
+
+    Returns:
+        dict: The plane, as publish.
+    """
+    if not isinstance(df_common, pd.DataFrame):
+        raise ValueError(
+            f"`df_common` must be a pandas DataFrame, got {type(df_common)}"
+        )
+
+    if target not in df_common.columns:
+        raise ValueError(f"Missing target column: '{target}'")
+
+    features = [col for col in df_common.columns if col not in (target, weight_col)]
+    arrays = {
+        "X": df_common[features].to_numpy(dtype=np.float64),
+        "y": df_common[target].to_numpy(dtype=np.int8),
+    }
+    if weight_col is not None:
+        arrays["w"] = df_common[weight_col].to_numpy(dtype=np.float64)
+    return publish(arrays, features)
+
+
+def attach(spec: dict, writeable=False) -> dict:
+    """
+    Map the arrays of a published plane, e.g. in a pool initializer. The
+    views share memory with the parent; keep the returned dict alive while
+    they are used and detach it when done.
+
+    Parameters:
+        spec (dict): plane["spec"] from publish.
+        writeable (bool): Allow writes to the views. Writes are seen by
+            every process, so by default the views are read-only.
+
+    Returns:
+        dict: handles, arrays (name -> np.ndarray view) and columns.
+    """
+    if not isinstance(spec, dict) or "arrays" not in spec:
+        raise ValueError("`spec` must be the spec of a published plane")
+
+    handles = {}
+    arrays = {}
+    for key, (name, shape, dtype) in spec["arrays"].items():
+        handles[key] = shared_memory.SharedMemory(name=name)
+        view = np.ndarray(shape, dtype=np.dtype(dtype), buffer=handles[key].buf)
+        view.flags.writeable = writeable
+        arrays[key] = view
+    return {"handles": handles, "arrays": arrays, "columns": spec["columns"]}
+
+
+def detach(attached: dict):
+    """
+    Close the blocks mapped by attach. Every other reference to its arrays
+    must be dropped first, or closing raises BufferError.
+    """
+    attached["arrays"] = {}
+    for shm in attached["handles"].values():
+        shm.close()
+
+
+def release(plane: dict):
+    """
+    Close and free the blocks of a plane made by publish. Workers that
+    still have them mapped keep their views until they detach.
+    """
+    for shm in plane["handles"].values():
+        shm.close()
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+    plane["handles"] = {}
+
+
+@contextmanager
+def shared_arrays(arrays: dict, columns=None):
+    """
+    Publish arrays for the duration of a with block and release them on
+    exit, also when the block raises.
+
+    Yields:
+        dict: The plane, as publish.
+    """
+    plane = publish(arrays, columns)
+    try:
+        yield plane
+    finally:
+        release(plane)
@@ -0,0 +1,254 @@
+# brfss_diabetes/drift.py
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .eda import file_hash, file_stamp, merge_summaries, summarize_year
+from .io import _csv_source
+
+# Common PSI rule of thumb: < 0.1 stable, 0.1-0.25 moderate, >= 0.25 major
+PSI_MODERATE = 0.1
+PSI_MAJOR = 0.25
+
+# Floor for empty bins/levels so PSI stays finite
+_EPS = 1e-4
+
+# [size, mtime_ns] and hash of each profiled file, kept in the profile
+# directory so unchanged files are not hashed again
+_INDEX_FILE = "profiles.json"
+
+
+def build_profile(
+    years, data_dir=Path("../data/cleaned"), profile_dir=None, chunksize=100_000
+) -> dict:
+    """
+    Reference profile of the given years: binned histograms, category
+    frequencies, missingness and target rate, as eda summaries. With a
+    profile directory, each year's profile is stored there under the file's
+    content hash, and later calls merge the stored profiles without parsing
+    the old files again until a file changes. A file is only hashed when its
+    size or modification time differs from when it was profiled.
+
+    Parameters:
+        years (list of int): Years to profile, e.g. the training years.
+        data_dir (Path): Directory containing cleaned CSVs.
+        profile_dir (Path, optional): Where per-year profiles are persisted.
+        chunksize (int): Rows per chunk when a year has to be read.
+
+    Returns:
+        dict: Profile of all the years' rows together.
+    """
+    if not isinstance(years, list) or not all(isinstance(y, int) for y in years):
+        raise ValueError("`years` must be a list of integers")
+
+    if profile_dir is not None and not isinstance(profile_dir, Path):
+        raise ValueError(
+            f"`profile_dir` must be a pathlib.Path, got {type(profile_dir)}"
+        )
+
+    index_path = profile_dir / _INDEX_FILE if profile_dir is not None else None
+    index = {}
+    if index_path is not None and index_path.exists():
+        with open(index_path) as f:
+            index = json.load(f)
+
+    profiles = []
+    for year in years:
+        # Remote files (Colab) are not hashed, so they are never stored
+        source = _csv_source(year, data_dir)
+        path = None
+        if profile_dir is not None and isinstance(source, Path):
+            entry = index.get(str(year), {})
+            stamp = file_stamp(source)
+            if entry.get("stamp") != stamp:
+                entry = {"stamp": stamp, "hash": file_hash(source)}
+                index[str(year)] = entry
+            path = profile_dir / f"profile_{year}_{entry['hash'][:16]}.json"
+        if path is not None and path.exists():
+            profiles.append(load_profile(path))
+            continue
+
+        profile = summarize_year(year, data_dir=data_dir, chunksize=chunksize)
+        if path is not None:
+            save_profile(profile, path)
+        profiles.append(profile)
+
+    if index_path is not None and index:
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(index_path, "w") as f:
+            json.dump(index, f)
+
+    return merge_summaries(profiles)
+
+
+def save_profile(profile: dict, path):
+    """
+    Write a profile to a JSON file.
+
+    Parameters:
+        profile (dict): Output of build_profile.
+        path (Path or str): Output file; parent directories are created.
+    """
+    if not isinstance(path, (str, Path)):
+        raise ValueError("`path` must be a string or Path object.")
+
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(profile, f)
+
+
+def load_profile(path) -> dict:
+    """
+    Read a profile written by save_profile.
+
+    Parameters:
+        path (Path or str): Profile file.
+
+    Returns:
+        dict: The profile.
+    """
+    if not isinstance(path, (str, Path)):
+        raise ValueError("`path` must be a string or Path object.")
+
+    with open(path) as f:
+        return json.load(f)
+
+
+def psi(expected, actual) -> float:
+    """
+    Population stability index between two aligned count (or share) vectors.
+
+    Parameters:
+        expected (array-like): Reference counts per bin/level.
+        actual (array-like): New counts per bin/level.
+
+    Returns:
+        float: sum((a - e) * ln(a / e)) over the normalized shares.
+    """
+    e, a = _shares(expected, actual)
+    e = np.maximum(e, _EPS)
+    a = np.maximum(a, _EPS)
+    return float(np.sum((a - e) * np.log(a / e)))
+
+
+def js_divergence(expected, actual) -> float:
+    """
+    Jensen-Shannon divergence (base 2, between 0 and 1) of two aligned count
+    vectors.
+    """
+    e, a = _shares(expected, actual)
+    m = (e + a) / 2
+
+    def kl(p, q):
+        nz = p > 0
+        return np.sum(p[nz] * np.log2(p[nz] / q[nz]))
+
+    return float((kl(e, m) + kl(a, m)) / 2)
+
+
+def ks_statistic(expected, actual) -> float:
+    """
+    Kolmogorov-Smirnov statistic of two histograms on the same bins: the
+    largest gap between their cumulative shares.
+    """
+    e, a = _shares(expected, actual)
+    return float(np.max(np.abs(np.cumsum(e) - np.cumsum(a)), initial=0.0))
+
+
+def compare_profiles(reference: dict, current: dict) -> pd.DataFrame:
+    """
+    Drift of every feature profiled in both reference and current. Binned
+    numeric columns get PSI, KS and JS; text columns get PSI and JS over the
+    union of their levels. Only the summaries are touched, so this is cheap
+    once the profiles exist.
+
+    Parameters:
+        reference (dict): Profile of the training years.
+        current (dict): Profile of the new year.
+
+    Returns:
+        pd.DataFrame: One row per feature with kind, psi, ks, js, the missing
+        shares in both profiles and a stable/moderate/major status from PSI.
+    """
+    if not isinstance(reference, dict) or not isinstance(current, dict):
+        raise ValueError("`reference` and `current` must be profile dicts")
+
+    rows = []
+    for col in sorted(set(reference["histograms"]) & set(current["histograms"])):
+        ref_hist = reference["histograms"][col]
+        cur_hist = current["histograms"][col]
+        if ref_hist["edges"] != cur_hist["edges"]:
+            raise ValueError(f"Histogram bins of '{col}' differ between profiles")
+        rows.append(
+            _drift_row(col, "numeric", ref_hist["counts"], cur_hist["counts"], True)
+        )
+
+    for col in sorted(set(reference["value_counts"]) & set(current["value_counts"])):
+        ref_counts = reference["value_counts"][col]
+        cur_counts = current["value_counts"][col]
+        levels = sorted(set(ref_counts) | set(cur_counts))
+        rows.append(
+            _drift_row(
+                col,
+                "categorical",
+                [ref_counts.get(level, 0) for level in levels],
+                [cur_counts.get(level, 0) for level in levels],
+                False,
+            )
+        )
+
+    report = pd.DataFrame(rows, columns=["feature", "kind", "psi", "ks", "js"])
+    report["missing_ref"] = report["feature"].map(
+        lambda c: _missing_share(reference, c)
+    )
+    report["missing_new"] = report["feature"].map(lambda c: _missing_share(current, c))
+    report["status"] = np.select(
+        [report["psi"] >= PSI_MAJOR, report["psi"] >= PSI_MODERATE],
+        ["major", "moderate"],
+        default="stable",
+    )
+    return report
+
+
+def target_rate_shift(reference: dict, current: dict) -> dict:
+    """
+    Target prevalence of the reference and current profiles.
+
+    Returns:
+        dict: rate_ref, rate_new and their difference.
+    """
+    rates = []
+    for profile in (reference, current):
+        counts = profile["target_by_year"].values()
+        rows = sum(c["rows"] for c in counts)
+        positives = sum(c["positives"] for c in counts)
+        rates.append(positives / rows if rows else float("nan"))
+    return {"rate_ref": rates[0], "rate_new": rates[1], "diff": rates[1] - rates[0]}
+
+
+def _shares(expected, actual):
+    e = np.asarray(expected, dtype=np.float64)
+    a = np.asarray(actual, dtype=np.float64)
+    if e.shape != a.shape:
+        raise ValueError("`expected` and `actual` must have the same length")
+    e = e / e.sum() if e.sum() > 0 else e
+    a = a / a.sum() if a.sum() > 0 else a
+    return e, a
+
+
+def _drift_row(col, kind, ref_counts, cur_counts, ordered):
+    return {
+        "feature": col,
+        "kind": kind,
+        "psi": psi(ref_counts, cur_counts),
+        "ks": ks_statistic(ref_counts, cur_counts) if ordered else np.nan,
+        "js": js_divergence(ref_counts, cur_counts),
+    }
+
+
+def _missing_share(profile, col):
+    rows = profile["rows"]
+    return 1 - profile["non_null"].get(col, 0) / rows if rows else np.nan
@@ -0,0 +1,442 @@
+# brfss_diabetes/eda.py
+
+import hashlib
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .instrumentation import instrument
+from .io import _csv_source, iter_csv_chunks
+
+# Fixed bin edges, so summaries of different files can simply be added up.
+# Age holds the _AGEG5YR midpoints (22, 27, ..., 77, 85), one per bin.
+HIST_BINS = {
+    "age": np.arange(19.5, 90.0, 5.0),
+    "bmi": np.linspace(12.0, 72.0, 61),
+}
+
+# Bump when the summary layout changes so old cache files are not reused
+_CACHE_VERSION = 1
+
+
+def summarize_frame(df: pd.DataFrame, hist_bins=None, target="diabetes") -> dict:
+    """
+    Compute the EDA summary of one frame (or one chunk of a file): non-null
+    counts for every column, value counts for every text column, fixed-bin
+    histograms and the target counts per year.
+
+    Parameters:
+        df (pd.DataFrame): Cleaned BRFSS rows.
+        hist_bins (dict, optional): Bin edges per numeric column, defaults to
+            HIST_BINS. Values outside the edges land in the outer bins.
+        target (str): Yes/No target column counted per year.
+
+    Returns:
+        dict: JSON-serializable summary; combine several with merge_summaries.
+    """
+    if not isinstance(df, pd.DataFrame):
+        raise ValueError(f"`df` must be a pandas DataFrame, got {type(df)}")
+
+    hist_bins = HIST_BINS if hist_bins is None else hist_bins
+    if not isinstance(hist_bins, dict):
+        raise ValueError(f"`hist_bins` must be a dict, got {type(hist_bins)}")
+
+    summary = {
+        "rows": len(df),
+        "non_null": {col: int(n) for col, n in df.notna().sum().items()},
+        "value_counts": {},
+        "histograms": {},
+        "target_by_year": {},
+    }
+
+    for col in df.columns:
+        if df[col].dtype == object or isinstance(df[col].dtype, pd.CategoricalDtype):
+            counts = df[col].value_counts(dropna=True)
+            summary["value_counts"][col] = {
+                str(value): int(n) for value, n in counts.items() if n > 0
+            }
+
+    for col, edges in hist_bins.items():
+        if col not in df.columns:
+            continue
+        edges = np.asarray(edges, dtype=np.float64)
+        values = pd.to_numeric(df[col], errors="coerce").to_numpy(
+            dtype=np.float64, na_value=np.nan
+        )
+        values = np.clip(values[~np.isnan(values)], edges[0], edges[-1])
+        counts, _ = np.histogram(values, bins=edges)
+        summary["histograms"][col] = {
+            "edges": edges.tolist(),
+            "counts": counts.tolist(),
+        }
+
+    if target in df.columns and "year" in df.columns:
+        known = df[target].notna() & df["year"].notna()
+        positives = df[target].astype(str).str.strip().eq("Yes")[known]
+        by_year = positives.groupby(df["year"][known].astype(int)).agg(["size", "sum"])
+        summary["target_by_year"] = {
+            str(year): {"rows": int(row["size"]), "positives": int(row["sum"])}
+            for year, row in by_year.iterrows()
+        }
+
+    return summary
+
+
+def merge_summaries(summaries) -> dict:
+    """
+    Add up summaries of disjoint sets of rows (chunks, years). The result is
+    the summary of all their rows stacked together, as load_all_years would.
+
+    Parameters:
+        summaries (list[dict]): Outputs of summarize_frame / summarize_year.
+
+    Returns:
+        dict: The merged summary.
+    """
+    if not isinstance(summaries, list) or not all(
+        isinstance(s, dict) for s in summaries
+    ):
+        raise ValueError("`summaries` must be a list of dicts")
+
+    merged = {
+        "rows": 0,
+        "non_null": {},
+        "value_counts": {},
+        "histograms": {},
+        "target_by_year": {},
+    }
+
+    for summary in summaries:
+        merged["rows"] += summary["rows"]
+        _add_counts(merged["non_null"], summary["non_null"])
+
+        for col, counts in summary["value_counts"].items():
+            _add_counts(merged["value_counts"].setdefault(col, {}), counts)
+
+        for col, hist in summary["histograms"].items():
+            if col not in merged["histograms"]:
+                merged["histograms"][col] = {
+                    "edges": list(hist["edges"]),
+                    "counts": list(hist["counts"]),
+                }
+                continue
+            current = merged["histograms"][col]
+            if current["edges"] != hist["edges"]:
+                raise ValueError(f"Histogram bins of '{col}' differ between summaries")
+            current["counts"] = [
+                a + b for a, b in zip(current["counts"], hist["counts"])
+            ]
+
+        for year, counts in summary["target_by_year"].items():
+            _add_counts(
+                merged["target_by_year"].setdefault(year, {"rows": 0, "positives": 0}),
+                counts,
+            )
+
+    return merged
+
+
+@instrument()
+def summarize_year(
+    year,
+    data_dir=Path("../data/cleaned"),
+    chunksize=100_000,
+    cache_dir=None,
+    hist_bins=None,
+):
+    """
+    Summarize the cleaned csv of one year in a single streaming pass. When a
+    cache directory is given, the summary is stored under the file's content
+    hash and reused until the file changes.
+
+    Parameters:
+        year (int): Year to summarize.
+        data_dir (Path): Directory containing cleaned CSVs.
+        chunksize (int): Rows per chunk.
+        cache_dir (Path, optional): Where to keep cached summaries.
+        hist_bins (dict, optional): Bin edges per numeric column, defaults to
+            HIST_BINS.
+
+    Returns:
+        dict: Summary of the year's file.
+    """
+    if cache_dir is not None and not isinstance(cache_dir, Path):
+        raise ValueError(f"`cache_dir` must be a pathlib.Path, got {type(cache_dir)}")
+
+    hist_bins = HIST_BINS if hist_bins is None else hist_bins
+    source = _csv_source(year, data_dir)
+
+    # Remote files (Colab) are not hashed, so they are never cached
+    cache_path = None
+    if cache_dir is not None and isinstance(source, Path):
+        key = _summary_key(source, hist_bins)
+        cache_path = cache_dir / f"eda_{year}_{key}.json"
+        if cache_path.exists():
+            with open(cache_path) as f:
+                return json.load(f)
+
+    summary = merge_summaries(
+        [
+            summarize_frame(chunk, hist_bins=hist_bins)
+            for chunk in iter_csv_chunks(year, data_dir=data_dir, chunksize=chunksize)
+        ]
+    )
+
+    if cache_path is not None:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        with open(cache_path, "w") as f:
+            json.dump(summary, f)
+
+    return summary
+
+
+def summarize_years(
+    years,
+    data_dir=Path("../data/cleaned"),
+    chunksize=100_000,
+    cache_dir=None,
+    hist_bins=None,
+):
+    """
+    Summarize several cleaned csvs and merge the results.
+
+    Parameters:
+        years (list of int): Years to summarize.
+        data_dir (Path): Directory containing cleaned CSVs.
+        chunksize (int): Rows per chunk.
+        cache_dir (Path, optional): Where to keep cached summaries.
+        hist_bins (dict, optional): Bin edges per numeric column.
+
+    Returns:
+        dict: Summary of all the years' rows together.
+    """
+    if not isinstance(years, list) or not all(isinstance(y, int) for y in years):
+        raise ValueError("`years` must be a list of integers")
+
+    return merge_summaries(
+        [
+            summarize_year(
+                year,
+                data_dir=data_dir,
+                chunksize=chunksize,
+                cache_dir=cache_dir,
+                hist_bins=hist_bins,
+            )
+            for year in years
+        ]
+    )
+
+
+def missing_table(summary: dict) -> pd.DataFrame:
+    """
+    Missing values per column, as df_all.isnull().sum() over the merged frame
+    (a column a year does not have counts as missing for that year's rows).
+
+    Parameters:
+        summary (dict): Output of summarize_year / summarize_years.
+
+    Returns:
+        pd.DataFrame: 'Missing Values' and 'Percent Missing' for the columns
+        with any missing values, most missing first.
+    """
+    rows = summary["rows"]
+    missing = pd.Series(
+        {col: rows - n for col, n in summary["non_null"].items()}, dtype="int64"
+    )
+    missing = missing[missing > 0].sort_values(ascending=False, kind="stable")
+    percent = (missing / rows * 100).round(2) if rows else missing.astype(float)
+    return pd.DataFrame({"Missing Values": missing, "Percent Missing": percent})
+
+
+def target_rate_table(summary: dict) -> pd.DataFrame:
+    """
+    Respondents, positives and prevalence of the target per year.
+
+    Parameters:
+        summary (dict): Output of summarize_year / summarize_years.
+
+    Returns:
+        pd.DataFrame: Indexed by year with rows, positives and rate columns.
+    """
+    table = pd.DataFrame.from_dict(summary["target_by_year"], orient="index")
+    table = table.reindex(columns=["rows", "positives"]).fillna(0).astype("int64")
+    table.index = table.index.astype(int)
+    table = table.sort_index().rename_axis("year")
+    table["rate"] = table["positives"] / table["rows"].where(table["rows"] > 0)
+    return table
+
+
+def plot_target_by_year(summary: dict, save_path=None):
+    """
+    Bar chart of diabetes Yes/No counts per year, annotated with the share of
+    each year's respondents, drawn from the summary only.
+
+    Parameters:
+        summary (dict): Output of summarize_years.
+        save_path (Path or str, optional): If specified, saves plot to path
+    """
+    import matplotlib.pyplot as plt
+
+    if save_path is not None and not isinstance(save_path, (str, Path)):
+        raise ValueError("`save_path` must be a string or Path object.")
+
+    table = target_rate_table(summary)
+    years = table.index.to_numpy()
+    counts = {
+        "No": (table["rows"] - table["positives"]).to_numpy(),
+        "Yes": table["positives"].to_numpy(),
+    }
+
+    x = np.arange(len(years))
+    width = 0.4
+    fig, ax = plt.subplots(figsize=(8, 5))
+    for offset, (label, heights) in zip([-width / 2, width / 2], counts.items()):
+        bars = ax.bar(x + offset, heights, width, label=label)
+        for bar, height, total in zip(bars, heights, table["rows"]):
+            if height == 0:
+                continue
+            ax.annotate(
+                f"{height / total * 100:.1f}%",
+                xy=(bar.get_x() + bar.get_width() / 2, height),
+                ha="center",
+                va="bottom",
+                fontsize=9,
+            )
+
+    ax.set_xticks(x, [str(year) for year in years])
+    ax.set_title("Diabetes Prevalence by Year", fontsize=14)
+    ax.set_xlabel("Year")
+    ax.set_ylabel("Count")
+    ax.legend(title="Diabetes")
+    plt.tight_layout()
+
+    _finish_plot(plt, save_path)
+
+
+def plot_histograms(summary: dict, columns=None, save_path=None):
+    """
+    Distribution of the binned numeric columns, drawn from the summary only.
+
+    Parameters:
+        summary (dict): Output of summarize_years.
+        columns (list[str], optional): Columns to plot, defaults to all binned.
+        save_path (Path or str, optional): If specified, saves plot to path
+    """
+    import matplotlib.pyplot as plt
+
+    if save_path is not None and not isinstance(save_path, (str, Path)):
+        raise ValueError("`save_path` must be a string or Path object.")
+
+    columns = list(summary["histograms"]) if columns is None else columns
+    missing = [col for col in columns if col not in summary["histograms"]]
+    if missing:
+        raise ValueError(f"No histogram in the summary for: {missing}")
+
+    n_cols = min(3, max(len(columns), 1))
+    n_rows = int(np.ceil(len(columns) / n_cols))
+    fig, axes = plt.subplots(
+        n_rows, n_cols, figsize=(n_cols * 5, n_rows * 3), squeeze=False
+    )
+    for ax, col in zip(axes.flat, columns):
+        edges = np.asarray(summary["histograms"][col]["edges"])
+        counts = np.asarray(summary["histograms"][col]["counts"])
+        ax.bar(edges[:-1], counts, width=np.diff(edges), align="edge")
+        ax.set_title(col)
+    for ax in list(axes.flat)[len(columns) :]:
+        ax.set_visible(False)
+    plt.tight_layout()
+
+    _finish_plot(plt, save_path)
+
+
+def plot_value_counts(summary: dict, columns, orders=None, save_path=None):
+    """
+    Share of each level of the text columns, drawn from the summary only.
+
+    Parameters:
+        summary (dict): Output of summarize_years.
+        columns (list[str]): Columns to plot.
+        orders (dict, optional): Level order per column; otherwise most
+            frequent first.
+        save_path (Path or str, optional): If specified, saves plot to path
+    """
+    import matplotlib.pyplot as plt
+    import matplotlib.ticker as mtick
+
+    if save_path is not None and not isinstance(save_path, (str, Path)):
+        raise ValueError("`save_path` must be a string or Path object.")
+
+    missing = [col for col in columns if col not in summary["value_counts"]]
+    if missing:
+        raise ValueError(f"No value counts in the summary for: {missing}")
+
+    orders = orders or {}
+    n_cols = min(3, max(len(columns), 1))
+    n_rows = int(np.ceil(len(columns) / n_cols))
+    fig, axes = plt.subplots(
+        n_rows, n_cols, figsize=(n_cols * 5, n_rows * 4), squeeze=False
+    )
+    for ax, col in zip(axes.flat, columns):
+        counts = pd.Series(summary["value_counts"][col], dtype="float64")
+        if col in orders:
+            counts = counts.reindex(orders[col], fill_value=0)
+        else:
+            counts = counts.sort_values(ascending=False)
+        share = counts / counts.sum() if counts.sum() else counts
+        ax.bar(share.index.astype(str), share.to_numpy())
+        ax.yaxis.set_major_formatter(mtick.PercentFormatter(1.0))
+        ax.set_title(f"Distribution of {col}")
+        ax.set_xlabel(col)
+        ax.set_ylabel("Probability")
+        ax.tick_params(axis="x", labelrotation=45)
+    for ax in list(axes.flat)[len(columns) :]:
+        ax.set_visible(False)
+    plt.tight_layout()
+
+    _finish_plot(plt, save_path)
+
+
+def file_stamp(path: Path) -> list:
+    """
+    Returns:
+        list: [size, mtime_ns] of the file, a cheap check of whether it may
+        have changed since it was last hashed.
+    """
+    stat = Path(path).stat()
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def file_hash(path: Path) -> str:
+    """
+    Returns:
+        str: SHA-256 hex digest of the file's contents.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _summary_key(path, hist_bins):
+    # Content hash of the file plus the binning, so changing either misses
+    digest = hashlib.sha256(file_hash(path).encode())
+    digest.update(str(_CACHE_VERSION).encode())
+    for col in sorted(hist_bins):
+        digest.update(col.encode())
+        digest.update(np.asarray(hist_bins[col], dtype=np.float64).tobytes())
+    return digest.hexdigest()[:16]
+
+
+def _add_counts(total, counts):
+    for key, n in counts.items():
+        total[key] = total.get(key, 0) + n
+
+
+def _finish_plot(plt, save_path):
+    if save_path:
+        plt.savefig(save_path, dpi=300)
+    else:
+        plt.show()
@@ -1,27 +1,74 @@
+# brfss_diabetes/evaluation.py
+
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-import pandas as pd
 from pathlib import Path
-from sklearn.metrics import classification_report, precision_recall_curve
 
+from .instrumentation import instrument
+
+# pandas, matplotlib, seaborn and sklearn.metrics are imported inside the
+# functions that need them, so scoring code that only needs thresholds does
+# not pay for loading the plotting stack.
 
-def find_optimal_threshold(y_true, y_probs, beta=1.0):
+
+def weighted_precision_recall_curve(y_true, y_probs, sample_weight=None):
     """
-    Find the classification threshold that maximizes the F-beta score.
+    Precision-recall pairs for every distinct threshold, with optional sample
+    (survey) weights. Scores are sorted once and the weighted true/false
+    positive counts come from cumulative sums, so the whole curve is built in
+    O(n log n) with no per-threshold passes. The output layout matches
+    sklearn.metrics.precision_recall_curve.
 
     Parameters:
         y_true (array-like): True binary labels
         y_probs (array-like): Predicted probabilities for the positive class
-        beta (float): Beta parameter for F-beta score
+        sample_weight (array-like, optional): Non-negative weight per row
 
     Returns:
-        float: Optimal threshold value
+        tuple: (precision, recall, thresholds) with thresholds increasing and a
+        final (precision=1, recall=0) point appended.
     """
+    y_true = np.asarray(y_true)
+    y_probs = np.asarray(y_probs)
 
-    if not isinstance(beta, (int, float)) or beta <= 0:
-        raise ValueError(f"`beta` must be a positive number, got {beta}")
+    if sample_weight is not None:
+        sample_weight = np.asarray(sample_weight, dtype=np.float64)
+        nonzero = sample_weight != 0
+        y_true = y_true[nonzero]
+        y_probs = y_probs[nonzero]
+        weight = sample_weight[nonzero]
+    else:
+        weight = np.ones(len(y_true))
+
+    order = np.argsort(y_probs, kind="mergesort")[::-1]
+    y_probs = y_probs[order]
+    pos = (y_true[order] == 1).astype(np.float64)
+    weight = weight[order]
+
+    # Last index of each run of tied scores, plus the end of the curve
+    distinct = np.flatnonzero(np.diff(y_probs))
+    threshold_idx = np.r_[distinct, y_probs.size - 1]
 
+    tps = np.cumsum(pos * weight)[threshold_idx]
+    fps = np.cumsum((1 - pos) * weight)[threshold_idx]
+
+    ps = tps + fps
+    precision = np.zeros_like(tps)
+    np.divide(tps, ps, out=precision, where=(ps != 0))
+
+    if tps[-1] == 0:
+        recall = np.ones_like(tps)
+    else:
+        recall = tps / tps[-1]
+
+    # reverse so recall is decreasing and thresholds increasing
+    return (
+        np.hstack((precision[::-1], 1)),
+        np.hstack((recall[::-1], 0)),
+        y_probs[threshold_idx][::-1],
+    )
+
+
+def _validate_scores(y_true, y_probs, sample_weight):
     y_true = np.asarray(y_true)
     y_probs = np.asarray(y_probs)
 
@@ -37,7 +84,123 @@ def find_optimal_threshold(y_true, y_probs, beta=1.0):
     if np.any(y_probs < 0) or np.any(y_probs > 1):
         raise ValueError("`y_probs` contains values outside [0, 1].")
 
-    precision, recall, thresholds = precision_recall_curve(y_true, y_probs)
+    if sample_weight is not None:
+        sample_weight = np.asarray(sample_weight, dtype=np.float64)
+        if sample_weight.shape != y_true.shape:
+            raise ValueError("`sample_weight` must have the same shape as `y_true`.")
+        if not np.all(np.isfinite(sample_weight)) or np.any(sample_weight < 0):
+            raise ValueError("`sample_weight` must be finite and non-negative.")
+
+    return y_true, y_probs, sample_weight
+
+
+def _fbeta(tp, predicted_pos, actual_pos, beta):
+    precision = np.divide(
+        tp, predicted_pos, out=np.zeros_like(tp), where=(predicted_pos != 0)
+    )
+    recall = np.divide(tp, actual_pos, out=np.zeros_like(tp), where=(actual_pos != 0))
+    return (1 + beta**2) * precision * recall / (beta**2 * precision + recall + 1e-8)
+
+
+def _best_thresholds(probs, pos, weight, codes, n_groups, beta):
+    """
+    Per-group curve statistics from score-descending arrays and group codes.
+    """
+    # Stable regroup: rows stay in descending score order within each group
+    perm = np.argsort(codes, kind="stable")
+    codes = codes[perm]
+    probs = probs[perm]
+    tp_w = (pos * weight)[perm]
+    fp_w = ((1 - pos) * weight)[perm]
+
+    positives = np.bincount(codes, weights=tp_w, minlength=n_groups)
+    negatives = np.bincount(codes, weights=fp_w, minlength=n_groups)
+
+    # Within-group cumulative counts: global cumsum minus the group's offset
+    starts = np.r_[0, np.cumsum(np.bincount(codes, minlength=n_groups))[:-1]]
+    ctp = np.cumsum(tp_w)
+    cfp = np.cumsum(fp_w)
+    ctp -= np.r_[0.0, ctp][starts][codes]
+    cfp -= np.r_[0.0, cfp][starts][codes]
+
+    # Curve points: last row of each run of tied scores within a group
+    n = len(codes)
+    is_point = np.ones(n, dtype=bool)
+    is_point[:-1] = (codes[1:] != codes[:-1]) | (probs[1:] != probs[:-1])
+    idx = np.flatnonzero(is_point)
+    gid = codes[idx]
+    tps = ctp[idx]
+    fps = cfp[idx]
+    thresholds = probs[idx]
+
+    # Previous point within the same group (origin at each group's start)
+    first = np.r_[True, gid[1:] != gid[:-1]]
+    prev_tps = np.where(first, 0.0, np.r_[0.0, tps[:-1]])
+    prev_fps = np.where(first, 0.0, np.r_[0.0, fps[:-1]])
+
+    # ROC AUC via the trapezoid rule, average precision as in sklearn
+    area = np.bincount(
+        gid, weights=(fps - prev_fps) * (tps + prev_tps) / 2, minlength=n_groups
+    )
+    precision = np.divide(
+        tps, tps + fps, out=np.zeros_like(tps), where=(tps + fps) != 0
+    )
+    ap = np.bincount(gid, weights=(tps - prev_tps) * precision, minlength=n_groups)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        auc = np.where(
+            (positives > 0) & (negatives > 0), area / (positives * negatives), np.nan
+        )
+        pr_auc = np.where(positives > 0, ap / positives, np.nan)
+
+    # Best F-beta per group; ties go to the lowest threshold like argmax over
+    # the increasing thresholds of find_optimal_threshold
+    fbeta = _fbeta(tps, tps + fps, positives[gid], beta)
+    best = np.full(n_groups, -np.inf)
+    np.maximum.at(best, gid, fbeta)
+    best_idx = np.full(n_groups, -1)
+    is_best = fbeta == best[gid]
+    np.maximum.at(best_idx, gid[is_best], np.flatnonzero(is_best))
+
+    threshold = np.full(n_groups, np.nan)
+    has_rows = best_idx >= 0
+    threshold[has_rows] = thresholds[best_idx[has_rows]]
+    best[~has_rows] = np.nan
+
+    return {
+        "positives": positives,
+        "total": positives + negatives,
+        "auc": auc,
+        "pr_auc": pr_auc,
+        "threshold": threshold,
+        "fbeta": best,
+    }
+
+
+@instrument()
+def find_optimal_threshold(y_true, y_probs, beta=1.0, sample_weight=None):
+    """
+    Find the classification threshold that maximizes the F-beta score.
+
+    Parameters:
+        y_true (array-like): True binary labels
+        y_probs (array-like): Predicted probabilities for the positive class
+        beta (float): Beta parameter for F-beta score
+        sample_weight (array-like, optional): Survey weight per row, e.g. _LLCPWT,
+            so the threshold is optimal for the population rather than the sample
+
+    Returns:
+        float: Optimal threshold value
+    """
+
+    if not isinstance(beta, (int, float)) or beta <= 0:
+        raise ValueError(f"`beta` must be a positive number, got {beta}")
+
+    y_true, y_probs, sample_weight = _validate_scores(y_true, y_probs, sample_weight)
+
+    precision, recall, thresholds = weighted_precision_recall_curve(
+        y_true, y_probs, sample_weight
+    )
     f_beta_scores = (
         (1 + beta**2)
         * (precision[:-1] * recall[:-1])
@@ -47,6 +210,136 @@ def find_optimal_threshold(y_true, y_probs, beta=1.0):
     return thresholds[best_idx]
 
 
+def find_crosspoint_threshold(y_true, y_probs, sample_weight=None):
+    """
+    Find the threshold where precision and recall are closest, as the
+    notebooks pick their tuned threshold.
+
+    Parameters:
+        y_true (array-like): True binary labels
+        y_probs (array-like): Predicted probabilities for the positive class
+        sample_weight (array-like, optional): Survey weight per row
+
+    Returns:
+        float: Threshold at the precision/recall crossover
+    """
+    y_true, y_probs, sample_weight = _validate_scores(y_true, y_probs, sample_weight)
+
+    precision, recall, thresholds = weighted_precision_recall_curve(
+        y_true, y_probs, sample_weight
+    )
+    cross_idx = np.argmin(np.abs(precision[:-1] - recall[:-1]))
+    return thresholds[cross_idx]
+
+
+@instrument()
+def grouped_metrics(y_true, y_probs, groups, beta=1.0, sample_weight=None):
+    """
+    Per-group AUC, PR-AUC and F-beta for several grouping variables in one pass.
+
+    Scores are sorted once. For each grouping variable the rows are then
+    regrouped with a stable sort on the group codes, which keeps every group's
+    rows in descending score order, and the per-group confusion counts at all
+    thresholds come from a single cumulative sum. Per-group totals and the
+    counts at the global threshold use np.bincount on the group codes, so no
+    per-slice classification_report calls are needed.
+
+    Parameters:
+        y_true (array-like): True binary labels
+        y_probs (array-like): Predicted probabilities for the positive class
+        groups (pd.DataFrame or dict): Grouping variables aligned with y_true,
+            e.g. df[["year", "sex", "educa", "bmi_cat"]]
+        beta (float): Beta parameter for F-beta score
+        sample_weight (array-like, optional): Survey weight per row
+
+    Returns:
+        pd.DataFrame: One row per (variable, group) plus an overall row, with
+        n, positives, prevalence, auc, pr_auc, the F-beta at the global optimal
+        threshold and the F-beta at each group's own optimal threshold.
+    """
+    import pandas as pd
+
+    if not isinstance(beta, (int, float)) or beta <= 0:
+        raise ValueError(f"`beta` must be a positive number, got {beta}")
+
+    if isinstance(groups, pd.DataFrame):
+        groups = {col: groups[col] for col in groups.columns}
+    if not isinstance(groups, dict):
+        raise ValueError(
+            f"`groups` must be a pandas DataFrame or dict, got {type(groups)}"
+        )
+
+    y_true, y_probs, sample_weight = _validate_scores(y_true, y_probs, sample_weight)
+
+    for name, values in groups.items():
+        if len(values) != len(y_true):
+            raise ValueError(f"Group '{name}' must have the same length as `y_true`.")
+
+    weight = np.ones(len(y_true)) if sample_weight is None else sample_weight
+
+    # The one global sort; everything below works on score-descending order
+    order = np.argsort(y_probs, kind="mergesort")[::-1]
+    probs_sorted = y_probs[order]
+    pos_sorted = (y_true[order] == 1).astype(np.float64)
+    weight_sorted = weight[order]
+
+    variables = [("all", np.zeros(len(order), dtype=np.int64), np.array(["all"]))]
+    for name, values in groups.items():
+        codes, labels = pd.factorize(np.asarray(values)[order])
+        variables.append((name, codes, labels))
+
+    overall = _best_thresholds(
+        probs_sorted, pos_sorted, weight_sorted, variables[0][1], 1, beta
+    )
+    global_threshold = overall["threshold"][0]
+    predicted = (probs_sorted >= global_threshold).astype(np.float64)
+
+    rows = []
+    for i, (name, codes, labels) in enumerate(variables):
+        # Rows with a missing group value are left out of that variable's slices
+        keep = codes >= 0
+        codes = codes[keep]
+        probs_g = probs_sorted[keep]
+        pos_g = pos_sorted[keep]
+        weight_g = weight_sorted[keep]
+        n_groups = len(labels)
+
+        if i == 0:
+            stats = overall
+        else:
+            stats = _best_thresholds(probs_g, pos_g, weight_g, codes, n_groups, beta)
+
+        pred_g = predicted[keep]
+        tp_at = np.bincount(
+            codes, weights=pos_g * weight_g * pred_g, minlength=n_groups
+        )
+        fp_at = np.bincount(
+            codes, weights=(1 - pos_g) * weight_g * pred_g, minlength=n_groups
+        )
+        fbeta_global = _fbeta(tp_at, tp_at + fp_at, stats["positives"], beta)
+
+        n_rows = np.bincount(codes, minlength=n_groups)
+        for g, label in enumerate(labels):
+            rows.append(
+                {
+                    "variable": name,
+                    "group": label,
+                    "n": int(n_rows[g]),
+                    "positives": stats["positives"][g],
+                    "prevalence": stats["positives"][g] / stats["total"][g],
+                    "auc": stats["auc"][g],
+                    "pr_auc": stats["pr_auc"][g],
+                    "global_threshold": global_threshold,
+                    "fbeta_global": fbeta_global[g],
+                    "group_threshold": stats["threshold"][g],
+                    "fbeta_group": stats["fbeta"][g],
+                }
+            )
+
+    return pd.DataFrame(rows)
+
+
+@instrument()
 def plot_classification_report(
     y_true, y_pred, title="Classification Report", save_path=None
 ):
@@ -59,6 +352,10 @@ def plot_classification_report(
         title (str): Plot title
         save_path (Path or str, optional): If specified, saves plot to path
     """
+    import matplotlib.pyplot as plt
+    import pandas as pd
+    import seaborn as sns
+    from sklearn.metrics import classification_report
 
     y_true = np.asarray(y_true)
     y_pred = np.asarray(y_pred)
@@ -0,0 +1,362 @@
+# brfss_diabetes/explain.py
+
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .config import SEED
+from .dataplane import attach, shared_arrays
+from .instrumentation import instrument
+from .preprocessing import CATEGORICAL_FEATURES
+from .resources import init_worker_threads, limit_threads, plan
+
+# Worker-side state of the permutation pool, set once per process by
+# _init_worker so tasks only carry (group, repeat) indices
+_WORKER = {}
+
+# Rows scored at once when a group is permuted; bounds the scratch buffer
+_BLOCK_ROWS = 65_536
+
+
+def feature_groups(feature_names, common_features):
+    """
+    Map every encoded column back to the original feature it came from, so
+    all dummies of one categorical are treated as one feature.
+
+    Parameters:
+        feature_names (list[str]): Encoded column names, e.g. the columns of
+            prepare_common_features without 'diabetes'.
+        common_features (list[str]): Original feature names.
+
+    Returns:
+        dict: Original feature -> list of column positions, in the order of
+        common_features (features without any encoded column are left out).
+    """
+    if not isinstance(common_features, list) or not all(
+        isinstance(f, str) for f in common_features
+    ):
+        raise ValueError("`common_features` must be a list of strings")
+
+    # Longest prefix first, so 'bmi_cat_Obese' goes to bmi_cat and not bmi
+    prefixes = sorted(
+        [col for col in common_features if col in CATEGORICAL_FEATURES],
+        key=len,
+        reverse=True,
+    )
+
+    groups = {col: [] for col in common_features}
+    for i, name in enumerate(feature_names):
+        if name in groups:
+            groups[name].append(i)
+            continue
+        owner = next((col for col in prefixes if name.startswith(f"{col}_")), None)
+        if owner is None:
+            raise ValueError(f"Column '{name}' does not belong to any common feature")
+        groups[owner].append(i)
+
+    return {col: idx for col, idx in groups.items() if idx}
+
+
+@instrument()
+def grouped_permutation_importance(
+    model,
+    X,
+    y,
+    feature_names,
+    common_features,
+    n_repeats=5,
+    scoring="roc_auc",
+    n_jobs=1,
+    seed=SEED,
+    sample_weight=None,
+):
+    """
+    Permutation importance per original feature: all columns of a feature
+    (e.g. every educa_* dummy) are shuffled together with one row
+    permutation, and the drop in score is the feature's importance.
+
+    With n_jobs > 1 the (feature, repeat) tasks run in a process pool. The
+    test matrix is published once in shared memory and every worker maps it
+    read-only; a task only copies the permuted group's columns and scores
+    row blocks through a small scratch buffer. The model is pickled once
+    per worker rather than per task and the baseline is scored once.
+    Workers and their threads are sized from the package CPU budget (see
+    resources.plan). Results do not depend on n_jobs.
+
+    Parameters:
+        model: Fitted classifier with predict_proba.
+        X (array-like): Encoded test features.
+        y (array-like): 0/1 test labels.
+        feature_names (list[str]): Column names of X.
+        common_features (list[str]): Original feature names to report.
+        n_repeats (int): Permutations per feature.
+        scoring (str): "roc_auc" or "average_precision".
+        n_jobs (int): Worker processes, capped at the CPU budget; 1 runs in
+            this process.
+        seed (int): Seed for the permutations.
+        sample_weight (array-like, optional): Row weights for the score.
+
+    Returns:
+        pd.DataFrame: feature, importance_mean, importance_std and n_columns,
+        sorted by importance, with the baseline score in .attrs["baseline"].
+    """
+    if scoring not in _SCORERS:
+        raise ValueError(f"`scoring` must be one of {list(_SCORERS)}, got {scoring}")
+
+    if not isinstance(n_repeats, int) or n_repeats <= 0:
+        raise ValueError(f"`n_repeats` must be a positive int, got {n_repeats}")
+
+    if not isinstance(n_jobs, int) or n_jobs <= 0:
+        raise ValueError(f"`n_jobs` must be a positive int, got {n_jobs}")
+
+    X = np.ascontiguousarray(np.asarray(X, dtype=np.float64))
+    y = np.asarray(y)
+    if X.ndim != 2 or len(X) != len(y):
+        raise ValueError("`X` must be 2-D with one row per label in `y`")
+
+    if len(feature_names) != X.shape[1]:
+        raise ValueError("`feature_names` must name every column of `X`")
+
+    groups = feature_groups(list(feature_names), common_features)
+    group_cols = list(groups.values())
+    tasks = [(g, r) for g in range(len(group_cols)) for r in range(n_repeats)]
+
+    arrays = {"X": X, "y": y}
+    if sample_weight is not None:
+        arrays["w"] = np.asarray(sample_weight, dtype=np.float64)
+
+    resources = plan(n_jobs)
+    model_bytes = pickle.dumps(model)
+    worker_args = (
+        model_bytes,
+        list(feature_names),
+        group_cols,
+        scoring,
+        seed,
+        resources["threads"],
+    )
+
+    try:
+        # The baseline is scored here once and handed to every worker
+        _init_worker(None, *worker_args)
+        _WORKER["arrays"] = arrays
+        with limit_threads(resources["threads"]):
+            baseline = _score(X)
+
+        if resources["workers"] == 1:
+            _WORKER["baseline"] = baseline
+            with limit_threads(resources["threads"]):
+                drops = [_permutation_drop(task) for task in tasks]
+        else:
+            with shared_arrays(arrays) as plane:
+                with ProcessPoolExecutor(
+                    max_workers=resources["workers"],
+                    initializer=_init_worker,
+                    initargs=(plane["spec"], *worker_args, baseline),
+                ) as pool:
+                    drops = list(
+                        pool.map(
+                            _permutation_drop,
+                            tasks,
+                            chunksize=max(1, len(tasks) // (4 * resources["workers"])),
+                        )
+                    )
+    finally:
+        # The unpickled model, arrays and scratch buffer are not kept around
+        _WORKER.clear()
+
+    drops = np.asarray(drops).reshape(len(group_cols), n_repeats)
+    result = pd.DataFrame(
+        {
+            "feature": list(groups),
+            "importance_mean": drops.mean(axis=1),
+            "importance_std": drops.std(axis=1),
+            "n_columns": [len(cols) for cols in group_cols],
+        }
+    )
+    result = result.sort_values("importance_mean", ascending=False, kind="stable")
+    result = result.reset_index(drop=True)
+    result.attrs["baseline"] = baseline
+    return result
+
+
+@instrument()
+def xgb_contributions(model, X, feature_names, common_features):
+    """
+    Exact TreeSHAP contributions from XGBoost's own pred_contribs, summed
+    over the encoded columns of each original feature.
+
+    Parameters:
+        model: Fitted XGBClassifier or xgboost.Booster.
+        X (array-like): Encoded features.
+        feature_names (list[str]): Column names of X.
+        common_features (list[str]): Original feature names to report.
+
+    Returns:
+        pd.DataFrame: One row per row of X and one column per original feature
+        plus 'bias'. Each row sums to the model's log-odds output.
+    """
+    import xgboost as xgb
+
+    booster = model.get_booster() if hasattr(model, "get_booster") else model
+    if not isinstance(booster, xgb.Booster):
+        raise ValueError(f"`model` must be an XGBoost model, got {type(model)}")
+
+    X = np.asarray(X, dtype=np.float32)
+    if X.ndim != 2 or len(feature_names) != X.shape[1]:
+        raise ValueError("`feature_names` must name every column of `X`")
+
+    names = list(feature_names) if booster.feature_names is not None else None
+    contribs = booster.predict(xgb.DMatrix(X, feature_names=names), pred_contribs=True)
+
+    groups = feature_groups(list(feature_names), common_features)
+    indicator = np.zeros((X.shape[1] + 1, len(groups) + 1))
+    for j, cols in enumerate(groups.values()):
+        indicator[cols, j] = 1.0
+    indicator[-1, -1] = 1.0
+
+    return pd.DataFrame(contribs @ indicator, columns=list(groups) + ["bias"])
+
+
+def contribution_importance(contributions: pd.DataFrame) -> pd.DataFrame:
+    """
+    Global importance from per-row contributions: the mean absolute
+    contribution of each original feature.
+
+    Parameters:
+        contributions (pd.DataFrame): Output of xgb_contributions.
+
+    Returns:
+        pd.DataFrame: feature and mean_abs_contribution, largest first.
+    """
+    if not isinstance(contributions, pd.DataFrame):
+        raise ValueError(
+            f"`contributions` must be a pandas DataFrame, got {type(contributions)}"
+        )
+
+    importance = contributions.drop(columns=["bias"], errors="ignore").abs().mean()
+    return (
+        importance.sort_values(ascending=False, kind="stable")
+        .rename_axis("feature")
+        .reset_index(name="mean_abs_contribution")
+    )
+
+
+def plot_feature_importance(
+    importance: pd.DataFrame, title="Feature Importance", save_path=None
+):
+    """
+    Horizontal bar chart of a grouped_permutation_importance or
+    contribution_importance table.
+
+    Parameters:
+        importance (pd.DataFrame): Table with 'feature' and one value column.
+        title (str): Plot title
+        save_path (Path or str, optional): If specified, saves plot to path
+    """
+    import matplotlib.pyplot as plt
+
+    if not isinstance(importance, pd.DataFrame) or "feature" not in importance:
+        raise ValueError("`importance` must be a DataFrame with a 'feature' column")
+
+    if save_path is not None and not isinstance(save_path, (str, Path)):
+        raise ValueError("`save_path` must be a string or Path object.")
+
+    value_col = (
+        "importance_mean"
+        if "importance_mean" in importance
+        else "mean_abs_contribution"
+    )
+    table = importance.iloc[::-1]
+    xerr = table["importance_std"] if "importance_std" in table else None
+
+    fig, ax = plt.subplots(figsize=(7, 0.4 * len(table) + 1.5))
+    ax.barh(table["feature"], table[value_col], xerr=xerr, color="steelblue")
+    ax.set_xlabel(value_col.replace("_", " "))
+    ax.set_title(title, fontsize=12)
+    plt.tight_layout()
+
+    if save_path:
+        plt.savefig(save_path, dpi=300)
+    else:
+        plt.show()
+
+
+def _roc_auc(y, p, w):
+    from sklearn.metrics import roc_auc_score
+
+    return roc_auc_score(y, p, sample_weight=w)
+
+
+def _average_precision(y, p, w):
+    from sklearn.metrics import average_precision_score
+
+    return average_precision_score(y, p, sample_weight=w)
+
+
+_SCORERS = {"roc_auc": _roc_auc, "average_precision": _average_precision}
+
+
+def _init_worker(
+    spec, model_bytes, feature_names, group_cols, scoring, seed, threads, baseline=None
+):
+    _WORKER.clear()
+    if spec is not None:
+        init_worker_threads(threads)
+        attached = attach(spec)
+        _WORKER["attached"] = attached
+        _WORKER["arrays"] = attached["arrays"]
+        _WORKER["baseline"] = baseline
+
+    model = pickle.loads(model_bytes)
+    # XGBoost models carry their own thread count (n_jobs is its nthread);
+    # sklearn estimators are covered by the BLAS/OpenMP limits
+    if type(model).__module__.startswith("xgboost"):
+        model.set_params(n_jobs=threads)
+    _WORKER.update(
+        model=model,
+        columns=feature_names if hasattr(model, "feature_names_in_") else None,
+        group_cols=group_cols,
+        scorer=_SCORERS[scoring],
+        seed=seed,
+    )
+
+
+def _score(X, cols=None, permuted=None):
+    # With cols, score X with those columns replaced by `permuted`; rows are
+    # assembled block by block in a scratch buffer, so X is never written
+    if cols is None:
+        p = _predict(X)
+    else:
+        p = np.empty(len(X))
+        if "scratch" not in _WORKER:
+            _WORKER["scratch"] = np.empty((min(len(X), _BLOCK_ROWS), X.shape[1]))
+        for start in range(0, len(X), _BLOCK_ROWS):
+            stop = min(start + _BLOCK_ROWS, len(X))
+            block = _WORKER["scratch"][: stop - start]
+            block[:] = X[start:stop]
+            block[:, cols] = permuted[start:stop]
+            p[start:stop] = _predict(block)
+
+    arrays = _WORKER["arrays"]
+    return _WORKER["scorer"](arrays["y"], p, arrays.get("w"))
+
+
+def _predict(X):
+    columns = _WORKER["columns"]
+    if columns is not None:
+        X = pd.DataFrame(X, columns=columns, copy=False)
+    return _WORKER["model"].predict_proba(X)[:, 1]
+
+
+def _permutation_drop(task):
+    group, repeat = task
+    X = _WORKER["arrays"]["X"]
+    cols = _WORKER["group_cols"][group]
+
+    rng = np.random.default_rng([_WORKER["seed"], group, repeat])
+    permuted = X[np.ix_(rng.permutation(len(X)), cols)]
+    return _WORKER["baseline"] - _score(X, cols, permuted)
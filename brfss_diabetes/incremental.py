@@ -0,0 +1,271 @@
+# brfss_diabetes/incremental.py
+
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import SGDClassifier
+
+from .config import FEATURE_LEVELS, SEED
+from .io import iter_csv_chunks
+from .preprocessing import CATEGORICAL_FEATURES, prepare_common_features
+
+
+def encode_chunk(df, common_features, weight_col=None):
+    """
+    Encode one chunk of cleaned rows with a fixed dummy layout. Categorical
+    columns are pinned to FEATURE_LEVELS so every chunk (and every year) yields
+    the same columns in the same order, whatever levels it happens to contain.
+
+    Parameters:
+        df (pd.DataFrame): Chunk of a cleaned BRFSS csv.
+        common_features (list[str]): Feature names to encode.
+        weight_col (str, optional): Survey weight column to return alongside.
+
+    Returns:
+        tuple: (X, y, feature_names, w) with X as a float64 array, y as 0/1 ints
+        and w the row weights (all ones when weight_col is None).
+    """
+    if not isinstance(df, pd.DataFrame):
+        raise ValueError(f"`df` must be a pandas DataFrame, got {type(df)}")
+
+    df = df.copy()
+    for col in CATEGORICAL_FEATURES:
+        if col in common_features and col in df.columns:
+            df[col] = pd.Categorical(df[col], categories=FEATURE_LEVELS[col])
+
+    df_common = prepare_common_features(df, common_features, weight_col=weight_col)
+    y = df_common.pop("diabetes").to_numpy(dtype=np.int64)
+    if weight_col is None:
+        w = np.ones(len(y))
+    else:
+        w = df_common.pop(weight_col).to_numpy(dtype=np.float64)
+
+    return df_common.to_numpy(dtype=np.float64), y, list(df_common.columns), w
+
+
+def transform_chunk(df, schema):
+    """
+    Encode and standardize a chunk exactly as train_incremental_logistic did,
+    so the result can be passed straight to the fitted model.
+
+    Parameters:
+        df (pd.DataFrame): Chunk of a cleaned BRFSS csv.
+        schema (dict): Schema returned by train_incremental_logistic.
+
+    Returns:
+        tuple: (X, y) ready for model.predict_proba(X).
+    """
+    if not isinstance(schema, dict):
+        raise ValueError(f"`schema` must be a dict, got {type(schema)}")
+
+    X, y, _, _ = encode_chunk(df, schema["common_features"])
+    return (X - schema["mean"]) / schema["scale"], y
+
+
+def train_incremental_logistic(
+    train_years,
+    valid_year,
+    common_features,
+    data_dir=Path("../data/cleaned"),
+    chunksize=100_000,
+    max_epochs=20,
+    n_iter_no_change=3,
+    tol=1e-4,
+    alpha=1e-4,
+    seed=SEED,
+    spill_dir=None,
+    weight_col=None,
+):
+    """
+    Fit a logistic model out of core with SGDClassifier(loss="log_loss").partial_fit.
+
+    Each year's cleaned csv is streamed once in chunks, encoded and spilled to
+    disk as .npy files while the class counts and column moments are gathered.
+    Training then runs several epochs over the spilled chunks in a shuffled
+    order, with class-balanced sample weights and early stopping on the
+    balanced log loss of the held-out year. Only one chunk is in memory at a
+    time, so memory stays bounded however many years are added.
+
+    Parameters:
+        train_years (list of int): Years to train on.
+        valid_year (int): Held-out year used for early stopping.
+        common_features (list[str]): Feature names to encode.
+        data_dir (Path): Directory containing cleaned CSVs.
+        chunksize (int): Rows per chunk.
+        max_epochs (int): Maximum passes over the training chunks.
+        n_iter_no_change (int): Epochs without improvement before stopping.
+        tol (float): Minimum improvement in validation loss to count.
+        alpha (float): L2 regularization strength for SGDClassifier.
+        seed (int): Seed for the model and the chunk/row shuffling.
+        spill_dir (Path, optional): Where to spill encoded chunks. A temporary
+            directory is created and removed if not given.
+        weight_col (str, optional): Survey weight column, e.g. "survey_weight".
+            Rows are weighted by it in training and in the validation loss, and
+            the class balance is computed on weighted totals.
+
+    Returns:
+        tuple: (model, schema, history) where model is the fitted SGDClassifier
+        restored to its best epoch, schema holds the feature names and scaling
+        needed by transform_chunk, and history is a DataFrame of per-epoch
+        validation loss.
+    """
+    if not isinstance(train_years, list) or not all(
+        isinstance(y, int) for y in train_years
+    ):
+        raise ValueError("`train_years` must be a list of integers")
+
+    if not isinstance(valid_year, int):
+        raise ValueError(f"`valid_year` must be an int, got {type(valid_year)}")
+
+    if valid_year in train_years:
+        raise ValueError(f"`valid_year` {valid_year} is also in `train_years`")
+
+    if not isinstance(max_epochs, int) or max_epochs <= 0:
+        raise ValueError(f"`max_epochs` must be a positive int, got {max_epochs}")
+
+    if not isinstance(n_iter_no_change, int) or n_iter_no_change <= 0:
+        raise ValueError(
+            f"`n_iter_no_change` must be a positive int, got {n_iter_no_change}"
+        )
+
+    if spill_dir is not None and not isinstance(spill_dir, Path):
+        raise ValueError(f"`spill_dir` must be a pathlib.Path, got {type(spill_dir)}")
+
+    cleanup = spill_dir is None
+    spill_dir = Path(tempfile.mkdtemp()) if cleanup else spill_dir
+    spill_dir.mkdir(parents=True, exist_ok=True)
+
+    try:
+        train_files, stats = _spill_years(
+            train_years, common_features, data_dir, chunksize, spill_dir, weight_col
+        )
+        valid_files, _ = _spill_years(
+            [valid_year], common_features, data_dir, chunksize, spill_dir, weight_col
+        )
+
+        if not valid_files:
+            raise ValueError(f"No usable rows found for `valid_year` {valid_year}")
+
+        n = stats["n"]
+        counts = stats["class_counts"]
+        if n == 0 or np.any(counts == 0):
+            raise ValueError(
+                f"Training data must contain both classes, got counts {counts.tolist()}"
+            )
+
+        # Standardize the plain numeric/binary columns; dummies are left as 0/1
+        dummy = np.array(
+            [
+                any(name.startswith(f"{col}_") for col in CATEGORICAL_FEATURES)
+                for name in stats["feature_names"]
+            ]
+        )
+        mean = stats["sum"] / n
+        scale = np.sqrt(np.maximum(stats["sumsq"] / n - mean**2, 0.0))
+        scale[scale == 0] = 1.0
+        mean[dummy] = 0.0
+        scale[dummy] = 1.0
+
+        # Same weights as class_weight="balanced", on (weighted) class totals
+        class_weight = counts.sum() / (2.0 * counts)
+
+        model = SGDClassifier(loss="log_loss", alpha=alpha, random_state=seed)
+        rng = np.random.default_rng(seed)
+
+        history = []
+        best_loss = np.inf
+        best_params = None
+        no_improvement = 0
+
+        for epoch in range(1, max_epochs + 1):
+            for idx in rng.permutation(len(train_files)):
+                X, y, w = _load_chunk(train_files[idx], mean, scale)
+                order = rng.permutation(len(y))
+                model.partial_fit(
+                    X[order],
+                    y[order],
+                    classes=np.array([0, 1]),
+                    sample_weight=w[order] * class_weight[y[order]],
+                )
+
+            loss = _balanced_log_loss(model, valid_files, mean, scale, class_weight)
+            history.append({"epoch": epoch, "valid_log_loss": loss})
+
+            if loss < best_loss - tol:
+                best_loss = loss
+                best_params = (model.coef_.copy(), model.intercept_.copy())
+                no_improvement = 0
+            else:
+                no_improvement += 1
+                if no_improvement >= n_iter_no_change:
+                    break
+
+        if best_params is not None:
+            model.coef_, model.intercept_ = best_params
+    finally:
+        if cleanup:
+            shutil.rmtree(spill_dir, ignore_errors=True)
+
+    schema = {
+        "common_features": list(common_features),
+        "feature_names": stats["feature_names"],
+        "mean": mean,
+        "scale": scale,
+        "class_weight": class_weight,
+        "weight_col": weight_col,
+    }
+    return model, schema, pd.DataFrame(history)
+
+
+def _spill_years(years, common_features, data_dir, chunksize, spill_dir, weight_col):
+    files = []
+    stats = {"n": 0, "sum": 0.0, "sumsq": 0.0, "class_counts": np.zeros(2)}
+
+    for year in years:
+        chunks = iter_csv_chunks(
+            year,
+            data_dir=data_dir,
+            chunksize=chunksize,
+            usecols=common_features
+            + ([weight_col] if weight_col else [])
+            + ["diabetes"],
+        )
+        for i, chunk in enumerate(chunks):
+            X, y, names, w = encode_chunk(chunk, common_features, weight_col)
+            if len(y) == 0:
+                continue
+
+            path = spill_dir / f"{year}_{i:05d}.npy"
+            np.save(path, np.column_stack([X, w, y]))
+            files.append(path)
+
+            stats["feature_names"] = names
+            stats["n"] += len(y)
+            stats["sum"] = stats["sum"] + X.sum(axis=0)
+            stats["sumsq"] = stats["sumsq"] + (X**2).sum(axis=0)
+            stats["class_counts"] += np.bincount(y, weights=w, minlength=2)
+
+    return files, stats
+
+
+def _load_chunk(path, mean, scale):
+    data = np.load(path, mmap_mode="r")
+    X = (data[:, :-2] - mean) / scale
+    w = np.asarray(data[:, -2])
+    y = np.asarray(data[:, -1], dtype=np.int64)
+    return X, y, w
+
+
+def _balanced_log_loss(model, files, mean, scale, class_weight):
+    total = 0.0
+    weight = 0.0
+    for path in files:
+        X, y, w = _load_chunk(path, mean, scale)
+        p = np.clip(model.predict_proba(X)[:, 1], 1e-15, 1 - 1e-15)
+        w = w * class_weight[y]
+        total += -np.sum(w * (y * np.log(p) + (1 - y) * np.log1p(-p)))
+        weight += w.sum()
+    return total / weight
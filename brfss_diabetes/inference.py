@@ -0,0 +1,231 @@
+# brfss_diabetes/inference.py
+
+# Logistic scoring without sklearn: a kernel is a plain dict of float32
+# weights, intercept, feature order and threshold, and scoring a batch is
+# one X @ w plus a sigmoid. Only numpy is imported, so a scoring process
+# starts in a fraction of the time an sklearn import takes.
+
+from pathlib import Path
+
+import numpy as np
+
+
+def export_kernel(
+    model, feature_names, threshold=0.5, mean=None, scale=None, path=None
+) -> dict:
+    """
+    Build an inference kernel from a fitted binary linear classifier
+    (LogisticRegression, SGDClassifier(loss="log_loss"), ...). Standardization
+    from train_incremental_logistic can be folded in, so raw encoded rows
+    are scored directly.
+
+    Parameters:
+        model: Fitted classifier with coef_ and intercept_.
+        feature_names (list[str]): Encoded column order the model was fit on.
+        threshold (float): Decision threshold, e.g. the tuned crosspoint.
+        mean (array-like, optional): Column means subtracted before the fit.
+        scale (array-like, optional): Column scales divided by before the fit.
+        path (Path or str, optional): Also save the kernel there (.npz).
+
+    Returns:
+        dict: The kernel (coef, intercept, feature_names, threshold).
+    """
+    coef = np.asarray(getattr(model, "coef_", None), dtype=np.float64)
+    if coef.ndim != 2 or coef.shape[0] != 1:
+        raise ValueError("`model` must be a fitted binary linear classifier")
+
+    return make_kernel(
+        coef[0],
+        float(np.ravel(model.intercept_)[0]),
+        feature_names,
+        threshold=threshold,
+        mean=mean,
+        scale=scale,
+        path=path,
+    )
+
+
+def kernel_from_artifact(artifact: dict, threshold="crosspoint") -> dict:
+    """
+    Build a kernel from registry.load_artifact output, without importing
+    sklearn.
+
+    Parameters:
+        artifact (dict): A stored linear model's artifact.
+        threshold (str or float): Name of one of the stored thresholds, or a
+            value.
+
+    Returns:
+        dict: The kernel.
+    """
+    if not isinstance(artifact, dict) or "coef" not in artifact.get("arrays", {}):
+        raise ValueError("`artifact` must be a registry artifact of a linear model")
+
+    if isinstance(threshold, str):
+        if threshold not in artifact["thresholds"]:
+            raise ValueError(
+                f"No threshold '{threshold}' stored; have {list(artifact['thresholds'])}"
+            )
+        threshold = artifact["thresholds"][threshold]
+
+    arrays = artifact["arrays"]
+    schema = artifact.get("schema_arrays", {})
+    return make_kernel(
+        arrays["coef"][0],
+        float(arrays["intercept"][0]),
+        artifact["feature_names"],
+        threshold=threshold,
+        mean=schema.get("mean"),
+        scale=schema.get("scale"),
+    )
+
+
+def make_kernel(
+    coef, intercept, feature_names, threshold=0.5, mean=None, scale=None, path=None
+) -> dict:
+    """
+    Build a kernel from raw weights. With mean/scale, the standardization
+    (x - mean) / scale is folded into the weights and intercept.
+
+    Parameters:
+        coef (array-like): One weight per feature.
+        intercept (float): Intercept (log-odds at zero).
+        feature_names (list[str]): Feature order of coef.
+        threshold (float): Decision threshold.
+        mean (array-like, optional): Column means.
+        scale (array-like, optional): Column scales.
+        path (Path or str, optional): Also save the kernel there (.npz).
+
+    Returns:
+        dict: The kernel.
+    """
+    coef = np.asarray(coef, dtype=np.float64).ravel()
+    feature_names = [str(name) for name in feature_names]
+    if len(feature_names) != len(coef):
+        raise ValueError(
+            f"Got {len(feature_names)} feature names for {len(coef)} coefficients"
+        )
+
+    if not 0 <= threshold <= 1:
+        raise ValueError(f"`threshold` must be between 0 and 1, got {threshold}")
+
+    intercept = float(intercept)
+    if scale is not None:
+        coef = coef / np.asarray(scale, dtype=np.float64)
+    if mean is not None:
+        intercept -= float(coef @ np.asarray(mean, dtype=np.float64))
+
+    kernel = {
+        "coef": coef.astype(np.float32),
+        "intercept": np.float32(intercept),
+        "feature_names": feature_names,
+        "threshold": float(threshold),
+    }
+    if path is not None:
+        save_kernel(kernel, path)
+    return kernel
+
+
+def save_kernel(kernel: dict, path):
+    """
+    Write a kernel to an .npz file.
+
+    Parameters:
+        kernel (dict): Output of export_kernel / make_kernel.
+        path (Path or str): Output file.
+    """
+    if not isinstance(path, (str, Path)):
+        raise ValueError("`path` must be a string or Path object.")
+
+    np.savez(
+        path,
+        coef=kernel["coef"],
+        intercept=np.float32(kernel["intercept"]),
+        feature_names=np.asarray(kernel["feature_names"], dtype=str),
+        threshold=np.float64(kernel["threshold"]),
+    )
+
+
+def load_kernel(path) -> dict:
+    """
+    Read a kernel written by save_kernel.
+
+    Parameters:
+        path (Path or str): Kernel file.
+
+    Returns:
+        dict: The kernel.
+    """
+    if not isinstance(path, (str, Path)):
+        raise ValueError("`path` must be a string or Path object.")
+
+    with np.load(path) as data:
+        return {
+            "coef": data["coef"].astype(np.float32),
+            "intercept": np.float32(data["intercept"]),
+            "feature_names": data["feature_names"].tolist(),
+            "threshold": float(data["threshold"]),
+        }
+
+
+def decision_function(kernel: dict, X) -> np.ndarray:
+    """
+    Log-odds of each row: X @ coef + intercept, in float32.
+
+    Parameters:
+        kernel (dict): The kernel.
+        X (array-like or pd.DataFrame): Encoded rows, columns in the kernel's
+            feature order (DataFrames are reordered by name).
+
+    Returns:
+        np.ndarray: float32 log-odds, one per row.
+    """
+    X = _as_float32(kernel, X)
+    return X @ kernel["coef"] + kernel["intercept"]
+
+
+def predict_proba(kernel: dict, X) -> np.ndarray:
+    """
+    Probability of the positive class for each row.
+
+    Returns:
+        np.ndarray: float32 probabilities, one per row.
+    """
+    return sigmoid(decision_function(kernel, X))
+
+
+def predict(kernel: dict, X, threshold=None) -> np.ndarray:
+    """
+    0/1 predictions at the kernel's threshold (or the one given).
+
+    Returns:
+        np.ndarray: int8 labels, one per row.
+    """
+    threshold = kernel["threshold"] if threshold is None else threshold
+    return (predict_proba(kernel, X) >= threshold).astype(np.int8)
+
+
+def sigmoid(z) -> np.ndarray:
+    """
+    Numerically stable logistic function: exp is only ever taken of -|z|,
+    so large margins of either sign neither overflow nor lose precision.
+    """
+    z = np.asarray(z)
+    e = np.exp(-np.abs(z))
+    return np.where(z >= 0, 1 / (1 + e), e / (1 + e)).astype(z.dtype, copy=False)
+
+
+def _as_float32(kernel, X):
+    if hasattr(X, "columns"):
+        X = X[kernel["feature_names"]].to_numpy(dtype=np.float32)
+    else:
+        X = np.asarray(X, dtype=np.float32)
+
+    if X.ndim == 1:
+        X = X[np.newaxis, :]
+
+    if X.ndim != 2 or X.shape[1] != len(kernel["coef"]):
+        raise ValueError(
+            f"`X` must have {len(kernel['coef'])} columns, got shape {X.shape}"
+        )
+    return X
@@ -0,0 +1,210 @@
+# brfss_diabetes/instrumentation.py
+
+import functools
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+
+# Global registry of finished stages. Instrumentation is off by default and
+# the decorated functions then cost a single flag check per call.
+_ENABLED = False
+_TRACE_MEMORY = False
+_STARTED_TRACEMALLOC = False
+_RECORDS = []
+_STACK = []
+
+
+def enable(trace_memory=True):
+    """
+    Turn stage recording on.
+
+    Parameters:
+        trace_memory (bool): Also record peak traced memory per stage. Starts
+            tracemalloc if it is not already running (this slows Python
+            allocations noticeably, so turn it off for pure timing runs).
+    """
+    global _ENABLED, _TRACE_MEMORY, _STARTED_TRACEMALLOC
+    _ENABLED = True
+    _TRACE_MEMORY = bool(trace_memory)
+    if _TRACE_MEMORY and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _STARTED_TRACEMALLOC = True
+
+
+def disable():
+    """
+    Turn stage recording off. Recorded stages are kept until reset().
+    """
+    global _ENABLED, _TRACE_MEMORY, _STARTED_TRACEMALLOC
+    _ENABLED = False
+    _TRACE_MEMORY = False
+    if _STARTED_TRACEMALLOC:
+        tracemalloc.stop()
+        _STARTED_TRACEMALLOC = False
+
+
+def is_enabled():
+    return _ENABLED
+
+
+def reset():
+    """
+    Forget all recorded stages.
+    """
+    _RECORDS.clear()
+    _STACK.clear()
+
+
+def get_records():
+    """
+    Returns:
+        list[dict]: One dict per finished stage, in completion order, with name,
+        path (';'-joined parent stages), wall_s, cpu_s, rows_in, rows_out and
+        peak_bytes.
+    """
+    return [dict(record) for record in _RECORDS]
+
+
+@contextmanager
+def stage(name, rows_in=None):
+    """
+    Time a block of code as a named stage. The yielded dict can be updated,
+    e.g. record["rows_out"] = len(df). Does nothing when instrumentation is off.
+
+    Parameters:
+        name (str): Stage name.
+        rows_in (int, optional): Number of input rows.
+    """
+    if not _ENABLED:
+        yield {}
+        return
+
+    path = ";".join([entry["name"] for entry in _STACK] + [name])
+    record = {"name": name, "path": path, "rows_in": rows_in, "rows_out": None}
+    entry = {"name": name, "peak": 0}
+
+    if _TRACE_MEMORY:
+        current, peak = tracemalloc.get_traced_memory()
+        if _STACK:
+            _STACK[-1]["peak"] = max(_STACK[-1]["peak"], peak)
+        tracemalloc.reset_peak()
+        entry["start_mem"] = current
+        entry["peak"] = current
+
+    _STACK.append(entry)
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+
+    try:
+        yield record
+    finally:
+        record["wall_s"] = time.perf_counter() - wall_start
+        record["cpu_s"] = time.process_time() - cpu_start
+        _STACK.pop()
+
+        if _TRACE_MEMORY:
+            _, peak = tracemalloc.get_traced_memory()
+            peak = max(entry["peak"], peak)
+            record["peak_bytes"] = peak - entry["start_mem"]
+            if _STACK:
+                _STACK[-1]["peak"] = max(_STACK[-1]["peak"], peak)
+        else:
+            record["peak_bytes"] = None
+
+        _RECORDS.append(record)
+
+
+def instrument(name=None):
+    """
+    Decorator recording each call of a function as a stage. Rows in/out are
+    taken from the first argument and the return value (or its first item)
+    when they are DataFrames or arrays.
+
+    Parameters:
+        name (str, optional): Stage name, defaults to the function name.
+    """
+
+    def decorator(func):
+        stage_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _ENABLED:
+                return func(*args, **kwargs)
+
+            rows_in = _count_rows(args[0]) if args else None
+            with stage(stage_name, rows_in=rows_in) as record:
+                result = func(*args, **kwargs)
+                out = result[0] if isinstance(result, tuple) and result else result
+                record["rows_out"] = _count_rows(out)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def dump_json(path):
+    """
+    Write the recorded stages to a JSON trace file.
+
+    Parameters:
+        path (Path or str): Output file.
+    """
+    if not isinstance(path, (str, Path)):
+        raise ValueError("`path` must be a string or Path object.")
+
+    with open(path, "w") as f:
+        json.dump(get_records(), f, indent=2)
+
+
+def summary(folded=False):
+    """
+    Aggregate the recorded stages by call path.
+
+    Parameters:
+        folded (bool): Return flamegraph.pl/speedscope "folded stacks" lines
+            (path plus self time in microseconds) instead of a table.
+
+    Returns:
+        str: The summary text.
+    """
+    totals = {}
+    for record in _RECORDS:
+        agg = totals.setdefault(
+            record["path"], {"calls": 0, "wall_s": 0.0, "cpu_s": 0.0, "peak": 0}
+        )
+        agg["calls"] += 1
+        agg["wall_s"] += record["wall_s"]
+        agg["cpu_s"] += record["cpu_s"]
+        agg["peak"] = max(agg["peak"], record["peak_bytes"] or 0)
+
+    if folded:
+        # Self time: a stage's total minus the totals of its direct children
+        self_time = {path: agg["wall_s"] for path, agg in totals.items()}
+        for path, agg in totals.items():
+            parent = path.rpartition(";")[0]
+            if parent in self_time:
+                self_time[parent] -= agg["wall_s"]
+        return "\n".join(
+            f"{path} {max(int(t * 1e6), 0)}" for path, t in sorted(self_time.items())
+        )
+
+    lines = [f"{'stage':<60} {'calls':>6} {'wall s':>10} {'cpu s':>10} {'peak MB':>9}"]
+    for path, agg in sorted(totals.items()):
+        depth = path.count(";")
+        label = "  " * depth + path.rpartition(";")[2]
+        lines.append(
+            f"{label:<60} {agg['calls']:>6} {agg['wall_s']:>10.4f} "
+            f"{agg['cpu_s']:>10.4f} {agg['peak'] / 1e6:>9.2f}"
+        )
+    return "\n".join(lines)
+
+
+def _count_rows(obj):
+    shape = getattr(obj, "shape", None)
+    if shape:
+        return int(shape[0])
+    return None
@@ -1,19 +1,24 @@
 # brfss_diabetes/io.py
 
+import numpy as np
 import pandas as pd
 import sys
 from pathlib import Path
 
+from .config import SEED
+from .instrumentation import instrument
 from .preprocessing import move_column_to_end
 
 
-def get_csv(year, data_dir=Path("../data/cleaned")):
+@instrument()
+def get_csv(year, data_dir=Path("../data/cleaned"), usecols=None):
     """
     Take a year and put the data from a csv for that year and put it into a DataFrame.
 
     Parameters:
         year: int representation of the year
         data_dir: directory relative to the calling notebook or script.
+        usecols: optional list of columns to read
 
     Returns:
         pd.DataFrame with the csv data loaded.
@@ -24,25 +29,92 @@ def get_csv(year, data_dir=Path("../data/cleaned")):
     if not isinstance(data_dir, Path):
         raise ValueError(f"`data_dir` must be a pathlib.Path, got {type(data_dir)}")
 
-    filename = f"brfss_cleaned_{year}.csv"
+    source = _csv_source(year, data_dir)
 
     if "google.colab" in sys.modules:
-        url = f"https://raw.githubusercontent.com/shaolinpat/brfss_diabetes_modeling/main/data/cleaned/{filename}"
-        print(f"[Colab] Loading from GitHub: {url}")
-        return pd.read_csv(url, low_memory=False)
+        print(f"[Colab] Loading from GitHub: {source}")
     else:
-        path = Path(data_dir / filename)
-        print(f"[Local] Loading from: {path}")
-        return pd.read_csv(path, low_memory=False)
+        print(f"[Local] Loading from: {source}")
+    return pd.read_csv(source, usecols=usecols, low_memory=False)
+
+
+def iter_csv_chunks(
+    year, data_dir=Path("../data/cleaned"), chunksize=100_000, usecols=None
+):
+    """
+    Stream the cleaned csv for a year in chunks instead of loading it whole.
+
+    Parameters:
+        year: int representation of the year
+        data_dir: directory relative to the calling notebook or script.
+        chunksize: number of rows per chunk
+        usecols: optional list of columns to read
+
+    Returns:
+        Iterator of pd.DataFrame chunks.
+    """
+    if not isinstance(year, int):
+        raise ValueError(f"`year` must be an int, got {type(year)}")
+
+    if not isinstance(data_dir, Path):
+        raise ValueError(f"`data_dir` must be a pathlib.Path, got {type(data_dir)}")
+
+    if not isinstance(chunksize, int) or chunksize <= 0:
+        raise ValueError(f"`chunksize` must be a positive int, got {chunksize}")
+
+    return pd.read_csv(
+        _csv_source(year, data_dir),
+        chunksize=chunksize,
+        usecols=usecols,
+        low_memory=False,
+    )
+
+
+def _csv_source(year, data_dir):
+    filename = f"brfss_cleaned_{year}.csv"
+
+    if "google.colab" in sys.modules:
+        return f"https://raw.githubusercontent.com/shaolinpat/brfss_diabetes_modeling/main/data/cleaned/{filename}"
+    return Path(data_dir / filename)
 
 
-def load_all_years(years, data_dir=Path("../data/cleaned")):
+@instrument()
+def load_all_years(
+    years,
+    data_dir=Path("../data/cleaned"),
+    drift_profile=None,
+    features=None,
+    catalog=None,
+    sample_size=None,
+    seed=SEED,
+    chunksize=100_000,
+):
     """
     Load and merge cleaned BRFSS CSV files for multiple years.
 
     Parameters:
         years (list of int): List of years to load.
         data_dir (Path): Directory containing cleaned CSVs.
+        drift_profile (dict or Path, optional): Reference profile from
+            drift.build_profile (or its saved JSON). Each loaded year is then
+            compared with it and the per-feature drift is stored in
+            df.attrs["drift"] as {year: [row, ...]}.
+        features (list[str], optional): Cleaned columns to load. Only the
+            years whose files have all of them are loaded, and only those
+            columns plus 'year' and 'diabetes' are read.
+        catalog (dict or Path, optional): Catalog from catalog.build_catalog
+            (or its saved JSON) used with `features`; a year then also needs
+            a non-null value in each feature. Without one, only the header
+            line of each file is read and nothing is written.
+        sample_size (int, optional): Return a stratified sample of about this
+            many rows instead of every row. Files are streamed in chunks and
+            only a reservoir per year x diabetes stratum is kept; strata get
+            proportional shares. The per-stratum population, sample size and
+            sampling fraction are stored in df.attrs["sampling"] as a list of
+            records, for reweighting.
+        seed (int): Seed of the sample; the same seed gives the same rows
+            whatever the chunksize.
+        chunksize (int): Rows per chunk when sampling.
 
     Returns:
         pd.DataFrame: Combined DataFrame with 'diabetes' column at end.
@@ -53,17 +125,170 @@ def load_all_years(years, data_dir=Path("../data/cleaned")):
     if not isinstance(data_dir, Path):
         raise ValueError(f"`data_dir` must be a pathlib.Path, got {type(data_dir)}")
 
+    if drift_profile is not None:
+        # Imported here: drift builds on eda, which reads files through this module
+        from .drift import compare_profiles, load_profile
+        from .eda import summarize_frame
+
+        if isinstance(drift_profile, (str, Path)):
+            drift_profile = load_profile(drift_profile)
+        elif not isinstance(drift_profile, dict):
+            raise ValueError(
+                f"`drift_profile` must be a dict or Path, got {type(drift_profile)}"
+            )
+
+    if sample_size is not None and (
+        not isinstance(sample_size, int) or sample_size <= 0
+    ):
+        raise ValueError(f"`sample_size` must be a positive int, got {sample_size}")
+
+    usecols = {}
+    if features is not None:
+        years, usecols = _select_by_features(years, data_dir, features, catalog)
+
+    if sample_size is not None:
+        samples, sampling = _stratified_sample(
+            years, data_dir, usecols, sample_size, seed, chunksize
+        )
+
     dfs = []
+    drift = {}
     for year in years:
-        df = get_csv(year, data_dir=data_dir)
+        if sample_size is not None:
+            df = samples[year]
+        else:
+            df = get_csv(year, data_dir=data_dir, usecols=usecols.get(year))
 
         if "diabetes" not in df.columns:
             raise ValueError(f"'diabetes' column missing in {year}")
 
+        if drift_profile is not None:
+            report = compare_profiles(drift_profile, summarize_frame(df))
+            drift[year] = report.to_dict("records")
+            major = report.loc[report["status"] == "major", "feature"].tolist()
+            if major:
+                print(f"[Drift] {year}: major drift in {major}")
+
         dfs.append(df)
 
     df_all = pd.concat(dfs, ignore_index=True)
-    return move_column_to_end(df_all, "diabetes")
+    df_all = move_column_to_end(df_all, "diabetes")
+    if drift_profile is not None:
+        df_all.attrs["drift"] = drift
+    if sample_size is not None:
+        df_all.attrs["sampling"] = sampling
+    return df_all
+
+
+def _stratified_sample(years, data_dir, usecols, sample_size, seed, chunksize):
+    # Every row gets a uniform key and each year x diabetes stratum keeps its
+    # sample_size smallest keys (a bottom-k reservoir), so memory is bounded
+    # by strata x sample_size whatever the file sizes. Once all populations
+    # are known, each stratum keeps its proportional share of smallest keys,
+    # which is a simple random sample of that stratum.
+    reservoirs = {}
+    populations = {}
+    samples = {}
+    for year in years:
+        # Keys are drawn in file order from a per-year stream, so they do not
+        # depend on the chunksize or on which other years are loaded
+        rng = np.random.default_rng([seed, year])
+        for chunk in iter_csv_chunks(
+            year, data_dir=data_dir, chunksize=chunksize, usecols=usecols.get(year)
+        ):
+            if "diabetes" not in chunk.columns:
+                raise ValueError(f"'diabetes' column missing in {year}")
+
+            samples.setdefault(year, [chunk.iloc[:0]])
+            keys = rng.random(len(chunk))
+            groups = chunk.groupby("diabetes", dropna=False, sort=False).indices
+            for status, rows in groups.items():
+                stratum = (year, status)
+                populations[stratum] = populations.get(stratum, 0) + len(rows)
+                kept_keys, kept = reservoirs.get(stratum, (keys[:0], chunk.iloc[:0]))
+                kept_keys = np.concatenate([kept_keys, keys[rows]])
+                kept = pd.concat([kept, chunk.iloc[rows]])
+                if len(kept_keys) > sample_size:
+                    smallest = np.argpartition(kept_keys, sample_size)[:sample_size]
+                    kept_keys, kept = kept_keys[smallest], kept.iloc[smallest]
+                reservoirs[stratum] = (kept_keys, kept)
+
+    allocation = _proportional_allocation(populations, sample_size)
+    sampling = []
+    for stratum, (kept_keys, kept) in reservoirs.items():
+        n = allocation[stratum]
+        chosen = kept.iloc[np.argsort(kept_keys, kind="stable")[:n]]
+        samples[stratum[0]].append(chosen)
+        sampling.append(
+            {
+                "year": stratum[0],
+                "diabetes": stratum[1],
+                "population": populations[stratum],
+                "sampled": n,
+                "fraction": n / populations[stratum],
+            }
+        )
+
+    # Rows come back in file order within each year
+    samples = {year: pd.concat(frames).sort_index() for year, frames in samples.items()}
+    sampling.sort(key=lambda record: (record["year"], str(record["diabetes"])))
+    return samples, sampling
+
+
+def _proportional_allocation(populations, sample_size):
+    # Largest-remainder rounding, so the shares add up to the sample size
+    total = sum(populations.values())
+    if total == 0:
+        return {stratum: 0 for stratum in populations}
+    target = min(sample_size, total)
+    quotas = {stratum: target * n / total for stratum, n in populations.items()}
+    allocation = {stratum: int(quota) for stratum, quota in quotas.items()}
+    remainders = sorted(
+        quotas, key=lambda stratum: allocation[stratum] - quotas[stratum]
+    )
+    for stratum in remainders[: target - sum(allocation.values())]:
+        allocation[stratum] += 1
+    return allocation
+
+
+def _select_by_features(years, data_dir, features, catalog):
+    if not isinstance(features, list) or not all(isinstance(f, str) for f in features):
+        raise ValueError("`features` must be a list of strings")
+
+    if catalog is None:
+        # Header lines only, so read-only and remote (Colab) sources work too
+        columns = {
+            year: list(pd.read_csv(_csv_source(year, data_dir), nrows=0).columns)
+            for year in years
+        }
+        selected = [year for year in years if set(features) <= set(columns[year])]
+    else:
+        # Imported here: the catalog hashes files through eda, which uses this module
+        from .catalog import load_catalog, years_with_features
+
+        if isinstance(catalog, (str, Path)):
+            catalog = load_catalog(catalog)
+        elif not isinstance(catalog, dict):
+            raise ValueError(f"`catalog` must be a dict or Path, got {type(catalog)}")
+
+        # In the caller's order, as without a catalog
+        matching = set(years_with_features(catalog, features, years))
+        selected = [year for year in years if year in matching]
+        columns = {
+            year: list(catalog["files"][str(year)]["columns"]) for year in selected
+        }
+
+    skipped = [year for year in years if year not in selected]
+    if skipped:
+        print(f"[Catalog] Skipping years without all of {features}: {skipped}")
+    if not selected:
+        raise ValueError(f"No year in {years} has all of {features}")
+
+    wanted = set(features) | {"year", "diabetes"}
+    usecols = {
+        year: [col for col in columns[year] if col in wanted] for year in selected
+    }
+    return selected, usecols
 
 
 def finalize_columns(df, keep_cols: list[str]) -> pd.DataFrame:
@@ -0,0 +1,398 @@
+# brfss_diabetes/polars_backend.py
+
+# Lazy polars versions of clean_brfss, load_all_years and prepare_common_features.
+# Each function only builds a query plan; nothing is read until the result is
+# collected (to_pandas / to_numpy), so polars can fuse the recodes, push the
+# column selection down into the csv scan and run the work multi-threaded.
+
+from pathlib import Path
+
+import numpy as np
+
+try:
+    import polars as pl
+except ImportError as err:  # pragma: no cover - depends on the environment
+    raise ImportError(
+        "The polars backend needs polars: pip install 'brfss_diabetes[polars]'"
+    ) from err
+
+from .config import (
+    AGE_CATEGORY_MIDPOINTS,
+    CLEANED_COLUMN_NAMES,
+    CLEANED_COLUMN_ORDER,
+    SURVEY_DESIGN_VARS,
+)
+from .instrumentation import instrument
+from .io import _csv_source
+from .preprocessing import BINARY_FEATURES, CATEGORICAL_FEATURES
+
+# Column types of the cleaned csvs; everything else is read as text
+_CLEANED_SCHEMA = {
+    "year": pl.Int64,
+    "age": pl.Float64,
+    "bmi": pl.Float64,
+    "veg_servings": pl.Float64,
+    "survey_weight": pl.Float64,
+    "strata": pl.Float64,
+    "psu": pl.Float64,
+}
+
+
+def scan_subset_csv(path) -> pl.LazyFrame:
+    """
+    Lazily scan a brfss_subset_{year}.csv written by load_data.py, with every
+    raw code read as a float (as pd.read_sas returns them).
+
+    Parameters:
+        path (Path or str): The subset csv.
+
+    Returns:
+        pl.LazyFrame: Raw-coded frame ready for clean_brfss.
+    """
+    if not isinstance(path, (str, Path)):
+        raise ValueError("`path` must be a string or Path object.")
+
+    lf = pl.scan_csv(path, infer_schema=False)
+    return lf.with_columns(pl.all().cast(pl.Float64, strict=False))
+
+
+def clean_brfss(lf: pl.LazyFrame, year: int) -> pl.LazyFrame:
+    """
+    Lazy counterpart of cleaning.clean_brfss: the common fields, the fields of
+    the given year and the survey design variables are recoded in one
+    with_columns pass each and a 'year' column is added.
+
+    Parameters:
+        lf (pl.LazyFrame): Raw-coded frame, e.g. from scan_subset_csv.
+        year (int): Survey year of the frame.
+
+    Returns:
+        pl.LazyFrame: Same columns and values as the pandas clean_brfss, with
+        text columns as strings instead of pandas categories.
+    """
+    if not isinstance(lf, pl.LazyFrame):
+        raise ValueError(f"`lf` must be a polars LazyFrame, got {type(lf)}")
+
+    if not isinstance(year, int):
+        raise ValueError(f"`year` must be an int, got {type(year)}")
+
+    columns = set(lf.collect_schema().names())
+
+    bmi = _missing("_BMI5", [9])
+    bmi = pl.when(bmi >= 9000).then(None).otherwise(bmi)
+    lf = lf.with_columns(
+        _binary(_missing("DIABETE4", [7, 8, 9]), [1, 2], [3, 4]).alias("DIABETE4"),
+        _missing("_AGEG5YR", [14]).alias("_AGEG5YR"),
+        _map(_missing("_AGEG5YR", [14]), AGE_CATEGORY_MIDPOINTS, pl.Float64).alias(
+            "AGE"
+        ),
+        _map(pl.col("SEXVAR"), {1: "Male", 2: "Female"}).alias("SEX"),
+        _map(_missing("EDUCA", [9]), _EDUCA_LABELS).alias("EDUCA"),
+        bmi.alias("_BMI5"),
+        _decimal(bmi).alias("BMI"),
+        _map(pl.col("_BMI5CAT"), _BMI_LABELS).alias("BMICAT"),
+        _binary(_missing("SMOKE100", [7, 9])).alias("SMOKE100"),
+        _binary(_missing("EXERANY2", [7, 9])).alias("EXERANY2"),
+    )
+
+    drink_col = "DRNKANY5" if year in [2019, 2020, 2021] else "DRNKANY6"
+    drink = _binary(_missing(drink_col, [7, 9]))
+    year_specific = [drink.alias(drink_col), drink.alias("drink_any")]
+
+    if year in [2019, 2021]:
+        fruit = _missing("_FRTLT1A", [9])
+        veg = pl.col("_VEGESU1")
+        veg = pl.when(veg >= 9000).then(None).otherwise(veg)
+        year_specific += [
+            fruit.alias("_FRTLT1A"),
+            _map(fruit, {1: ">= 1x per day", 2: "< 1x per day"}).alias("fruit_low"),
+            veg.alias("_VEGESU1"),
+            _decimal(veg).alias("veg_servings"),
+        ]
+
+    if year in [2019, 2022, 2023]:
+        snap = _binary(_missing("FOODSTMP", [7, 9]))
+        year_specific += [snap.alias("FOODSTMP"), snap.alias("snap_used")]
+
+    if year in [2022, 2023]:
+        food = _missing("SDHFOOD1", [7, 9])
+        year_specific += [
+            food.alias("SDHFOOD1"),
+            _map(food, _FOOD_LABELS).alias("food_insecurity"),
+        ]
+
+    design = [
+        pl.col(col).cast(pl.Float64, strict=False)
+        for col in SURVEY_DESIGN_VARS
+        if col in columns
+    ]
+    lf = lf.with_columns(year_specific + design)
+
+    if "_LLCPWT" in columns:
+        weight = pl.col("_LLCPWT")
+        lf = lf.with_columns(
+            pl.when(weight <= 0).then(None).otherwise(weight).alias("_LLCPWT")
+        )
+
+    return lf.with_columns(pl.lit(year, dtype=pl.Int64).alias("year"))
+
+
+def to_cleaned_layout(lf: pl.LazyFrame) -> pl.LazyFrame:
+    """
+    Lazy counterpart of cleaning.to_cleaned_layout.
+
+    Parameters:
+        lf (pl.LazyFrame): Output of clean_brfss.
+
+    Returns:
+        pl.LazyFrame: Frame in the brfss_cleaned_{year}.csv layout.
+    """
+    if not isinstance(lf, pl.LazyFrame):
+        raise ValueError(f"`lf` must be a polars LazyFrame, got {type(lf)}")
+
+    columns = set(lf.collect_schema().names())
+    keep = [col for col in CLEANED_COLUMN_ORDER if col in columns]
+    lf = (
+        lf.select(keep)
+        .filter(pl.col("DIABETE4").is_not_null())
+        .rename({col: CLEANED_COLUMN_NAMES.get(col, col) for col in keep})
+    )
+    return _move_column_to_end(lf, "diabetes")
+
+
+def load_all_years(years, data_dir=Path("../data/cleaned")) -> pl.LazyFrame:
+    """
+    Lazy counterpart of io.load_all_years: scans the cleaned csv of each year
+    and stacks them, filling columns a year does not have with nulls.
+
+    Parameters:
+        years (list of int): List of years to load.
+        data_dir (Path): Directory containing cleaned CSVs.
+
+    Returns:
+        pl.LazyFrame: Combined frame with 'diabetes' column at end.
+    """
+    if not isinstance(years, list) or not all(isinstance(y, int) for y in years):
+        raise ValueError("`years` must be a list of integers")
+
+    if not isinstance(data_dir, Path):
+        raise ValueError(f"`data_dir` must be a pathlib.Path, got {type(data_dir)}")
+
+    frames = []
+    for year in years:
+        lf = pl.scan_csv(
+            _csv_source(year, data_dir),
+            schema_overrides=_CLEANED_SCHEMA,
+            infer_schema=False,
+        )
+
+        if "diabetes" not in lf.collect_schema().names():
+            raise ValueError(f"'diabetes' column missing in {year}")
+
+        frames.append(lf)
+
+    lf_all = pl.concat(frames, how="diagonal_relaxed")
+    return _move_column_to_end(lf_all, "diabetes")
+
+
+def prepare_common_features(
+    lf: pl.LazyFrame, common_features: list[str], weight_col=None, levels=None
+) -> pl.LazyFrame:
+    """
+    Lazy counterpart of preprocessing.prepare_common_features, producing the
+    same columns in the same order: plain and binary columns first, then the
+    dummies with the first level of each categorical dropped.
+
+    Parameters:
+        lf (pl.LazyFrame): Combined frame, e.g. from load_all_years.
+        common_features (list[str]): List of feature names common across all years.
+        weight_col (str, optional): Survey weight column to carry through unencoded,
+            e.g. "survey_weight". Rows with a missing weight are dropped.
+        levels (dict, optional): Levels per categorical column, e.g.
+            config.FEATURE_LEVELS, for a fixed dummy layout. By default the
+            observed levels are used, as pd.get_dummies does, which costs one
+            extra scan of the categorical columns.
+
+    Returns:
+        pl.LazyFrame: Encoded frame with 'diabetes' as 0/1.
+    """
+    if not isinstance(lf, pl.LazyFrame):
+        raise ValueError(f"`lf` must be a polars LazyFrame, got {type(lf)}")
+
+    if not isinstance(common_features, list) or not all(
+        isinstance(f, str) for f in common_features
+    ):
+        raise ValueError("`common_features` must be a list of strings")
+
+    columns = lf.collect_schema().names()
+    if "diabetes" not in columns:
+        raise ValueError("Missing required target column: 'diabetes'")
+
+    missing_columns = [col for col in common_features if col not in columns]
+    if missing_columns:
+        raise ValueError(
+            f"The following common_features are missing from the DataFrame: {missing_columns}"
+        )
+
+    if weight_col is not None:
+        if not isinstance(weight_col, str):
+            raise ValueError(f"`weight_col` must be a string, got {type(weight_col)}")
+        if weight_col not in columns:
+            raise ValueError(f"Missing survey weight column: '{weight_col}'")
+
+    if levels is not None and not isinstance(levels, dict):
+        raise ValueError(f"`levels` must be a dict, got {type(levels)}")
+
+    keep = common_features + ([weight_col] if weight_col else []) + ["diabetes"]
+    lf = lf.select(keep).drop_nulls(keep)
+
+    encoded = []
+    for col in keep:
+        if col == weight_col:
+            encoded.append(pl.col(col).cast(pl.Float64))
+        elif col in BINARY_FEATURES:
+            text = (
+                pl.col(col).cast(pl.String).str.strip_chars().str.replace_all('"', "")
+            )
+            encoded.append(
+                text.replace_strict(
+                    {"Yes": 1, "No": 0}, default=None, return_dtype=pl.Int64
+                ).alias(col)
+            )
+        elif col not in CATEGORICAL_FEATURES:
+            encoded.append(pl.col(col))
+
+    cat_cols = [col for col in CATEGORICAL_FEATURES if col in keep]
+    if levels is None or any(col not in levels for col in cat_cols):
+        observed = _observed_levels(lf, cat_cols)
+        levels = {**observed, **(levels or {})}
+
+    for col in cat_cols:
+        for level in levels[col][1:]:
+            encoded.append(
+                (pl.col(col).cast(pl.String) == str(level)).alias(f"{col}_{level}")
+            )
+
+    return lf.select(encoded)
+
+
+@instrument()
+def to_pandas(frame):
+    """
+    Collect a lazy query (or take an eager frame) as a pandas DataFrame.
+
+    Parameters:
+        frame (pl.LazyFrame or pl.DataFrame): Query to run.
+
+    Returns:
+        pd.DataFrame: The collected result.
+    """
+    return _collect(frame).to_pandas()
+
+
+@instrument()
+def to_numpy(frame, weight_col=None):
+    """
+    Collect the output of prepare_common_features straight into the arrays the
+    models take, without going through pandas.
+
+    Parameters:
+        frame (pl.LazyFrame or pl.DataFrame): Encoded frame.
+        weight_col (str, optional): Survey weight column to return alongside.
+
+    Returns:
+        tuple: (X, y, feature_names, w) with X as a float64 array, y as 0/1 ints
+        and w the row weights (all ones when weight_col is None).
+    """
+    df = _collect(frame)
+
+    if "diabetes" not in df.columns:
+        raise ValueError("Missing required target column: 'diabetes'")
+
+    if weight_col is not None and weight_col not in df.columns:
+        raise ValueError(f"Missing survey weight column: '{weight_col}'")
+
+    y = df["diabetes"].to_numpy().astype(np.int64)
+    if weight_col is None:
+        w = np.ones(len(y))
+    else:
+        w = df[weight_col].to_numpy().astype(np.float64)
+
+    features = df.drop([col for col in ["diabetes", weight_col] if col])
+    X = features.cast(pl.Float64).to_numpy()
+    return X, y, features.columns, w
+
+
+_EDUCA_LABELS = {
+    1: "Less than HS",
+    2: "Less than HS",
+    3: "Less than HS",
+    4: "HS or GED",
+    5: "Some college",
+    6: "College graduate",
+}
+
+_BMI_LABELS = {1: "Underweight", 2: "Normal", 3: "Overweight", 4: "Obese"}
+
+_FOOD_LABELS = {
+    1: "Always",
+    2: "Usually",
+    3: "Sometimes",
+    4: "Rarely",
+    5: "Never",
+}
+
+
+def _missing(column, missing_codes):
+    col = pl.col(column)
+    return (
+        pl.when(col.is_in([float(code) for code in missing_codes]))
+        .then(None)
+        .otherwise(col)
+    )
+
+
+def _map(expr, mapping, dtype=pl.String):
+    return expr.replace_strict(
+        [float(key) for key in mapping],
+        list(mapping.values()),
+        default=None,
+        return_dtype=dtype,
+    )
+
+
+def _binary(expr, yes_codes=[1], no_codes=[2]):
+    mapping = {code: "Yes" for code in yes_codes}
+    mapping.update({code: "No" for code in no_codes})
+    return _map(expr, mapping)
+
+
+def _decimal(expr):
+    value = expr / 100.0
+    return pl.when((value < 1e-5) | (value > 99)).then(None).otherwise(value)
+
+
+def _observed_levels(lf, cat_cols):
+    if not cat_cols:
+        return {}
+    uniques = lf.select(
+        pl.col(col).cast(pl.String).unique().implode() for col in cat_cols
+    ).collect()
+    return {col: sorted(uniques[col][0].to_list()) for col in cat_cols}
+
+
+def _move_column_to_end(lf, column):
+    columns = lf.collect_schema().names()
+    if column not in columns:
+        return lf
+    return lf.select([col for col in columns if col != column] + [column])
+
+
+def _collect(frame):
+    if isinstance(frame, pl.LazyFrame):
+        return frame.collect()
+    if isinstance(frame, pl.DataFrame):
+        return frame
+    raise ValueError(
+        f"`frame` must be a polars LazyFrame or DataFrame, got {type(frame)}"
+    )
@@ -1,7 +1,22 @@
 # brfss_diabetes/preprocessing.py
 
+import numpy as np
 import pandas as pd
+
 from brfss_diabetes.config import AGE_CATEGORY_MIDPOINTS
+from brfss_diabetes.instrumentation import instrument
+
+# Cleaned columns holding "Yes"/"No" strings, encoded as 1/0
+BINARY_FEATURES = [
+    "smoke_100",
+    "exercise_any",
+    "drink_any",
+    "snap_used",
+    "diabetes",
+]
+
+# Cleaned columns one-hot encoded with the first level dropped
+CATEGORICAL_FEATURES = ["sex", "educa", "bmi_cat", "fruit_low", "food_insecurity"]
 
 
 def recode_missing(df, column, missing_codes):
@@ -32,11 +47,7 @@ def recode_missing(df, column, missing_codes):
             f"`missing_codes` must be a list, set, or tuple, got {type(missing_codes)}"
         )
 
-    missing_codes = set(missing_codes)
-
-    df[column] = df[column].replace(missing_codes, pd.NA)
-
-    return df
+    return _recode_missing(df, column, missing_codes)
 
 
 def recode_binary(df, column, yes_codes=[1], no_codes=[2]):
@@ -79,22 +90,7 @@ def recode_binary(df, column, yes_codes=[1], no_codes=[2]):
             f"`yes_codes` and `no_codes` have overlapping values: {overlap}"
         )
 
-    yes_codes = set(yes_codes)
-    no_codes = set(no_codes)
-
-    def map_value(x):
-        if pd.isna(x):
-            return pd.NA
-        elif x in yes_codes:
-            return "Yes"
-        elif x in no_codes:
-            return "No"
-        else:
-            return pd.NA
-
-    df[column] = df[column].apply(map_value).astype("category")
-
-    return df
+    return _recode_binary(df, column, yes_codes, no_codes)
 
 
 def normalize_numeric(df, column, new_column):
@@ -128,9 +124,7 @@ def normalize_numeric(df, column, new_column):
     if not isinstance(new_column, str):
         raise ValueError(f"`new_column` must be a string, got {type(new_column)}")
 
-    df[new_column] = df[column].map(AGE_CATEGORY_MIDPOINTS).astype("Float64")
-
-    return df
+    return _normalize_numeric(df, column, new_column)
 
 
 def convert_implied_decimal(df, column="_BMI", new_column="BMI"):
@@ -160,20 +154,7 @@ def convert_implied_decimal(df, column="_BMI", new_column="BMI"):
     if not isinstance(new_column, str):
         raise ValueError(f"`new_column` must be a string, got {type(new_column)}")
 
-    # 1. Convert to numeric first, safely
-    df[column] = pd.to_numeric(df[column], errors="coerce")
-
-    # 2. Remove invalid values (e.g., CDC often codes 9999 as missing)
-    df.loc[df[column] >= 9000, column] = pd.NA
-
-    # 3. Scale to decimal
-    df[new_column] = df[column] / 100.0
-    df[new_column] = df[new_column].astype("Float64")
-
-    # 4. Kill off corrupted or impossible float values
-    df.loc[(df[new_column] < 1e-5) | (df[new_column] > 99), new_column] = pd.NA
-
-    return df
+    return _convert_implied_decimal(df, column, new_column)
 
 
 def recode_bmi_category(df, column="_BMI5CAT", new_column="BMI_CAT"):
@@ -209,11 +190,7 @@ def recode_bmi_category(df, column="_BMI5CAT", new_column="BMI_CAT"):
     if not isinstance(new_column, str):
         raise ValueError(f"`new_column` must be a string, got {type(new_column)}")
 
-    bmi_mapping = {1: "Underweight", 2: "Normal", 3: "Overweight", 4: "Obese"}
-
-    df[new_column] = df[column].map(bmi_mapping).astype("category")
-
-    return df
+    return _recode_bmi_category(df, column, new_column)
 
 
 def move_column_to_end(df, column):
@@ -240,20 +217,54 @@ def move_column_to_end(df, column):
     return df[cols]
 
 
-def prepare_common_features(
-    df: pd.DataFrame, common_features: list[str]
-) -> pd.DataFrame:
-    """
-    Filters the DataFrame to only include rows with non-null values for the given features
-    and the target, and applies encoding for binary and categorical features.
+# Unchecked variants of the recode helpers. The public functions validate
+# their arguments on every call; the cleaning pipeline validates the whole
+# frame once against brfss_diabetes.schema instead and calls these directly.
 
-    Parameters:
-        df (pd.DataFrame): Full merged BRFSS DataFrame.
-        common_features (list[str]): List of feature names common across all years.
 
-    Returns:
-        pd.DataFrame: Processed DataFrame with dummy variables and binary encoding.
-    """
+def _recode_missing(df, column, missing_codes):
+    df[column] = df[column].replace(set(missing_codes), pd.NA)
+    return df
+
+
+def _recode_binary(df, column, yes_codes=[1], no_codes=[2]):
+    values = df[column]
+    recoded = np.select(
+        [values.isin(yes_codes), values.isin(no_codes)], ["Yes", "No"], default=None
+    )
+    df[column] = pd.Series(recoded, index=df.index, dtype=object).astype("category")
+    return df
+
+
+def _normalize_numeric(df, column, new_column):
+    df[new_column] = df[column].map(AGE_CATEGORY_MIDPOINTS).astype("Float64")
+    return df
+
+
+def _convert_implied_decimal(df, column, new_column):
+    # 1. Convert to numeric first, safely
+    df[column] = pd.to_numeric(df[column], errors="coerce")
+
+    # 2. Remove invalid values (e.g., CDC often codes 9999 as missing)
+    df.loc[df[column] >= 9000, column] = pd.NA
+
+    # 3. Scale to decimal
+    df[new_column] = df[column] / 100.0
+    df[new_column] = df[new_column].astype("Float64")
+
+    # 4. Kill off corrupted or impossible float values
+    df.loc[(df[new_column] < 1e-5) | (df[new_column] > 99), new_column] = pd.NA
+
+    return df
+
+
+def _recode_bmi_category(df, column, new_column):
+    bmi_mapping = {1: "Underweight", 2: "Normal", 3: "Overweight", 4: "Obese"}
+    df[new_column] = df[column].map(bmi_mapping).astype("category")
+    return df
+
+
+def _validate_common_inputs(df, common_features):
     if not isinstance(df, pd.DataFrame):
         raise ValueError(f"`df` must be a pandas DataFrame, got {type(df)}")
 
@@ -271,15 +282,22 @@ def prepare_common_features(
             f"The following common_features are missing from the DataFrame: {missing_columns}"
         )
 
-    df_common = df.copy()
+
+def _select_and_encode_binary(df, common_features, weight_col=None):
+    """
+    Drop incomplete rows, keep the requested features plus the target and map
+    the Yes/No columns to 1/0. Shared by the dense and sparse encoders.
+    """
+    keep = common_features + ([weight_col] if weight_col else []) + ["diabetes"]
 
     # Drop rows with missing values in required features + target
-    df_common = df_common.dropna(subset=common_features + ["diabetes"])
-    df_common = df_common[common_features + ["diabetes"]].copy()
+    df_common = df.dropna(subset=keep)
+    df_common = df_common[keep].copy()
+    if weight_col:
+        df_common[weight_col] = df_common[weight_col].astype("float64")
 
     # Binary yes/no encoding
-    binary_cols = ["smoke_100", "exercise_any", "diabetes"]
-    for col in binary_cols:
+    for col in BINARY_FEATURES:
         if col in df_common.columns:
             df_common[col] = (
                 df_common[col]
@@ -291,8 +309,115 @@ def prepare_common_features(
             if df_common[col].isna().any():
                 print(f"Warning: Unexpected values found in column {col}")
 
+    return df_common
+
+
+@instrument()
+def prepare_common_features(
+    df: pd.DataFrame, common_features: list[str], weight_col=None
+) -> pd.DataFrame:
+    """
+    Filters the DataFrame to only include rows with non-null values for the given features
+    and the target, and applies encoding for binary and categorical features.
+    The Yes/No columns in BINARY_FEATURES (including the year-specific drink_any
+    and snap_used) become 0/1, and CATEGORICAL_FEATURES (including fruit_low
+    and food_insecurity) are one-hot encoded; earlier versions passed the
+    year-specific columns through as strings.
+
+    Parameters:
+        df (pd.DataFrame): Full merged BRFSS DataFrame.
+        common_features (list[str]): List of feature names common across all years.
+        weight_col (str, optional): Survey weight column to carry through unencoded,
+            e.g. "survey_weight". Rows with a missing weight are dropped.
+
+    Returns:
+        pd.DataFrame: Processed DataFrame with dummy variables and binary encoding.
+    """
+    _validate_common_inputs(df, common_features)
+
+    if weight_col is not None:
+        if not isinstance(weight_col, str):
+            raise ValueError(f"`weight_col` must be a string, got {type(weight_col)}")
+        if weight_col not in df.columns:
+            raise ValueError(f"Missing survey weight column: '{weight_col}'")
+
+    df_common = _select_and_encode_binary(df, common_features, weight_col)
+
     # One-hot encode categorical vars
-    cat_cols = [col for col in ["sex", "educa", "bmi_cat"] if col in df_common.columns]
+    cat_cols = [col for col in CATEGORICAL_FEATURES if col in df_common.columns]
     df_common = pd.get_dummies(df_common, columns=cat_cols, drop_first=True)
 
     return df_common
+
+
+@instrument()
+def prepare_common_features_sparse(
+    df: pd.DataFrame, common_features: list[str]
+) -> tuple:
+    """
+    Sparse counterpart of prepare_common_features. Rows are filtered and encoded
+    the same way, but the one-hot blocks are built straight from category codes
+    into a CSR matrix, so memory scales with the non-zeros instead of
+    rows x columns. The matrix can be passed directly to LogisticRegression
+    (liblinear/saga) and XGBClassifier.
+
+    Parameters:
+        df (pd.DataFrame): Full merged BRFSS DataFrame.
+        common_features (list[str]): List of feature names to encode.
+
+    Returns:
+        tuple: (X, y, feature_names) where X is a float64 scipy.sparse.csr_matrix,
+        y is an int array of 0/1 targets and feature_names matches the columns of
+        prepare_common_features(df, common_features) without 'diabetes'.
+    """
+    # scipy.sparse is only loaded when the sparse path is actually used
+    from scipy import sparse
+
+    _validate_common_inputs(df, common_features)
+
+    df_common = _select_and_encode_binary(df, common_features)
+    n_rows = len(df_common)
+    row_idx = np.arange(n_rows)
+
+    y = df_common.pop("diabetes").to_numpy()
+    cat_cols = [col for col in CATEGORICAL_FEATURES if col in df_common.columns]
+
+    blocks = []
+    feature_names = []
+
+    # Plain numeric/binary columns keep their position ahead of the dummies,
+    # matching the column order pd.get_dummies produces
+    for col in [c for c in df_common.columns if c not in cat_cols]:
+        values = df_common[col].to_numpy(dtype=np.float64, na_value=np.nan)
+        nz = np.flatnonzero(values)
+        blocks.append(
+            sparse.csr_matrix(
+                (values[nz], (nz, np.zeros(len(nz), dtype=np.int64))), shape=(n_rows, 1)
+            )
+        )
+        feature_names.append(col)
+
+    for col in cat_cols:
+        series = df_common[col]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            categories = list(series.cat.categories)
+        else:
+            categories = sorted(series.unique())
+
+        codes = pd.Categorical(series, categories=categories).codes
+        # drop_first=True: the first category becomes the all-zero baseline
+        keep = codes > 0
+        blocks.append(
+            sparse.csr_matrix(
+                (np.ones(keep.sum()), (row_idx[keep], codes[keep] - 1)),
+                shape=(n_rows, max(len(categories) - 1, 0)),
+            )
+        )
+        feature_names.extend(f"{col}_{cat}" for cat in categories[1:])
+
+    if blocks:
+        X = sparse.hstack(blocks, format="csr", dtype=np.float64)
+    else:
+        X = sparse.csr_matrix((n_rows, 0), dtype=np.float64)
+
+    return X, y.astype(np.int64), feature_names
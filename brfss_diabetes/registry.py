@@ -0,0 +1,388 @@
+# brfss_diabetes/registry.py
+
+import hashlib
+import importlib
+import json
+import platform
+import re
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .config import FEATURE_LEVELS
+from .eda import file_hash
+from .io import _csv_source
+
+# Layout: <registry_dir>/<tag>/v0001/{meta.json, model.ubj | model.npz, schema.npz}
+_TAG_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.-]*$")
+_META_FILE = "meta.json"
+
+
+def save_model(
+    model,
+    registry_dir,
+    tag,
+    feature_names,
+    train_years,
+    thresholds=None,
+    common_features=None,
+    schema=None,
+    data_hash=None,
+    metadata=None,
+):
+    """
+    Store a fitted model as a new version under a tag. XGBoost models are
+    written in XGBoost's native UBJSON format; linear sklearn models (anything
+    with coef_/intercept_, e.g. LogisticRegression or SGDClassifier) as a
+    NumPy archive of their coefficients plus their constructor parameters.
+
+    Parameters:
+        model: Fitted XGBClassifier or linear sklearn classifier.
+        registry_dir (Path): Root directory of the registry.
+        tag (str): Model name, e.g. "logistic_all_years".
+        feature_names (list[str]): Encoded column order the model expects.
+        train_years (list of int): Years the model was trained on.
+        thresholds (dict, optional): Named decision thresholds, e.g. from
+            standard_thresholds.
+        common_features (list[str], optional): Original features encoded.
+        schema (dict, optional): Extra encoding state, e.g. the schema of
+            train_incremental_logistic. Arrays go to schema.npz, the rest to
+            meta.json.
+        data_hash (str, optional): Hash of the training data, e.g. from
+            training_data_hash.
+        metadata (dict, optional): Any other JSON-serializable details.
+
+    Returns:
+        Path: The new version directory.
+    """
+    if not isinstance(registry_dir, Path):
+        raise ValueError(
+            f"`registry_dir` must be a pathlib.Path, got {type(registry_dir)}"
+        )
+
+    if not isinstance(tag, str) or not _TAG_PATTERN.match(tag):
+        raise ValueError(
+            f"`tag` must be a non-empty string of letters, digits, '_', '.' or '-', got {tag!r}"
+        )
+
+    if not isinstance(train_years, list) or not all(
+        isinstance(y, int) for y in train_years
+    ):
+        raise ValueError("`train_years` must be a list of integers")
+
+    feature_names = [str(name) for name in feature_names]
+    kind = _model_kind(model)
+    common_features = list(common_features or [])
+
+    tag_dir = registry_dir / tag
+    version = max(_versions(tag_dir), default=0) + 1
+    version_dir = tag_dir / f"v{version:04d}"
+    version_dir.mkdir(parents=True)
+
+    meta = {
+        "tag": tag,
+        "version": version,
+        "kind": kind,
+        "estimator": f"{type(model).__module__}.{type(model).__qualname__}",
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "train_years": sorted(train_years),
+        "data_hash": data_hash,
+        "feature_names": feature_names,
+        "common_features": common_features,
+        "levels": {
+            col: FEATURE_LEVELS[col] for col in common_features if col in FEATURE_LEVELS
+        },
+        "thresholds": {k: float(v) for k, v in (thresholds or {}).items()},
+        "schema": {},
+        "metadata": metadata or {},
+        "versions": {"python": platform.python_version(), "numpy": np.__version__},
+    }
+
+    if kind == "xgboost":
+        import xgboost
+
+        model.save_model(version_dir / "model.ubj")
+        meta["versions"]["xgboost"] = xgboost.__version__
+    else:
+        import sklearn
+
+        np.savez(
+            version_dir / "model.npz",
+            coef=np.asarray(model.coef_, dtype=np.float64),
+            intercept=np.asarray(model.intercept_, dtype=np.float64),
+            classes=np.asarray(model.classes_),
+        )
+        params, numeric_keys, dropped = _json_params(model.get_params())
+        meta["params"] = params
+        # e.g. class_weight={0: 1, 1: 5}, restored to number keys on load
+        meta["params_numeric_keys"] = numeric_keys
+        # Parameters that cannot be stored, so the record is not mistaken
+        # for the full configuration
+        meta["params_dropped"] = dropped
+        meta["has_feature_names_in"] = hasattr(model, "feature_names_in_")
+        meta["versions"]["sklearn"] = sklearn.__version__
+
+    arrays = {}
+    for key, value in (schema or {}).items():
+        if isinstance(value, np.ndarray):
+            arrays[key] = value
+        else:
+            meta["schema"][key] = value
+    if arrays:
+        np.savez(version_dir / "schema.npz", **arrays)
+
+    with open(version_dir / _META_FILE, "w") as f:
+        json.dump(meta, f, indent=2, default=_json_default)
+
+    return version_dir
+
+
+def list_models(registry_dir, tag=None, years=None) -> pd.DataFrame:
+    """
+    List the stored model versions, optionally filtered by tag and by the
+    range their training years fall in.
+
+    Parameters:
+        registry_dir (Path): Root directory of the registry.
+        tag (str, optional): Only versions of this tag.
+        years (tuple, optional): (first, last) year; only models trained
+            entirely within that range.
+
+    Returns:
+        pd.DataFrame: tag, version, kind, train_years, created, data_hash and
+        path, oldest first.
+    """
+    if not isinstance(registry_dir, Path):
+        raise ValueError(
+            f"`registry_dir` must be a pathlib.Path, got {type(registry_dir)}"
+        )
+
+    if years is not None and (
+        not isinstance(years, tuple)
+        or len(years) != 2
+        or not all(isinstance(y, int) for y in years)
+    ):
+        raise ValueError(f"`years` must be a (first, last) tuple of ints, got {years}")
+
+    columns = ["tag", "version", "kind", "train_years", "created", "data_hash", "path"]
+    rows = []
+    tag_dirs = [registry_dir / tag] if tag else sorted(registry_dir.glob("*"))
+    for tag_dir in tag_dirs:
+        for version in sorted(_versions(tag_dir)):
+            version_dir = tag_dir / f"v{version:04d}"
+            with open(version_dir / _META_FILE) as f:
+                meta = json.load(f)
+            if years is not None and not all(
+                years[0] <= y <= years[1] for y in meta["train_years"]
+            ):
+                continue
+            rows.append(
+                [meta["tag"], meta["version"], meta["kind"], meta["train_years"]]
+                + [meta["created"], meta["data_hash"], version_dir]
+            )
+
+    table = pd.DataFrame(rows, columns=columns)
+    return table.sort_values(["created", "tag", "version"], kind="stable").reset_index(
+        drop=True
+    )
+
+
+def load_artifact(registry_dir, tag=None, version=None, years=None) -> dict:
+    """
+    Read a stored version's metadata and arrays without building the
+    estimator (and without importing sklearn or xgboost). Picks the newest
+    version matching the filters.
+
+    Parameters:
+        registry_dir (Path): Root directory of the registry.
+        tag (str, optional): Tag to load.
+        version (int, optional): Version of the tag; newest if not given.
+        years (tuple, optional): (first, last) training year range.
+
+    Returns:
+        dict: meta.json contents plus 'path', 'arrays' (coef/intercept/classes
+        for linear models) and 'schema_arrays'.
+    """
+    version_dir = _resolve(registry_dir, tag, version, years)
+
+    with open(version_dir / _META_FILE) as f:
+        artifact = json.load(f)
+    artifact["path"] = version_dir
+
+    artifact["arrays"] = {}
+    if (version_dir / "model.npz").exists():
+        with np.load(version_dir / "model.npz") as data:
+            artifact["arrays"] = {key: data[key] for key in data.files}
+
+    artifact["schema_arrays"] = {}
+    if (version_dir / "schema.npz").exists():
+        with np.load(version_dir / "schema.npz") as data:
+            artifact["schema_arrays"] = {key: data[key] for key in data.files}
+
+    return artifact
+
+
+def load_model(registry_dir, tag=None, version=None, years=None):
+    """
+    Load a stored model ready for predict_proba.
+
+    Parameters:
+        registry_dir (Path): Root directory of the registry.
+        tag (str, optional): Tag to load.
+        version (int, optional): Version of the tag; newest if not given.
+        years (tuple, optional): (first, last) training year range.
+
+    Returns:
+        tuple: (model, artifact) with artifact as returned by load_artifact.
+    """
+    artifact = load_artifact(registry_dir, tag=tag, version=version, years=years)
+
+    if artifact["kind"] == "xgboost":
+        import xgboost
+
+        model = xgboost.XGBClassifier()
+        model.load_model(artifact["path"] / "model.ubj")
+        return model, artifact
+
+    module_name, _, class_name = artifact["estimator"].rpartition(".")
+    cls = getattr(importlib.import_module(module_name), class_name)
+    params = dict(artifact["params"])
+    for key in artifact.get("params_numeric_keys", []):
+        params[key] = {json.loads(k): v for k, v in params[key].items()}
+    model = cls(**params)
+    arrays = artifact["arrays"]
+    model.coef_ = arrays["coef"]
+    model.intercept_ = arrays["intercept"]
+    model.classes_ = arrays["classes"]
+    model.n_features_in_ = arrays["coef"].shape[1]
+    if artifact.get("has_feature_names_in"):
+        model.feature_names_in_ = np.asarray(artifact["feature_names"], dtype=object)
+    return model, artifact
+
+
+def standard_thresholds(y_true, y_probs, sample_weight=None) -> dict:
+    """
+    The decision thresholds the reports use: best F2 (recall-leaning), best
+    F0.5 (precision-leaning) and the precision/recall crossover.
+
+    Parameters:
+        y_true (array-like): True binary labels
+        y_probs (array-like): Predicted probabilities for the positive class
+        sample_weight (array-like, optional): Survey weight per row
+
+    Returns:
+        dict: {"f2": ..., "f0.5": ..., "crosspoint": ...}
+    """
+    from .evaluation import find_crosspoint_threshold, find_optimal_threshold
+
+    return {
+        "f2": float(find_optimal_threshold(y_true, y_probs, 2.0, sample_weight)),
+        "f0.5": float(find_optimal_threshold(y_true, y_probs, 0.5, sample_weight)),
+        "crosspoint": float(find_crosspoint_threshold(y_true, y_probs, sample_weight)),
+    }
+
+
+def training_data_hash(years, data_dir=Path("../data/cleaned")) -> str:
+    """
+    Combined SHA-256 of the cleaned csvs of the training years, to tell
+    which data a stored model was fitted on.
+
+    Parameters:
+        years (list of int): Training years.
+        data_dir (Path): Directory containing cleaned CSVs.
+
+    Returns:
+        str: Hex digest.
+    """
+    if not isinstance(years, list) or not all(isinstance(y, int) for y in years):
+        raise ValueError("`years` must be a list of integers")
+
+    digest = hashlib.sha256()
+    for year in sorted(years):
+        source = _csv_source(year, data_dir)
+        if not isinstance(source, Path):
+            raise ValueError(f"Cannot hash remote data for {year}: {source}")
+        digest.update(f"{year}:{file_hash(source)}".encode())
+    return digest.hexdigest()
+
+
+def _model_kind(model):
+    module = type(model).__module__
+    if module.startswith("xgboost"):
+        return "xgboost"
+    if module.startswith("sklearn") and hasattr(model, "coef_"):
+        return "sklearn_linear"
+    raise ValueError(
+        f"Unsupported model {type(model).__name__}: expected an XGBoost model "
+        "or a fitted linear sklearn classifier"
+    )
+
+
+def _versions(tag_dir):
+    if not tag_dir.is_dir():
+        return []
+    return [
+        int(path.name[1:])
+        for path in tag_dir.iterdir()
+        if re.fullmatch(r"v\d+", path.name) and (path / _META_FILE).exists()
+    ]
+
+
+def _resolve(registry_dir, tag, version, years):
+    if version is not None:
+        if tag is None:
+            raise ValueError("`version` needs a `tag`")
+        version_dir = registry_dir / tag / f"v{version:04d}"
+        if not (version_dir / _META_FILE).exists():
+            raise FileNotFoundError(
+                f"No version {version} of '{tag}' in {registry_dir}"
+            )
+        return version_dir
+
+    table = list_models(registry_dir, tag=tag, years=years)
+    if table.empty:
+        raise FileNotFoundError(
+            f"No model in {registry_dir} matches tag={tag!r}, years={years}"
+        )
+    return table["path"].iloc[-1]
+
+
+def _json_params(params):
+    # Constructor parameters that survive a JSON round trip, the names of
+    # dicts whose number keys were written as strings, and the names left out
+    kept, numeric_keys, dropped = {}, [], []
+    for key, value in params.items():
+        try:
+            if isinstance(value, dict) and not all(isinstance(k, str) for k in value):
+                value = {json.dumps(_json_value(k)): v for k, v in value.items()}
+                numeric_keys.append(key)
+            kept[key] = _json_value(value)
+        except TypeError:
+            dropped.append(key)
+            if key in numeric_keys:
+                numeric_keys.remove(key)
+
+    return kept, numeric_keys, dropped
+
+
+def _json_value(value):
+    # Plain Python value of a JSON-able param (numpy scalars included)
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    if isinstance(value, dict) and all(isinstance(k, str) for k in value):
+        return {k: _json_value(v) for k, v in value.items()}
+    raise TypeError(f"{type(value).__name__} is not a JSON-able param")
+
+
+def _json_default(value):
+    if isinstance(value, np.integer):
+        return int(value)
+    if isinstance(value, np.floating):
+        return float(value)
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
@@ -0,0 +1,111 @@
+# brfss_diabetes/resources.py
+
+# One CPU budget for the whole package. Process pools, BLAS/OpenMP thread
+# pools (through threadpoolctl) and XGBoost's nthread are all sized from
+# it, so a pool of W workers runs W x (budget // W) threads in total instead
+# of every worker claiming every core. Code outside the package (e.g. SMOTE's
+# neighbour search in the notebooks) can take its n_jobs from plan() too.
+
+import os
+from contextlib import contextmanager
+
+# Environment variable that caps the budget, e.g. on shared servers
+CPU_BUDGET_ENV = "BRFSS_CPU_BUDGET"
+
+# Budget set with configure(); None means "use the default"
+_CONFIG = {"total_cores": None}
+
+
+def available_cores() -> int:
+    """
+    Returns:
+        int: Cores this process may run on (its CPU affinity where the OS
+        reports it, else os.cpu_count()).
+    """
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def configure(total_cores=None):
+    """
+    Set the package's CPU budget. Without an explicit value, the budget is
+    BRFSS_CPU_BUDGET if set, else every available core.
+
+    Parameters:
+        total_cores (int, optional): Cores the package may use in total.
+    """
+    if total_cores is not None and (
+        not isinstance(total_cores, int) or total_cores <= 0
+    ):
+        raise ValueError(f"`total_cores` must be a positive int, got {total_cores}")
+
+    _CONFIG["total_cores"] = total_cores
+
+
+def cpu_budget() -> int:
+    """
+    Returns:
+        int: The current CPU budget (see configure).
+    """
+    if _CONFIG["total_cores"] is not None:
+        return _CONFIG["total_cores"]
+
+    value = os.environ.get(CPU_BUDGET_ENV)
+    if value is None:
+        return available_cores()
+    if not value.isdigit() or int(value) <= 0:
+        raise ValueError(f"{CPU_BUDGET_ENV} must be a positive int, got {value!r}")
+    return int(value)
+
+
+def plan(n_workers=1) -> dict:
+    """
+    Split the CPU budget between process workers and threads per worker.
+    Workers are capped at the budget; leftover cores go to threads.
+
+    Parameters:
+        n_workers (int): Requested worker processes; 1 means in-process.
+
+    Returns:
+        dict: workers (processes to start) and threads (per process, for
+        BLAS/OpenMP pools and XGBoost's nthread).
+    """
+    if not isinstance(n_workers, int) or n_workers <= 0:
+        raise ValueError(f"`n_workers` must be a positive int, got {n_workers}")
+
+    budget = cpu_budget()
+    workers = min(n_workers, budget)
+    return {"workers": workers, "threads": max(1, budget // workers)}
+
+
+@contextmanager
+def limit_threads(threads):
+    """
+    Cap the BLAS and OpenMP thread pools of this process for the duration
+    of a with block.
+
+    Parameters:
+        threads (int): Threads per pool.
+    """
+    from threadpoolctl import threadpool_limits
+
+    with threadpool_limits(limits=threads):
+        yield
+
+
+def init_worker_threads(threads):
+    """
+    Pool initializer: cap the thread pools of a worker process for its whole
+    life, including libraries it loads later (through the OpenMP/BLAS
+    environment variables).
+
+    Parameters:
+        threads (int): Threads per pool, usually plan(n)["threads"].
+    """
+    for name in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS"):
+        os.environ[name] = str(threads)
+
+    from threadpoolctl import threadpool_limits
+
+    threadpool_limits(limits=threads)
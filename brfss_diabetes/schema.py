@@ -0,0 +1,158 @@
+# brfss_diabetes/schema.py
+
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from .config import SURVEY_DESIGN_VARS, VARS_BY_YEAR, VARS_COMMON
+
+# Allowed values of the raw LLCP variables, as the cleaning functions handle
+# them. "codes" lists every valid code (answers plus the don't know/refused
+# codes), "range" bounds a continuous variable and "coerce" marks columns that
+# clean_survey_design converts to numbers itself. Blanks (NaN) are always
+# allowed, and optional columns may be absent.
+RAW_SCHEMA = {
+    "DIABETE4": {"codes": [1, 2, 3, 4, 7, 8, 9]},
+    "_AGEG5YR": {"codes": list(range(1, 15))},
+    "SEXVAR": {"codes": [1, 2]},
+    "EDUCA": {"codes": [1, 2, 3, 4, 5, 6, 9]},
+    "_BMI5": {"range": (1, 9999)},
+    "_BMI5CAT": {"codes": [1, 2, 3, 4]},
+    "SMOKE100": {"codes": [1, 2, 7, 9]},
+    "EXERANY2": {"codes": [1, 2, 7, 9]},
+    "DRNKANY5": {"codes": [1, 2, 7, 9]},
+    "DRNKANY6": {"codes": [1, 2, 7, 9]},
+    "_FRTLT1A": {"codes": [1, 2, 9]},
+    "_VEGESU1": {"range": (0, 99999)},
+    "FOODSTMP": {"codes": [1, 2, 7, 9]},
+    "SDHFOOD1": {"codes": [1, 2, 3, 4, 5, 7, 9]},
+    "_LLCPWT": {"coerce": True, "required": False},
+    "_STSTR": {"coerce": True, "required": False},
+    "_PSU": {"coerce": True, "required": False},
+}
+
+_REPORT_COLUMNS = ["column", "check", "detail", "rows"]
+
+
+class SchemaError(ValueError):
+    """
+    Raised when a frame violates its schema. `report` holds every violation
+    found, one row per column and check.
+    """
+
+    def __init__(self, message, report):
+        super().__init__(message)
+        self.report = report
+
+
+def raw_schema(year: int) -> dict:
+    """
+    The raw columns expected for a survey year and their allowed values.
+
+    Parameters:
+        year (int): Survey year.
+
+    Returns:
+        dict: Column name -> spec, in the order load_data.py writes them.
+    """
+    if not isinstance(year, int):
+        raise ValueError(f"`year` must be an int, got {type(year)}")
+
+    if year not in VARS_BY_YEAR:
+        raise ValueError(
+            f"No schema for year {year}; add its variables to config.VARS_BY_YEAR"
+        )
+
+    columns = VARS_COMMON + SURVEY_DESIGN_VARS + VARS_BY_YEAR[year]
+    return {col: RAW_SCHEMA[col] for col in columns}
+
+
+def validate_raw(df: pd.DataFrame, year: int, raise_errors=True) -> pd.DataFrame:
+    """
+    Check a raw-coded frame against the schema of its year in one pass:
+    required columns present, numeric dtypes, codes within the allowed set
+    and continuous values within range. Codes are checked on each column's
+    unique values, so the cost is one hash pass per column however many
+    helpers later touch it.
+
+    Parameters:
+        df (pd.DataFrame): Raw-coded frame, e.g. a brfss_subset_{year}.csv.
+        year (int): Survey year of the frame. Years missing from
+            config.VARS_BY_YEAR are checked on the common columns only, with
+            a warning.
+        raise_errors (bool): Raise a SchemaError listing every violation
+            instead of just returning them.
+
+    Returns:
+        pd.DataFrame: One row per violation (column, check, detail, rows); empty
+        when the frame is valid.
+    """
+    if not isinstance(df, pd.DataFrame):
+        raise ValueError(f"`df` must be a pandas DataFrame, got {type(df)}")
+
+    if isinstance(year, int) and year not in VARS_BY_YEAR:
+        # A new survey year can still be cleaned; only its common columns
+        # are known, so only those are checked
+        warnings.warn(
+            f"No schema for year {year}; validating the common columns only",
+            stacklevel=2,
+        )
+        schema = {col: RAW_SCHEMA[col] for col in VARS_COMMON + SURVEY_DESIGN_VARS}
+    else:
+        schema = raw_schema(year)
+
+    violations = []
+    for col, spec in schema.items():
+        if col not in df.columns:
+            if spec.get("required", True):
+                violations.append((col, "missing", "column not found", len(df)))
+            continue
+
+        if spec.get("coerce"):
+            continue
+
+        series = df[col]
+        if not pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(
+            series
+        ):
+            violations.append(
+                (col, "dtype", f"expected numeric, got {series.dtype}", len(df))
+            )
+            continue
+
+        values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+
+        if "codes" in spec:
+            uniques = pd.unique(values)
+            uniques = uniques[~np.isnan(uniques)]
+            bad = uniques[~np.isin(uniques, spec["codes"])]
+            if len(bad):
+                rows = int(np.isin(values, bad).sum())
+                shown = ", ".join(f"{v:g}" for v in np.sort(bad)[:10])
+                violations.append((col, "codes", f"unexpected codes: {shown}", rows))
+
+        if "range" in spec:
+            low, high = spec["range"]
+            outside = (values < low) | (values > high)
+            if outside.any():
+                violations.append(
+                    (
+                        col,
+                        "range",
+                        f"values outside [{low}, {high}]: "
+                        f"min {np.nanmin(values):g}, max {np.nanmax(values):g}",
+                        int(outside.sum()),
+                    )
+                )
+
+    report = pd.DataFrame(violations, columns=_REPORT_COLUMNS)
+
+    if raise_errors and len(report):
+        raise SchemaError(
+            f"Raw data for {year} does not match its schema "
+            f"({len(report)} violation(s)):\n{report.to_string(index=False)}",
+            report,
+        )
+
+    return report
@@ -0,0 +1,160 @@
+# brfss_diabetes/synthetic.py
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .cleaning import clean_brfss, to_cleaned_layout
+from .config import SEED, SURVEY_DESIGN_VARS, VARS_BY_YEAR, VARS_COMMON
+
+# Approximate LLCP code frequencies; NaN stands for BLANK (not asked/missing)
+_CODE_PROBS = {
+    "_AGEG5YR": (
+        list(range(1, 15)),
+        [6, 5, 6, 6, 6, 7, 8, 9, 10, 10, 9, 7, 9, 2],
+    ),
+    "SEXVAR": ([1, 2], [48, 52]),
+    "EDUCA": ([1, 2, 3, 4, 5, 6, 9], [0.2, 2, 4, 24, 27, 42.4, 0.4]),
+    "SMOKE100": ([1, 2, 7, 9, np.nan], [38, 56, 0.5, 0.2, 5.3]),
+    "EXERANY2": ([1, 2, 7, 9, np.nan], [74, 24, 0.1, 0.1, 1.8]),
+    "DRNKANY5": ([1, 2, 7, 9, np.nan], [50, 44, 0.7, 0.3, 5]),
+    "DRNKANY6": ([1, 2, 7, 9, np.nan], [50, 44, 0.7, 0.3, 5]),
+    "_FRTLT1A": ([1, 2, 9], [60, 32, 8]),
+    "FOODSTMP": ([1, 2, 7, 9, np.nan], [11, 82, 0.3, 0.2, 6.5]),
+    "SDHFOOD1": ([1, 2, 3, 4, 5, 7, 9, np.nan], [1.5, 2, 6, 8, 62, 0.5, 0.5, 19.5]),
+}
+
+
+def make_raw_brfss(year: int, n_rows: int, seed: int = SEED) -> pd.DataFrame:
+    """
+    Generate a raw-coded, BRFSS-like frame with the columns load_data.py keeps
+    for the given year. Codes follow the LLCP codebook, including the missing
+    codes (7/8/9, 14 for age, 9999 for BMI) and blanks as NaN, and diabetes
+    depends on age and BMI so models have some signal to find.
+
+    Parameters:
+        year (int): Survey year whose schema to emit.
+        n_rows (int): Number of respondents to generate.
+        seed (int): Seed for the random generator.
+
+    Returns:
+        pd.DataFrame: float64 columns, as pd.read_sas returns them.
+    """
+    if not isinstance(year, int):
+        raise ValueError(f"`year` must be an int, got {type(year)}")
+
+    if year not in VARS_BY_YEAR:
+        raise ValueError(f"No schema for year {year}; known: {list(VARS_BY_YEAR)}")
+
+    if not isinstance(n_rows, int) or n_rows < 0:
+        raise ValueError(f"`n_rows` must be a non-negative int, got {n_rows}")
+
+    rng = np.random.default_rng([seed, year])
+    df = pd.DataFrame(index=pd.RangeIndex(n_rows))
+
+    def draw(column):
+        codes, probs = _CODE_PROBS[column]
+        probs = np.asarray(probs, dtype=float)
+        return rng.choice(
+            np.asarray(codes, dtype=float), size=n_rows, p=probs / probs.sum()
+        )
+
+    age = draw("_AGEG5YR")
+
+    # BMI with two implied decimals, ~9% blank and a few 9999s
+    bmi = np.round(np.exp(rng.normal(np.log(28.0), 0.2, size=n_rows)) * 100)
+    bmi[rng.random(n_rows) < 0.09] = np.nan
+    bmi[rng.random(n_rows) < 0.002] = 9999
+    bmi_cat = np.select(
+        [bmi < 1850, bmi < 2500, bmi < 3000, bmi < 9999], [1, 2, 3, 4], np.nan
+    )
+
+    # Diabetes risk rises with age group and BMI
+    age_effect = np.where(age <= 13, age, 7)
+    bmi_effect = np.where(bmi < 9999, bmi / 100, 28.0)
+    logit = -6.3 + 0.2 * age_effect + 0.09 * np.nan_to_num(bmi_effect, nan=28.0)
+    has_diabetes = rng.random(n_rows) < 1 / (1 + np.exp(-logit))
+    diabetes = np.where(
+        has_diabetes,
+        rng.choice([1.0, 2.0], size=n_rows, p=[0.93, 0.07]),
+        rng.choice([3.0, 4.0], size=n_rows, p=[0.97, 0.03]),
+    )
+    missing = rng.random(n_rows)
+    diabetes[missing < 0.004] = 7
+    diabetes[(missing >= 0.004) & (missing < 0.005)] = 9
+
+    for col in VARS_COMMON:
+        if col == "DIABETE4":
+            df[col] = diabetes
+        elif col == "_AGEG5YR":
+            df[col] = age
+        elif col == "_BMI5":
+            df[col] = bmi
+        elif col == "_BMI5CAT":
+            df[col] = bmi_cat
+        else:
+            df[col] = draw(col)
+
+    for col in VARS_BY_YEAR[year]:
+        if col == "_VEGESU1":
+            veg = np.round(np.exp(rng.normal(np.log(1.8), 0.6, size=n_rows)) * 100)
+            veg[rng.random(n_rows) < 0.1] = np.nan
+            df[col] = veg
+        else:
+            df[col] = draw(col)
+
+    # Survey design: skewed weights, ~50 strata per state, one PSU per record
+    df["_LLCPWT"] = rng.gamma(1.2, 500.0, size=n_rows)
+    df["_STSTR"] = (
+        rng.integers(1, 57, size=n_rows) * 1000 + rng.integers(1, 50, size=n_rows)
+    ).astype(float)
+    df["_PSU"] = (year * 1_000_000 + np.arange(n_rows)).astype(float)
+
+    return df[VARS_COMMON + SURVEY_DESIGN_VARS + VARS_BY_YEAR[year]]
+
+
+def make_cleaned_brfss(year: int, n_rows: int, seed: int = SEED) -> pd.DataFrame:
+    """
+    Generate a synthetic frame in the brfss_cleaned_{year}.csv layout by running
+    make_raw_brfss through clean_brfss and to_cleaned_layout.
+
+    Parameters:
+        year (int): Survey year whose schema to emit.
+        n_rows (int): Number of raw respondents (rows without a diabetes status
+            are dropped, as in the real pipeline).
+        seed (int): Seed for the random generator.
+
+    Returns:
+        pd.DataFrame: Cleaned frame with 'diabetes' last.
+    """
+    return to_cleaned_layout(clean_brfss(make_raw_brfss(year, n_rows, seed), year))
+
+
+def write_cleaned_years(years, n_rows: int, data_dir: Path, seed: int = SEED):
+    """
+    Write synthetic brfss_cleaned_{year}.csv files, n_rows raw rows per year,
+    so load_all_years and friends can run without the real LLCP files.
+
+    Parameters:
+        years (list of int): Years to write.
+        n_rows (int): Raw rows per year.
+        data_dir (Path): Output directory (created if needed).
+        seed (int): Seed for the random generator.
+
+    Returns:
+        list[Path]: Paths of the written files.
+    """
+    if not isinstance(years, list) or not all(isinstance(y, int) for y in years):
+        raise ValueError("`years` must be a list of integers")
+
+    if not isinstance(data_dir, Path):
+        raise ValueError(f"`data_dir` must be a pathlib.Path, got {type(data_dir)}")
+
+    data_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for year in years:
+        path = data_dir / f"brfss_cleaned_{year}.csv"
+        make_cleaned_brfss(year, n_rows, seed).to_csv(path, index=False)
+        paths.append(path)
+    return paths
@@ -0,0 +1,230 @@
+# brfss_diabetes/trees.py
+
+# XGBoost scoring without xgboost: the booster's trees are flattened into
+# one node table (feature, threshold, left, right, default_left, value) and
+# a batch walks all trees at once, one tree level per step. Only numpy is
+# imported, so scoring workers skip the xgboost import and its memory.
+
+import json
+from pathlib import Path
+
+import numpy as np
+
+from .inference import sigmoid
+
+# Rows per step of the level-wise walk; bounds the (rows, trees) index array
+_BATCH_ROWS = 1_024
+_OBJECTIVES = ("binary:logistic", "reg:logistic")
+_TABLE = ("feature", "threshold", "left", "right", "default_left", "value", "roots")
+
+
+def export_trees(model, path=None) -> dict:
+    """
+    Flatten a trained binary XGBoost classifier into node tables. Needs
+    xgboost, but only at export time. With early stopping, only the trees
+    up to the best iteration are kept, as predict_proba does.
+
+    Parameters:
+        model: Fitted XGBClassifier or xgboost.Booster (gbtree booster,
+            binary:logistic objective, numeric splits).
+        path (Path or str, optional): Also save the tables there (.npz).
+
+    Returns:
+        dict: Node arrays (leaves point to themselves), the root of every
+        tree, the base margin, the maximum depth and the feature names.
+    """
+    booster = model.get_booster() if hasattr(model, "get_booster") else model
+    if not hasattr(booster, "save_raw"):
+        raise ValueError(f"`model` must be an XGBoost model, got {type(model)}")
+
+    learner = json.loads(booster.save_raw(raw_format="json"))["learner"]
+    objective = learner["objective"]["name"]
+    if objective not in _OBJECTIVES:
+        raise ValueError(
+            f"Only {_OBJECTIVES} objectives are supported, got {objective}"
+        )
+
+    booster_json = learner["gradient_booster"]
+    if booster_json["name"] != "gbtree":
+        raise ValueError(
+            f"Only gbtree boosters are supported, got {booster_json['name']}"
+        )
+
+    trees = booster_json["model"]["trees"]
+    best = getattr(booster, "best_iteration", None)
+    if best is not None:
+        trees = trees[
+            : (best + 1)
+            * int(booster_json["model"]["gbtree_model_param"]["num_parallel_tree"])
+        ]
+
+    columns = {name: [] for name in _TABLE}
+    depth = 0
+    offset = 0
+    for tree in trees:
+        if any(tree["split_type"]):
+            raise ValueError("Categorical splits are not supported")
+
+        left = np.asarray(tree["left_children"], dtype=np.int32)
+        right = np.asarray(tree["right_children"], dtype=np.int32)
+        leaf = left == -1
+        nodes = np.arange(len(left), dtype=np.int32)
+
+        # Leaves loop back to themselves, so extra steps leave them in place
+        columns["left"].append(np.where(leaf, nodes, left) + offset)
+        columns["right"].append(np.where(leaf, nodes, right) + offset)
+        columns["feature"].append(
+            np.where(leaf, 0, tree["split_indices"]).astype(np.int32)
+        )
+        columns["threshold"].append(
+            np.asarray(tree["split_conditions"], dtype=np.float32)
+        )
+        columns["default_left"].append(np.asarray(tree["default_left"], dtype=bool))
+        columns["value"].append(
+            np.where(leaf, np.asarray(tree["split_conditions"], dtype=np.float32), 0)
+        )
+        columns["roots"].append(np.array([offset], dtype=np.int32))
+
+        depth = max(depth, _depth(left, right))
+        offset += len(left)
+
+    table = {
+        name: np.concatenate(parts) if parts else np.zeros(0)
+        for name, parts in columns.items()
+    }
+    table["value"] = table["value"].astype(np.float32)
+    base_score = np.float32(learner["learner_model_param"]["base_score"].strip("[]"))
+    table.update(
+        base_margin=float(np.log(base_score / (1 - base_score))),
+        depth=depth,
+        n_features=int(learner["learner_model_param"]["num_feature"]),
+        feature_names=list(learner.get("feature_names") or []),
+    )
+    if path is not None:
+        save_trees(table, path)
+    return table
+
+
+def save_trees(trees: dict, path):
+    """
+    Write exported trees to an .npz file.
+
+    Parameters:
+        trees (dict): Output of export_trees.
+        path (Path or str): Output file.
+    """
+    if not isinstance(path, (str, Path)):
+        raise ValueError("`path` must be a string or Path object.")
+
+    np.savez(
+        path,
+        **{name: trees[name] for name in _TABLE},
+        base_margin=np.float64(trees["base_margin"]),
+        depth=np.int32(trees["depth"]),
+        n_features=np.int32(trees["n_features"]),
+        feature_names=np.asarray(trees["feature_names"], dtype=str),
+    )
+
+
+def load_trees(path) -> dict:
+    """
+    Read trees written by save_trees.
+
+    Parameters:
+        path (Path or str): Trees file.
+
+    Returns:
+        dict: The trees.
+    """
+    if not isinstance(path, (str, Path)):
+        raise ValueError("`path` must be a string or Path object.")
+
+    with np.load(path) as data:
+        trees = {name: data[name] for name in _TABLE}
+        trees.update(
+            base_margin=float(data["base_margin"]),
+            depth=int(data["depth"]),
+            n_features=int(data["n_features"]),
+            feature_names=data["feature_names"].tolist(),
+        )
+    return trees
+
+
+def predict_margin(trees: dict, X) -> np.ndarray:
+    """
+    Sum of the leaf values reached in every tree plus the base margin.
+
+    Parameters:
+        trees (dict): Output of export_trees / load_trees.
+        X (array-like or pd.DataFrame): Rows in the model's feature order
+            (DataFrames are reordered by name when the model has names).
+            NaN is missing and follows each split's default direction.
+
+    Returns:
+        np.ndarray: float64 log-odds, one per row.
+    """
+    X = _as_float32(trees, X)
+    children = np.stack([trees["left"], trees["right"]], axis=1).ravel()
+    margin = np.empty(len(X))
+    for start in range(0, len(X), _BATCH_ROWS):
+        batch = X[start : start + _BATCH_ROWS]
+        margin[start : start + _BATCH_ROWS] = _walk(trees, children, batch)
+    return margin + trees["base_margin"]
+
+
+def predict_proba(trees: dict, X) -> np.ndarray:
+    """
+    Probability of the positive class for each row, as
+    XGBClassifier.predict_proba(X)[:, 1].
+
+    Returns:
+        np.ndarray: float64 probabilities, one per row.
+    """
+    return sigmoid(predict_margin(trees, X))
+
+
+def _walk(trees, children, X):
+    # One (rows, trees) matrix of current nodes, advanced one level per step;
+    # children holds (left, right) pairs, so the next node is one gather
+    n_rows, n_features = X.shape
+    flat = X.ravel()
+    row_start = (np.arange(n_rows, dtype=np.intp) * n_features)[:, np.newaxis]
+    has_missing = np.isnan(X).any()
+
+    nodes = np.broadcast_to(trees["roots"], (n_rows, len(trees["roots"])))
+    for _ in range(trees["depth"]):
+        values = flat[row_start + trees["feature"][nodes]]
+        # NaN compares False, i.e. goes left unless the split defaults right
+        go_right = values >= trees["threshold"][nodes]
+        if has_missing:
+            go_right |= np.isnan(values) & ~trees["default_left"][nodes]
+        nodes = children[2 * nodes + go_right]
+    return trees["value"][nodes].sum(axis=1, dtype=np.float64)
+
+
+def _depth(left, right):
+    depth = 0
+    level = np.array([0])
+    while True:
+        internal = level[left[level] != -1]
+        if len(internal) == 0:
+            return depth
+        level = np.concatenate([left[internal], right[internal]])
+        depth += 1
+
+
+def _as_float32(trees, X):
+    if hasattr(X, "columns"):
+        columns = trees["feature_names"] or list(X.columns)
+        X = X[columns].to_numpy(dtype=np.float32, na_value=np.nan)
+    else:
+        X = np.asarray(X, dtype=np.float32)
+
+    if X.ndim == 1:
+        X = X[np.newaxis, :]
+
+    if X.ndim != 2 or X.shape[1] != trees["n_features"]:
+        raise ValueError(
+            f"`X` must have {trees['n_features']} columns, got shape {X.shape}"
+        )
+    return X
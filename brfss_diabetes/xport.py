@@ -0,0 +1,359 @@
+# brfss_diabetes/xport.py
+
+# SAS XPORT (v5) files, as the LLCP{year}.XPT downloads are distributed.
+# Observations are fixed-width records, so a variable sits at the same byte
+# offset in every row: the file is memory-mapped as a (rows, row_length)
+# byte matrix and only the requested columns are sliced out and decoded.
+# pd.read_sas instead decodes all ~350 LLCP variables of every record.
+
+import struct
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .instrumentation import instrument
+
+_CARD = 80
+_LIBRARY_HEADER = (
+    b"HEADER RECORD*******LIBRARY HEADER RECORD!!!!!!!"
+    b"000000000000000000000000000000  "
+)
+_MEMBER_HEADER = b"HEADER RECORD*******MEMBER  HEADER RECORD!!!!!!!"
+_DSCRPTR_HEADER = (
+    b"HEADER RECORD*******DSCRPTR HEADER RECORD!!!!!!!"
+    b"000000000000000000000000000000  "
+)
+_NAMESTR_HEADER = b"HEADER RECORD*******NAMESTR HEADER RECORD!!!!!!!"
+_OBS_HEADER = (
+    b"HEADER RECORD*******OBS     HEADER RECORD!!!!!!!"
+    b"000000000000000000000000000000  "
+)
+
+# One namestr per variable: type, hash, length, varnum, name, label, format
+# (name, width, decimals, justification), filler, informat (name, width,
+# decimals), position in the observation, then padding
+_NAMESTR = struct.Struct(">hhhh8s40s8shhh2s8shhl52s")
+
+_FRACTION_MASK = np.uint64((1 << 56) - 1)
+_MANTISSA_MASK = np.uint64((1 << 52) - 1)
+
+
+def read_xport_header(path) -> dict:
+    """
+    Parse the headers of a single-member XPORT file (as the LLCP downloads
+    are): the member's name and label, its variables and where its
+    observations start.
+
+    Parameters:
+        path (Path or str): The .XPT file.
+
+    Returns:
+        dict: name, label, variables (list of dicts with name, type
+        ('numeric'/'char'), length, position and label), row_length,
+        data_offset and n_rows.
+    """
+    if not isinstance(path, (str, Path)):
+        raise ValueError("`path` must be a string or Path object.")
+
+    with open(path, "rb") as f:
+        if f.read(_CARD) != _LIBRARY_HEADER:
+            raise ValueError(f"{path} is not a SAS XPORT (v5) file")
+        f.read(2 * _CARD)
+
+        member = f.read(_CARD)
+        if not member.startswith(_MEMBER_HEADER) or f.read(_CARD) != _DSCRPTR_HEADER:
+            raise ValueError(f"No member header found in {path}")
+        namestr_length = int(member[-5:-2])
+
+        descriptor = f.read(2 * _CARD)
+        name = descriptor[8:16].decode("ascii").strip()
+        label = descriptor[_CARD + 32 : _CARD + 72].decode("latin-1").strip()
+
+        namestr_header = f.read(_CARD)
+        if not namestr_header.startswith(_NAMESTR_HEADER):
+            raise ValueError(f"No variable descriptors found in {path}")
+        n_vars = int(namestr_header[54:58])
+
+        size = namestr_length * n_vars
+        block = f.read(size + (-size % _CARD))
+        variables = []
+        for i in range(n_vars):
+            raw = block[i * namestr_length : (i + 1) * namestr_length]
+            fields = _NAMESTR.unpack(raw.ljust(_NAMESTR.size, b"\x00"))
+            variables.append(
+                {
+                    "name": fields[4].decode("ascii").strip(),
+                    "type": "numeric" if fields[0] == 1 else "char",
+                    "length": fields[2],
+                    "position": fields[14],
+                    "label": fields[5].decode("latin-1").strip(),
+                }
+            )
+
+        if f.read(_CARD) != _OBS_HEADER:
+            raise ValueError(f"No observation header found in {path}")
+        data_offset = f.tell()
+
+        row_length = sum(var["length"] for var in variables)
+        data_length = Path(path).stat().st_size - data_offset
+        n_rows = data_length // row_length if row_length else 0
+        if 0 < row_length < _CARD:
+            # The last card is padded with blanks, which may look like rows
+            while n_rows > 0 and (n_rows * row_length) > data_length - _CARD:
+                f.seek(data_offset + (n_rows - 1) * row_length)
+                if f.read(row_length) != b" " * row_length:
+                    break
+                n_rows -= 1
+
+    return {
+        "name": name,
+        "label": label,
+        "variables": variables,
+        "row_length": row_length,
+        "data_offset": data_offset,
+        "n_rows": n_rows,
+    }
+
+
+@instrument()
+def read_xport(path, columns=None, encoding="utf-8") -> pd.DataFrame:
+    """
+    Read selected variables of an XPORT file. Numeric variables come back as
+    float64 with SAS missing values (., .A-.Z, ._) as NaN, like pd.read_sas;
+    character variables as right-stripped strings.
+
+    Parameters:
+        path (Path or str): The .XPT file.
+        columns (list[str], optional): Variables to read, in output order.
+            All variables if not given.
+        encoding (str, optional): Encoding of character variables; None
+            leaves them as bytes.
+
+    Returns:
+        pd.DataFrame: One column per requested variable.
+    """
+    header = read_xport_header(path)
+    variables = {var["name"]: var for var in header["variables"]}
+
+    if columns is None:
+        columns = list(variables)
+    elif not isinstance(columns, list) or not all(isinstance(c, str) for c in columns):
+        raise ValueError("`columns` must be a list of strings")
+
+    missing = [col for col in columns if col not in variables]
+    if missing:
+        raise ValueError(f"Variables not in {path}: {missing}")
+
+    n_rows = header["n_rows"]
+    if n_rows == 0:
+        return pd.DataFrame(
+            {col: pd.Series(dtype=_dtype(variables[col])) for col in columns}
+        )
+
+    rows = np.memmap(
+        path,
+        dtype=np.uint8,
+        mode="r",
+        offset=header["data_offset"],
+        shape=(n_rows, header["row_length"]),
+    )
+
+    data = {}
+    for col in columns:
+        var = variables[col]
+        field = rows[:, var["position"] : var["position"] + var["length"]]
+        if var["type"] == "numeric":
+            data[col] = ibm_to_ieee(field)
+        else:
+            values = np.ascontiguousarray(field).view(f"S{var['length']}").ravel()
+            values = np.char.rstrip(values, b" ")
+            data[col] = (
+                values.astype(object)
+                if encoding is None
+                else np.char.decode(values, encoding).astype(object)
+            )
+
+    return pd.DataFrame(data, columns=columns)
+
+
+def ibm_to_ieee(field) -> np.ndarray:
+    """
+    Decode IBM System/370 hexadecimal floats, as XPORT stores numbers.
+
+    Parameters:
+        field (np.ndarray): uint8 array of shape (n, k), 2 <= k <= 8; shorter
+            fields are truncated floats padded with zero bytes on the right.
+
+    Returns:
+        np.ndarray: float64 values, with SAS missing values as NaN.
+    """
+    field = np.asarray(field, dtype=np.uint8)
+    if field.ndim != 2 or not 2 <= field.shape[1] <= 8:
+        raise ValueError("`field` must be an (n, k) uint8 array with 2 <= k <= 8")
+
+    buf = np.zeros((len(field), 8), dtype=np.uint8)
+    buf[:, : field.shape[1]] = field
+    ibm = buf.view(">u8").ravel().astype(np.uint64)
+
+    sign = ibm & np.uint64(1 << 63)
+    exponent = ((ibm >> np.uint64(56)) & np.uint64(0x7F)).astype(np.int64)
+    fraction = ibm & _FRACTION_MASK
+
+    # Normalized IBM fractions start with a non-zero hex digit, so the
+    # leading bit is 0-3 places above IEEE's implicit bit (bit 52)
+    shift = np.zeros(len(ibm), dtype=np.uint64)
+    for bit in (53, 54, 55):
+        shift[(fraction >> np.uint64(bit)) != 0] = bit - 52
+
+    biased = (exponent - 65) * 4 + shift.astype(np.int64) + 1023
+    ieee = (
+        sign
+        | (biased.astype(np.uint64) << np.uint64(52))
+        | ((fraction >> shift) & _MANTISSA_MASK)
+    )
+    values = ieee.view(np.float64)
+
+    # Unnormalized fractions (leading hex digit 0) are rare; decode directly
+    odd = (fraction != 0) & ((fraction >> np.uint64(52)) == 0)
+    if odd.any():
+        magnitude = np.ldexp(
+            fraction[odd].astype(np.float64), 4 * (exponent[odd] - 64) - 56
+        )
+        values[odd] = np.where(sign[odd] != 0, -magnitude, magnitude)
+
+    values[fraction == 0] = 0.0
+
+    # Missing: '.', '.A'-'.Z' or '._' in the first byte, zeros after it
+    first = buf[:, 0]
+    special = (first == 0x2E) | (first == 0x5F) | ((first >= 0x41) & (first <= 0x5A))
+    values[special & ((ibm & ~np.uint64(0xFF << 56)) == 0)] = np.nan
+    return values
+
+
+def ieee_to_ibm(values) -> np.ndarray:
+    """
+    Encode float64 values as 8-byte IBM hexadecimal floats (NaN as the SAS
+    missing value '.'). Exact for values IEEE can hold in IBM's range.
+
+    Parameters:
+        values (array-like): Numbers to encode.
+
+    Returns:
+        np.ndarray: uint8 array of shape (n, 8).
+    """
+    values = np.asarray(values, dtype=np.float64).ravel()
+    bits = values.view(np.uint64)
+
+    sign = bits & np.uint64(1 << 63)
+    power = ((bits >> np.uint64(52)) & np.uint64(0x7FF)).astype(np.int64) - 1023
+    mantissa = (bits & _MANTISSA_MASK) | np.uint64(1 << 52)
+
+    # value = mantissa * 2**(power - 52) = fraction * 2**-56 * 16**(exponent - 64)
+    exponent = power // 4 + 65
+    fraction = mantissa << (power % 4).astype(np.uint64)
+
+    finite = np.isfinite(values) & (values != 0)
+    if np.any(finite & ((exponent < 0) | (exponent > 127))):
+        raise ValueError("Values outside the IBM float range cannot be encoded")
+
+    ibm = np.where(
+        finite, sign | (exponent.astype(np.uint64) << np.uint64(56)) | fraction, 0
+    ).astype(np.uint64)
+    ibm[np.isnan(values)] = np.uint64(0x2E << 56)
+    return ibm.astype(">u8").view(np.uint8).reshape(-1, 8)
+
+
+def write_xport(df: pd.DataFrame, path, name="DATA", label=""):
+    """
+    Write a DataFrame as a single-member XPORT (v5) file. Numeric columns
+    are stored as 8-byte IBM floats, everything else as character columns
+    as wide as their longest value.
+
+    Parameters:
+        df (pd.DataFrame): Data with column names of at most 8 characters.
+        path (Path or str): Output file.
+        name (str): Member (dataset) name, at most 8 characters.
+        label (str): Dataset label, at most 40 characters.
+    """
+    if not isinstance(df, pd.DataFrame):
+        raise ValueError(f"`df` must be a pandas DataFrame, got {type(df)}")
+
+    if not isinstance(path, (str, Path)):
+        raise ValueError("`path` must be a string or Path object.")
+
+    too_long = [str(col) for col in [*df.columns, name] if len(str(col)) > 8]
+    if too_long:
+        raise ValueError(f"XPORT names are at most 8 characters: {too_long}")
+
+    stamp = datetime.now().strftime("%d%b%y:%H:%M:%S").upper().encode("ascii")
+
+    fields = []
+    namestrs = []
+    position = 0
+    for i, col in enumerate(df.columns, start=1):
+        series = df[col]
+        if pd.api.types.is_numeric_dtype(series):
+            field = ieee_to_ibm(series.to_numpy(dtype=np.float64, na_value=np.nan))
+            ntype = 1
+        else:
+            encoded = series.fillna("").astype(str).str.encode("utf-8")
+            width = max(1, int(encoded.str.len().max() or 0))
+            field = (
+                np.asarray(encoded.to_list(), dtype=f"S{width}")
+                .view(np.uint8)
+                .reshape(len(df), width)
+                .copy()
+            )
+            field[field == 0] = 0x20
+            ntype = 2
+        fields.append(field)
+        namestrs.append(
+            _NAMESTR.pack(
+                ntype,
+                0,
+                field.shape[1],
+                i,
+                _pad(col, 8),
+                b" " * 40,
+                b" " * 8,
+                0,
+                0,
+                0,
+                b"  ",
+                b" " * 8,
+                0,
+                0,
+                position,
+                b"\x00" * 52,
+            )
+        )
+        position += field.shape[1]
+
+    cards = [
+        _LIBRARY_HEADER,
+        _pad("SAS     SAS     SASLIB  9.4     X64_10PR", 64) + stamp,
+        stamp + b" " * 64,
+        _MEMBER_HEADER + b"000000000000000001600000000140  ",
+        _DSCRPTR_HEADER,
+        b"SAS     " + _pad(name, 8) + b"SASDATA 9.4     X64_10PR" + b" " * 24 + stamp,
+        stamp + b" " * 16 + _pad(label, 40) + b" " * 8,
+        _NAMESTR_HEADER + f"000000{df.shape[1]:04d}".encode() + b"0" * 20 + b"  ",
+    ]
+    descriptors = b"".join(namestrs)
+    rows = np.hstack(fields).tobytes() if fields and len(df) else b""
+
+    with open(path, "wb") as f:
+        f.write(b"".join(cards))
+        f.write(descriptors + b" " * (-len(descriptors) % _CARD))
+        f.write(_OBS_HEADER)
+        f.write(rows + b" " * (-len(rows) % _CARD))
+
+
+def _pad(text, width):
+    return str(text).encode("latin-1").ljust(width)[:width]
+
+
+def _dtype(var):
+    return np.float64 if var["type"] == "numeric" else object
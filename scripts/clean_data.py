@@ -2,15 +2,21 @@ import os
 import sys
 
 proj_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-src_path = os.path.join(proj_root, "src")
-sys.path.insert(0, src_path)
+sys.path.insert(0, proj_root)
 
 import pandas as pd
-from utils import clean_brfss, finalize_columns
+from pathlib import Path
+
+from brfss_diabetes.catalog import CATALOG_FILE, build_catalog
+from brfss_diabetes.cleaning import clean_brfss, to_cleaned_layout
+from brfss_diabetes.config import SURVEY_WEIGHT_COL
+from brfss_diabetes.cube import CUBE_FILE, build_cube
+
+YEARS = [2019, 2020, 2021, 2022, 2023]
 
 
 def main():
-    for year in [2019, 2020, 2021, 2022, 2023]:
+    for year in YEARS:
         # ----------------------------------------------------------------------
         # 1. Define paths
         # ----------------------------------------------------------------------
@@ -48,58 +54,14 @@ def main():
         df["year"] = year
 
         # ---------------------------------------------------------------------------
-        # 6. Finalize columns and their order
+        # 6. Finalize columns and their order, drop missing diabetes status
+        #    (since it's the target), snake_case the columns and make sure the
+        #    target column "diabetes" is last
         # ---------------------------------------------------------------------------
-
-        column_order = [
-            "year",
-            "AGE",
-            "SEX",
-            "EDUCA",
-            "BMI",
-            "BMICAT",
-            "drink_any",
-            "fruit_low",
-            "veg_servings",
-            "snap_used",
-            "food_insecurity",
-            "SMOKE100",
-            "EXERANY2",
-            "DIABETE4",
-        ]
-        df = finalize_columns(df, column_order)
-
-        # ----------------------------------------------------------------------
-        # 7. Drop missing diabetes status (since it's the target)
-        # ----------------------------------------------------------------------
-        df = df.dropna(subset=["DIABETE4"])
-
-        # ----------------------------------------------------------------------
-        # 8. snake_case the columns
-        # ----------------------------------------------------------------------
-        df = df.rename(
-            columns={
-                "AGE": "age",
-                "SEX": "sex",
-                "EDUCA": "educa",
-                "BMI": "bmi",
-                "BMICAT": "bmi_cat",
-                "SMOKE100": "smoke_100",
-                "EXERANY2": "exercise_any",
-                "DIABETE4": "diabetes",
-            }
-        )
+        df = to_cleaned_layout(df)
 
         # ----------------------------------------------------------------------
-        # 9. Make sure the target column "diabetes" is last
-        # ----------------------------------------------------------------------
-        target = "diabetes"
-        if target in df.columns:
-            cols = [col for col in df.columns if col != target] + [target]
-            df = df[cols]
-
-        # ----------------------------------------------------------------------
-        # 10. Output the columns, shape, number of rows lost
+        # 7. Output the columns, shape, number of rows lost
         # ----------------------------------------------------------------------
         print(f"Columns after: {df.columns}")
         print(f"DataFrame shape after: {df.shape}")
@@ -108,7 +70,7 @@ def main():
         )
 
         # ----------------------------------------------------------------------
-        # 11. Save the cleaned DataFrame
+        # 8. Save the cleaned DataFrame
         # ----------------------------------------------------------------------
         # Ensure output directories exist
         os.makedirs(os.path.dirname(out_path), exist_ok=True)
@@ -120,6 +82,21 @@ def main():
         df.to_csv(out_colab_path, index=False)
         print(f"Saved clean data to colab-friendly path: {out_colab_path}")
 
+    # --------------------------------------------------------------------------
+    # 9. Catalog which features each cleaned file has, for
+    #    load_all_years(features=..., catalog=cleaned_dir / CATALOG_FILE)
+    # --------------------------------------------------------------------------
+    cleaned_dir = Path(os.path.dirname(__file__)) / "../data/cleaned"
+    build_catalog(YEARS, cleaned_dir, cleaned_dir / CATALOG_FILE)
+    print(f"Saved feature catalog to {cleaned_dir / CATALOG_FILE}")
+
+    # --------------------------------------------------------------------------
+    # 10. Precompute diabetes counts per year x age x sex x educa x bmi_cat
+    #     cell (plain and survey-weighted); only new or changed years are read
+    # --------------------------------------------------------------------------
+    build_cube(YEARS, cleaned_dir, cleaned_dir / CUBE_FILE, SURVEY_WEIGHT_COL)
+    print(f"Saved prevalence cube to {cleaned_dir / CUBE_FILE}")
+
 
 if __name__ == "__main__":
     main()
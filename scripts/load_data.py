@@ -1,15 +1,16 @@
-import pandas as pd
 import os
 
+from brfss_diabetes.config import SURVEY_DESIGN_VARS, VARS_BY_YEAR, VARS_COMMON
+from brfss_diabetes.xport import read_xport
 
-def load_brfss_raw(path_to_raw):
+
+def load_brfss_raw(path_to_raw, columns=None):
     """
-    Load the raw BRFSS 2023 file into a pandas Dataframe.
-    path_to_raw: str, full path to the .ASC file
+    Load a raw BRFSS LLCP file into a pandas Dataframe.
+    path_to_raw: str, full path to the .XPT file
+    columns: optional list of variables to decode; the rest are skipped
     """
-    #
-    df = pd.read_sas(path_to_raw, format="xport", encoding="utf-8")
-    return df
+    return read_xport(path_to_raw, columns=columns, encoding="utf-8")
 
 
 def subset_variables(df, columns):
@@ -20,7 +21,7 @@ def subset_variables(df, columns):
 
 
 def get_vars_to_keep(year: int) -> list[str]:
-    return vars_common + vars_by_year.get(year, [])
+    return VARS_COMMON + SURVEY_DESIGN_VARS + VARS_BY_YEAR.get(year, [])
 
 
 if __name__ == "__main__":
@@ -35,30 +36,11 @@ if __name__ == "__main__":
             f"../data/subset/brfss_subset_{year}.csv",
         )
 
-        # 2. List variables to keep that are common to all years
-        vars_common = [
-            "DIABETE4",
-            "_AGEG5YR",
-            "SEXVAR",
-            "EDUCA",
-            "_BMI5",
-            "_BMI5CAT",
-            "SMOKE100",
-            "EXERANY2",
-        ]
-
-        # 3. Year-specific variables
-        # DRNKANY5 (used 2019–2021), renamed to DRNKANY6 in 2022+
-        vars_by_year = {
-            2019: ["DRNKANY5", "_FRTLT1A", "_VEGESU1", "FOODSTMP"],
-            2020: ["DRNKANY5"],
-            2021: ["DRNKANY5", "_FRTLT1A", "_VEGESU1"],
-            2022: ["DRNKANY6", "SDHFOOD1", "FOODSTMP"],
-            2023: ["DRNKANY6", "SDHFOOD1", "FOODSTMP"],
-        }
-
-        # 3. Load raw file
-        df_raw = load_brfss_raw(raw_path)
+        # 2. Variables to keep (common, survey design and year-specific)
+        #    are listed in brfss_diabetes.config
+
+        # 3. Load raw file, decoding only the variables to keep
+        df_raw = load_brfss_raw(raw_path, get_vars_to_keep(year))
 
         # 4. Subset
         df_subset = subset_variables(df_raw, get_vars_to_keep(year))
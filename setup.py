@@ -14,6 +14,11 @@ setup(
         "seaborn",
         "shap",
         "numpy",
+        "scipy",
+        "threadpoolctl",
     ],
+    extras_require={
+        # Lazy polars backend (brfss_diabetes.polars_backend)
+        "polars": ["polars>=1.0", "pyarrow"],
+    },
 )
-
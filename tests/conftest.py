@@ -0,0 +1,44 @@
+# tests/conftest.py
+
+import pandas as pd
+import pytest
+
+from brfss_diabetes.preprocessing import prepare_common_features
+from brfss_diabetes.synthetic import make_cleaned_brfss, write_cleaned_years
+
+# Rows per year of cleaned_dir unless the test module sets CLEANED_ROWS
+CLEANED_ROWS = 2_000
+
+# Years and rows per year of encoded unless the test module sets
+# ENCODED_YEARS / ENCODED_ROWS
+ENCODED_YEARS = [2022]
+ENCODED_ROWS = 5_000
+
+
+@pytest.fixture(scope="module")
+def cleaned_dir(request, tmp_path_factory):
+    """
+    Synthetic brfss_cleaned_{year}.csv files for the test module's YEARS,
+    with CLEANED_ROWS rows each (module-level names of the test file).
+    """
+    years = request.module.YEARS
+    n_rows = getattr(request.module, "CLEANED_ROWS", CLEANED_ROWS)
+    data_dir = tmp_path_factory.mktemp("cleaned")
+    write_cleaned_years(years, n_rows, data_dir)
+    return data_dir
+
+
+@pytest.fixture(scope="module")
+def encoded(request):
+    """
+    (X, y) from prepare_common_features over synthetic cleaned years, with
+    the test module's COMMON_FEATURES.
+    """
+    years = getattr(request.module, "ENCODED_YEARS", ENCODED_YEARS)
+    n_rows = getattr(request.module, "ENCODED_ROWS", ENCODED_ROWS)
+    df = pd.concat(
+        [make_cleaned_brfss(year, n_rows) for year in years], ignore_index=True
+    )
+    df_common = prepare_common_features(df, request.module.COMMON_FEATURES)
+    y = df_common.pop("diabetes")
+    return df_common, y
@@ -0,0 +1,167 @@
+# tests/test_backtest.py
+
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import brfss_diabetes.backtest as backtest_module
+from brfss_diabetes.backtest import (
+    backtest,
+    encode_year,
+    make_windows,
+    threshold_stability,
+)
+from brfss_diabetes.incremental import encode_chunk
+
+YEARS = [2019, 2020, 2021, 2022]
+COMMON_FEATURES = ["age", "sex", "educa", "bmi", "smoke_100"]
+
+
+@pytest.fixture(scope="module")
+def report(cleaned_dir):
+    return backtest(YEARS, COMMON_FEATURES, data_dir=cleaned_dir)
+
+
+# ------------------------------------------------------------------------------
+# testing make_windows
+# ------------------------------------------------------------------------------
+
+
+def test_make_windows_expanding_and_rolling():
+    assert make_windows(YEARS, "expanding", train_size=2) == [
+        ([2019, 2020], 2021),
+        ([2019, 2020, 2021], 2022),
+    ]
+    assert make_windows([2022, 2019, 2021, 2020], "rolling", train_size=2) == [
+        ([2019, 2020], 2021),
+        ([2020, 2021], 2022),
+    ]
+
+
+def test_make_windows_raises_on_bad_mode():
+    with pytest.raises(ValueError, match="`mode` must be"):
+        make_windows(YEARS, mode="random")
+
+
+# ------------------------------------------------------------------------------
+# testing encode_year
+# ------------------------------------------------------------------------------
+
+
+def test_encode_year_matches_encode_chunk_and_is_cached(cleaned_dir, tmp_path):
+    entry = encode_year(2020, COMMON_FEATURES, cleaned_dir, tmp_path, chunksize=500)
+
+    df = pd.read_csv(cleaned_dir / "brfss_cleaned_2020.csv")
+    X, y, names, _ = encode_chunk(df, COMMON_FEATURES)
+    assert entry["feature_names"] == names
+    np.testing.assert_array_equal(np.load(entry["X"]), X)
+    np.testing.assert_array_equal(np.load(entry["y"]), y)
+
+    with patch.object(backtest_module, "iter_csv_chunks", side_effect=AssertionError):
+        assert encode_year(2020, COMMON_FEATURES, cleaned_dir, tmp_path) == entry
+
+
+def test_encode_year_key_depends_on_features(cleaned_dir, tmp_path):
+    first = encode_year(2020, COMMON_FEATURES, cleaned_dir, tmp_path)
+    second = encode_year(2020, ["age", "bmi"], cleaned_dir, tmp_path)
+    assert first["X"].parent != second["X"].parent
+    assert second["feature_names"] == ["age", "bmi"]
+
+
+# ------------------------------------------------------------------------------
+# testing backtest and threshold_stability
+# ------------------------------------------------------------------------------
+
+
+def test_backtest_reports_every_window_and_model(report):
+    assert len(report) == 3 * 2
+    assert report["test_year"].tolist() == [2020, 2020, 2021, 2021, 2022, 2022]
+    assert report["model"].tolist() == ["logistic", "xgboost"] * 3
+    assert report.loc[4, "train_years"] == [2019, 2020, 2021]
+    assert report["auc"].between(0.6, 1.0).all()
+    assert (report["test_f2"] >= report["f2"] - 1e-12).all()
+
+
+def test_backtest_parallel_matches_serial(cleaned_dir, report, tmp_path, monkeypatch):
+    # A budget of 2 cores, so the pool runs even on a single-core machine
+    monkeypatch.setenv("BRFSS_CPU_BUDGET", "2")
+    parallel = backtest(
+        YEARS, COMMON_FEATURES, data_dir=cleaned_dir, n_jobs=2, cache_dir=tmp_path
+    )
+    pd.testing.assert_frame_equal(parallel, report)
+
+
+def test_thresholds_are_tuned_on_held_out_training_rows(cleaned_dir):
+    import brfss_diabetes.evaluation as evaluation
+
+    with patch.object(
+        evaluation, "find_optimal_threshold", wraps=evaluation.find_optimal_threshold
+    ) as tuned:
+        row = backtest(
+            YEARS[:2], COMMON_FEATURES, cleaned_dir, models=("xgboost",)
+        ).iloc[0]
+
+    # Tuned on the validation slice (then on the test year), not on the
+    # rows the model was fitted on
+    y_tuned = tuned.call_args_list[0].args[0]
+    assert len(y_tuned) == row["n_valid"]
+    assert row["n_valid"] == pytest.approx(
+        backtest_module.VALID_FRACTION * (row["n_train"] + row["n_valid"]), abs=1
+    )
+    assert len(tuned.call_args_list[1].args[0]) == row["n_test"]
+
+
+def test_backtest_reuses_encoded_years(cleaned_dir, tmp_path):
+    backtest(
+        YEARS[:3],
+        COMMON_FEATURES,
+        cleaned_dir,
+        models=("logistic",),
+        cache_dir=tmp_path,
+    )
+    with patch.object(backtest_module, "iter_csv_chunks", side_effect=AssertionError):
+        rolling = backtest(
+            YEARS[:3],
+            COMMON_FEATURES,
+            cleaned_dir,
+            mode="rolling",
+            models=("logistic",),
+            cache_dir=tmp_path,
+        )
+    assert rolling["train_years"].tolist() == [[2019], [2020]]
+
+
+def test_backtest_with_survey_weights(cleaned_dir):
+    weighted = backtest(
+        YEARS[:2],
+        COMMON_FEATURES,
+        cleaned_dir,
+        models=("logistic",),
+        weight_col="survey_weight",
+    )
+    assert weighted["auc"].between(0.6, 1.0).all()
+
+
+def test_backtest_raises_on_unknown_model(cleaned_dir):
+    with pytest.raises(ValueError, match="Unknown models"):
+        backtest(YEARS, COMMON_FEATURES, cleaned_dir, models=("forest",))
+
+
+def test_xgboost_raises_without_positive_training_weight():
+    y = np.array([0, 0, 1, 1])
+    w = np.array([1.0, 2.0, 0.0, 0.0])
+    with pytest.raises(ValueError, match="no positive"):
+        backtest_module._xgboost(seed=0, y=y, w=w, threads=1)
+
+
+def test_threshold_stability_summarizes_per_model(report):
+    summary = threshold_stability(report)
+    assert summary["model"].tolist() == ["logistic", "xgboost"]
+    assert (summary["windows"] == 3).all()
+    logistic = report[report["model"] == "logistic"]
+    assert summary.loc[0, "threshold_f2_range"] == pytest.approx(
+        logistic["threshold_f2"].max() - logistic["threshold_f2"].min()
+    )
+    assert (summary["f2_regret_mean"] >= 0).all()
@@ -0,0 +1,132 @@
+# tests/test_cascade.py
+
+import numpy as np
+import pytest
+from sklearn.linear_model import LogisticRegression
+from xgboost import XGBClassifier
+
+from brfss_diabetes.cascade import (
+    cascade_predict,
+    cascade_predict_proba,
+    cascade_report,
+    make_cascade,
+    tune_band,
+)
+from brfss_diabetes.evaluation import find_optimal_threshold
+from brfss_diabetes.inference import export_kernel
+
+N_FEATURES = 6
+
+
+def make_data(n, seed):
+    # A linear signal the logistic model catches plus an interaction it misses
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, N_FEATURES)).astype(np.float32)
+    z = 2 * X[:, 0] + X[:, 1] - 3 + 4 * (X[:, 2] * X[:, 3] > 0.5)
+    return X, (rng.random(n) < 1 / (1 + np.exp(-z))).astype(int)
+
+
+@pytest.fixture(scope="module")
+def fitted():
+    X_train, y_train = make_data(20_000, 0)
+    X_valid, y_valid = make_data(20_000, 1)
+    logistic = LogisticRegression(max_iter=1000).fit(X_train, y_train)
+    xgb = XGBClassifier(n_estimators=100, max_depth=4, random_state=0)
+    xgb.fit(X_train, y_train)
+
+    p_log = logistic.predict_proba(X_valid)[:, 1]
+    p_xgb = xgb.predict_proba(X_valid)[:, 1]
+    t_log = find_optimal_threshold(y_valid, p_log, 2.0)
+    t_xgb = find_optimal_threshold(y_valid, p_xgb, 2.0)
+    kernel = export_kernel(logistic, [f"x{i}" for i in range(N_FEATURES)], t_log)
+    return {
+        "kernel": kernel,
+        "xgb": xgb,
+        "valid": (X_valid, y_valid, p_log, p_xgb),
+        "thresholds": (t_log, t_xgb),
+    }
+
+
+# ------------------------------------------------------------------------------
+# testing tune_band
+# ------------------------------------------------------------------------------
+
+
+def test_tune_band_keeps_f2_within_tolerance(fitted):
+    _, y, p_log, p_xgb = fitted["valid"]
+    band = tune_band(y, p_log, p_xgb, *fitted["thresholds"], tolerance=0.005)
+
+    assert band["low"] <= fitted["thresholds"][0] <= band["high"]
+    assert 0 < band["escalated"] < 0.8
+    assert band["f_beta"] >= band["f_beta_model"] - 0.005
+
+
+def test_tune_band_tighter_tolerance_escalates_more(fitted):
+    _, y, p_log, p_xgb = fitted["valid"]
+    loose = tune_band(y, p_log, p_xgb, *fitted["thresholds"], tolerance=0.02)
+    tight = tune_band(y, p_log, p_xgb, *fitted["thresholds"], tolerance=0.0)
+    assert tight["escalated"] >= loose["escalated"]
+    assert tight["f_beta"] >= tight["f_beta_model"]
+
+
+def test_tune_band_raises_on_misaligned_inputs():
+    with pytest.raises(ValueError, match="aligned"):
+        tune_band([0, 1], [0.1, 0.9], [0.2], 0.5, 0.5)
+
+
+# ------------------------------------------------------------------------------
+# testing make_cascade, cascade_predict_proba and cascade_predict
+# ------------------------------------------------------------------------------
+
+
+def test_full_band_equals_second_stage(fitted):
+    X, _, _, _ = fitted["valid"]
+    t_xgb = fitted["thresholds"][1]
+    cascade = make_cascade(fitted["kernel"], fitted["xgb"], 0.0, 1.0, t_xgb)
+
+    probs, escalated = cascade_predict_proba(cascade, X)
+    assert escalated.all()
+    np.testing.assert_allclose(probs, fitted["xgb"].predict_proba(X)[:, 1])
+    np.testing.assert_array_equal(cascade_predict(cascade, X), probs >= t_xgb)
+
+
+def test_band_rows_only_are_escalated(fitted):
+    X, _, p_log, _ = fitted["valid"]
+    cascade = make_cascade(fitted["kernel"], fitted["xgb"], 0.2, 0.4, 0.3)
+
+    probs, escalated = cascade_predict_proba(cascade, X)
+    np.testing.assert_array_equal(escalated, (p_log >= 0.2) & (p_log <= 0.4))
+    np.testing.assert_allclose(probs[~escalated], p_log[~escalated], atol=1e-5)
+
+    labels = cascade_predict(cascade, X)
+    assert (labels[~escalated & (p_log < 0.2)] == 0).all()
+    assert (labels[~escalated & (p_log > 0.4)] == 1).all()
+
+
+def test_make_cascade_raises_on_bad_band(fitted):
+    with pytest.raises(ValueError, match="low <= high"):
+        make_cascade(fitted["kernel"], fitted["xgb"], 0.6, 0.4, 0.5)
+
+
+# ------------------------------------------------------------------------------
+# testing cascade_report
+# ------------------------------------------------------------------------------
+
+
+def test_cascade_report(fitted):
+    _, y, p_log, p_xgb = fitted["valid"]
+    band = tune_band(y, p_log, p_xgb, *fitted["thresholds"])
+    cascade = make_cascade(
+        fitted["kernel"],
+        fitted["xgb"],
+        band["low"],
+        band["high"],
+        fitted["thresholds"][1],
+    )
+    X_test, y_test = make_data(20_000, 2)
+    report = cascade_report(cascade, X_test, y_test)
+
+    assert report["rows"] == 20_000
+    assert 0 < report["escalated"] < 1
+    assert report["throughput_gain"] > 0
+    assert report["f_beta"] >= report["f_beta_model"] - 0.03
@@ -0,0 +1,157 @@
+# tests/test_catalog.py
+
+import os
+import shutil
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+import brfss_diabetes.catalog as catalog_module
+import brfss_diabetes.io as io_module
+from brfss_diabetes.catalog import (
+    CATALOG_FILE,
+    availability_table,
+    build_catalog,
+    load_catalog,
+    years_with_features,
+)
+from brfss_diabetes.io import load_all_years
+
+YEARS = [2019, 2020, 2021, 2022, 2023]
+CLEANED_ROWS = 1_000
+
+
+@pytest.fixture
+def cleaned_dir(cleaned_dir, tmp_path):
+    # Tests rewrite files and catalogs, so each gets its own copy
+    shutil.copytree(cleaned_dir, tmp_path, dirs_exist_ok=True)
+    return tmp_path
+
+
+# ------------------------------------------------------------------------------
+# testing build_catalog
+# ------------------------------------------------------------------------------
+
+
+def test_build_catalog_describes_each_file(cleaned_dir):
+    catalog = build_catalog(YEARS, cleaned_dir, chunksize=300)
+
+    for year in YEARS:
+        df = pd.read_csv(cleaned_dir / f"brfss_cleaned_{year}.csv")
+        entry = catalog["files"][str(year)]
+        assert entry["rows"] == len(df)
+        assert list(entry["columns"]) == list(df.columns)
+        for col in df.columns:
+            assert entry["columns"][col]["non_null"] == df[col].notna().sum()
+            assert entry["columns"][col]["dtype"] == str(df[col].dtype)
+
+
+def test_build_catalog_reuses_unchanged_files(cleaned_dir):
+    path = cleaned_dir / CATALOG_FILE
+    first = build_catalog(YEARS, cleaned_dir, path)
+    assert load_catalog(path) == first
+
+    with patch.object(catalog_module, "file_hash", side_effect=AssertionError):
+        assert build_catalog(YEARS, cleaned_dir, path) == first
+
+
+def test_build_catalog_refreshes_changed_file(cleaned_dir):
+    path = cleaned_dir / CATALOG_FILE
+    build_catalog(YEARS, cleaned_dir, path)
+
+    csv = cleaned_dir / "brfss_cleaned_2020.csv"
+    pd.read_csv(csv).head(10).to_csv(csv, index=False)
+    catalog = build_catalog(YEARS, cleaned_dir, path)
+    assert catalog["files"]["2020"]["rows"] == 10
+    assert load_catalog(path)["files"]["2020"]["rows"] == 10
+
+
+def test_build_catalog_only_rehashes_touched_file(cleaned_dir):
+    path = cleaned_dir / CATALOG_FILE
+    first = build_catalog(YEARS, cleaned_dir, path)
+
+    csv = cleaned_dir / "brfss_cleaned_2021.csv"
+    os.utime(csv, ns=(0, 0))
+    with patch.object(
+        catalog_module, "_describe", side_effect=AssertionError
+    ), patch.object(
+        catalog_module, "file_hash", wraps=catalog_module.file_hash
+    ) as hashed:
+        catalog = build_catalog(YEARS, cleaned_dir, path)
+    assert hashed.call_count == 1
+    assert catalog["files"]["2021"]["columns"] == first["files"]["2021"]["columns"]
+
+
+def test_build_catalog_raises_on_bad_path(cleaned_dir):
+    with pytest.raises(ValueError, match="`catalog_path` must be a pathlib.Path"):
+        build_catalog(YEARS, cleaned_dir, "catalog.json")
+
+
+# ------------------------------------------------------------------------------
+# testing years_with_features and availability_table
+# ------------------------------------------------------------------------------
+
+
+def test_years_with_features(cleaned_dir):
+    catalog = build_catalog(YEARS, cleaned_dir)
+    assert years_with_features(catalog, ["age", "bmi"]) == YEARS
+    assert years_with_features(catalog, ["fruit_low"]) == [2019, 2021]
+    assert years_with_features(catalog, ["snap_used"], [2019, 2020]) == [2019]
+    assert years_with_features(catalog, ["not_a_column"]) == []
+
+
+def test_availability_table(cleaned_dir):
+    table = availability_table(build_catalog(YEARS, cleaned_dir))
+    assert list(table.columns) == YEARS
+    assert table.loc["year"].eq(1.0).all()
+    assert table.loc["age"].between(0.5, 1.0).all()
+    assert table.loc["fruit_low"].isna().tolist() == [False, True, False, True, True]
+
+
+# ------------------------------------------------------------------------------
+# testing load_all_years(features=...)
+# ------------------------------------------------------------------------------
+
+
+def test_load_all_years_features_opens_only_matching_years(cleaned_dir):
+    build_catalog(YEARS, cleaned_dir, cleaned_dir / CATALOG_FILE)
+
+    with patch.object(
+        io_module, "get_csv", wraps=io_module.get_csv
+    ) as get_csv, patch.object(catalog_module, "file_hash", side_effect=AssertionError):
+        df = load_all_years(
+            YEARS,
+            data_dir=cleaned_dir,
+            features=["age", "fruit_low"],
+            catalog=cleaned_dir / CATALOG_FILE,
+        )
+
+    assert [c.args[0] for c in get_csv.call_args_list] == [2019, 2021]
+    assert list(df.columns) == ["year", "age", "fruit_low", "diabetes"]
+    assert sorted(df["year"].unique()) == [2019, 2021]
+
+    expected = load_all_years([2019, 2021], data_dir=cleaned_dir)
+    pd.testing.assert_frame_equal(df, expected[df.columns])
+
+
+def test_load_all_years_features_reads_headers_without_catalog(cleaned_dir):
+    with patch.object(catalog_module, "file_hash", side_effect=AssertionError):
+        df = load_all_years([2020, 2022], data_dir=cleaned_dir, features=["snap_used"])
+    assert sorted(df["year"].unique()) == [2022]
+    assert list(df.columns) == ["year", "snap_used", "diabetes"]
+    assert not (cleaned_dir / CATALOG_FILE).exists()
+
+
+@pytest.mark.parametrize("with_catalog", [False, True])
+def test_load_all_years_features_keeps_year_order(cleaned_dir, with_catalog):
+    catalog = build_catalog(YEARS, cleaned_dir) if with_catalog else None
+    df = load_all_years(
+        [2023, 2019, 2021], data_dir=cleaned_dir, features=["age"], catalog=catalog
+    )
+    assert df["year"].unique().tolist() == [2023, 2019, 2021]
+
+
+def test_load_all_years_features_raises_when_no_year_matches(cleaned_dir):
+    with pytest.raises(ValueError, match="No year in"):
+        load_all_years([2020], data_dir=cleaned_dir, features=["fruit_low"])
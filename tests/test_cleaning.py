@@ -3,8 +3,11 @@ import pytest
 from brfss_diabetes.cleaning import (
     clean_common_fields,
     clean_year_specific,
+    clean_survey_design,
     clean_brfss,
+    to_cleaned_layout,
 )
+from brfss_diabetes.schema import SchemaError
 
 # -------------------------------------------------------------------------------
 # Test clean_common_fields
@@ -86,6 +89,35 @@ def test_clean_year_specific_2023_fields():
     )
 
 
+# -------------------------------------------------------------------------------
+# Test clean_survey_design
+# -------------------------------------------------------------------------------
+
+
+def test_clean_survey_design_coerces_and_drops_bad_weights():
+    df = pd.DataFrame(
+        {
+            "_LLCPWT": [512.3, 0.0, None],
+            "_STSTR": ["11011", "11012", "11011"],
+            "_PSU": [2019000001, 2019000002, 2019000003],
+        }
+    )
+    result = clean_survey_design(df.copy())
+    assert result["_LLCPWT"].iloc[0] == pytest.approx(512.3)
+    assert result["_LLCPWT"].isna().sum() == 2
+    assert result["_STSTR"].iloc[1] == 11012
+
+
+def test_clean_survey_design_ignores_absent_columns():
+    df = pd.DataFrame({"DIABETE4": [1]})
+    assert list(clean_survey_design(df).columns) == ["DIABETE4"]
+
+
+def test_clean_survey_design_raises_on_non_dataframe():
+    with pytest.raises(ValueError, match="must be a pandas DataFrame"):
+        clean_survey_design("not_a_df")
+
+
 # -------------------------------------------------------------------------------
 # Test clean_brfss
 # -------------------------------------------------------------------------------
@@ -117,6 +149,75 @@ def test_clean_brfss_end_to_end():
     assert isinstance(result["SEX"].dtype, pd.CategoricalDtype)
 
 
+def test_clean_brfss_carries_survey_weights():
+    df = pd.DataFrame(
+        {
+            "DIABETE4": [1, 3],
+            "_AGEG5YR": [1, 2],
+            "SEXVAR": [1, 2],
+            "EDUCA": [3, 5],
+            "_BMI5": [2200, 2500],
+            "_BMI5CAT": [2, 3],
+            "SMOKE100": [1, 2],
+            "EXERANY2": [1, 2],
+            "DRNKANY6": [1, 2],
+            "FOODSTMP": [1, 2],
+            "SDHFOOD1": [1, 5],
+            "_LLCPWT": [250.5, 1020.0],
+            "_STSTR": [11011, 11012],
+            "_PSU": [1, 2],
+        }
+    )
+    result = clean_brfss(df, 2023)
+    assert result["_LLCPWT"].tolist() == [250.5, 1020.0]
+    assert "_STSTR" in result and "_PSU" in result
+
+
+def test_clean_brfss_validates_codes_once_at_entry():
+    df = pd.DataFrame(
+        {
+            "DIABETE4": [1, 3, 5],
+            "_AGEG5YR": [1, 2, 20],
+            "SEXVAR": [1, 2, 1],
+            "EDUCA": [3, 5, 9],
+            "_BMI5": [2200, 2500, 1800],
+            "_BMI5CAT": [2, 3, 1],
+            "SMOKE100": [1, 2, 7],
+            "EXERANY2": [1, 2, 9],
+            "DRNKANY5": [1, 2, 9],
+        }
+    )
+    with pytest.raises(SchemaError) as excinfo:
+        clean_brfss(df.copy(), 2020)
+    assert excinfo.value.report["column"].tolist() == ["DIABETE4", "_AGEG5YR"]
+
+    # Unvalidated, unknown codes fall through to missing as before
+    result = clean_brfss(df.copy(), 2020, validate=False)
+    assert result["DIABETE4"].isna().tolist() == [False, False, True]
+    assert result["AGE"].isna().tolist() == [False, False, True]
+
+
+def test_clean_brfss_cleans_years_without_a_schema():
+    # A new survey year only has its common columns validated
+    df = pd.DataFrame(
+        {
+            "DIABETE4": [1, 3],
+            "_AGEG5YR": [1, 2],
+            "SEXVAR": [1, 2],
+            "EDUCA": [3, 5],
+            "_BMI5": [2200, 2500],
+            "_BMI5CAT": [2, 3],
+            "SMOKE100": [1, 2],
+            "EXERANY2": [1, 2],
+            "DRNKANY6": [1, 2],
+        }
+    )
+    with pytest.warns(UserWarning, match="No schema for year 2030"):
+        result = clean_brfss(df, 2030)
+    assert result["drink_any"].tolist() == ["Yes", "No"]
+    assert (result["year"] == 2030).all()
+
+
 def test_clean_brfss_raises_on_not_dataframe():
     with pytest.raises(ValueError, match="must be a pandas DataFrame"):
         clean_brfss("not_a_df", year=2023)
@@ -141,3 +242,28 @@ def test_clean_brfss_raises_on_year_not_an_int():
     )
     with pytest.raises(ValueError, match="must be an int"):
         clean_brfss(df, year="2023")
+
+
+# -------------------------------------------------------------------------------
+# Test to_cleaned_layout
+# -------------------------------------------------------------------------------
+
+
+def test_to_cleaned_layout_renames_orders_and_drops_missing_target():
+    df = pd.DataFrame(
+        {
+            "DIABETE4": ["Yes", None, "No"],
+            "AGE": [22.0, 27.0, 32.0],
+            "year": [2020, 2020, 2020],
+            "_LLCPWT": [10.0, 20.0, 30.0],
+            "SEXVAR": [1, 2, 1],
+        }
+    )
+    result = to_cleaned_layout(df)
+    assert list(result.columns) == ["year", "age", "survey_weight", "diabetes"]
+    assert len(result) == 2
+
+
+def test_to_cleaned_layout_raises_on_non_dataframe():
+    with pytest.raises(ValueError, match="must be a pandas DataFrame"):
+        to_cleaned_layout("not_a_df")
@@ -0,0 +1,122 @@
+# tests/test_compression.py
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LogisticRegression
+
+from brfss_diabetes.compression import (
+    compress_patterns,
+    expand_patterns,
+    compression_report,
+)
+
+
+def make_df_common(n=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(
+        {
+            "age": rng.choice([22, 47, 72], size=n).astype(float),
+            "bmi": rng.choice([21.04, 21.01, 27.5, 33.33], size=n),
+            "smoke_100": rng.integers(0, 2, size=n),
+            "sex_Male": rng.integers(0, 2, size=n).astype(bool),
+        }
+    )
+    logit = -4 + 0.04 * df["age"] + 0.05 * df["bmi"] + 0.5 * df["smoke_100"]
+    df["diabetes"] = (rng.random(n) < 1 / (1 + np.exp(-logit))).astype(int)
+    return df
+
+
+# ------------------------------------------------------------------------------
+# testing def compress_patterns(df_common, target="diabetes", bmi_decimals=None)
+# ------------------------------------------------------------------------------
+
+
+def test_compress_patterns_counts_sum_to_rows():
+    df = make_df_common()
+    patterns = compress_patterns(df)
+
+    assert len(patterns) <= 3 * 4 * 2 * 2
+    assert patterns["n_pos"].sum() == df["diabetes"].sum()
+    assert (patterns["n_pos"] + patterns["n_neg"]).sum() == len(df)
+    assert not patterns.drop(columns=["n_pos", "n_neg"]).duplicated().any()
+
+
+def test_compress_patterns_bmi_rounding_shrinks_patterns():
+    df = make_df_common()
+    assert len(compress_patterns(df, bmi_decimals=1)) < len(compress_patterns(df))
+
+
+def test_compress_patterns_weighted_totals():
+    df = make_df_common().assign(survey_weight=2.5)
+    patterns = compress_patterns(df, weight_col="survey_weight")
+
+    assert "survey_weight" not in patterns.columns
+    assert patterns["n_pos"].sum() == pytest.approx(2.5 * df["diabetes"].sum())
+    assert (patterns["n_pos"] + patterns["n_neg"]).sum() == pytest.approx(2.5 * len(df))
+
+
+def test_compress_patterns_raises_on_missing_weight_column():
+    with pytest.raises(ValueError, match="Missing survey weight column"):
+        compress_patterns(make_df_common(), weight_col="survey_weight")
+
+
+def test_compress_patterns_raises_on_missing_target():
+    with pytest.raises(ValueError, match="Missing required target column"):
+        compress_patterns(pd.DataFrame({"age": [1]}))
+
+
+def test_compress_patterns_raises_on_bad_bmi_decimals():
+    with pytest.raises(ValueError, match="`bmi_decimals` must be"):
+        compress_patterns(make_df_common(), bmi_decimals=-1)
+
+
+def test_compress_patterns_raises_on_non_dataframe():
+    with pytest.raises(ValueError, match="must be a pandas DataFrame"):
+        compress_patterns("not_a_df")
+
+
+# ------------------------------------------------------------------------------
+# testing def expand_patterns(patterns)
+# ------------------------------------------------------------------------------
+
+
+def test_expand_patterns_gives_identical_logistic_coefficients():
+    df = make_df_common()
+    X_full = df.drop(columns=["diabetes"])
+    y_full = df["diabetes"]
+    X, y, w = expand_patterns(compress_patterns(df))
+
+    assert w.sum() == len(df)
+    assert list(X.columns) == list(X_full.columns)
+
+    full = LogisticRegression(max_iter=5000, tol=1e-10).fit(X_full, y_full)
+    weighted = LogisticRegression(max_iter=5000, tol=1e-10).fit(X, y, sample_weight=w)
+    np.testing.assert_allclose(weighted.coef_, full.coef_, rtol=1e-4, atol=1e-6)
+    np.testing.assert_allclose(weighted.intercept_, full.intercept_, rtol=1e-4)
+
+
+def test_expand_patterns_raises_on_missing_counts():
+    with pytest.raises(ValueError, match="missing count columns"):
+        expand_patterns(pd.DataFrame({"age": [1], "n_pos": [1]}))
+
+
+# ------------------------------------------------------------------------------
+# testing def compression_report(n_rows, patterns)
+# ------------------------------------------------------------------------------
+
+
+def test_compression_report(capfd):
+    df = make_df_common()
+    patterns = compress_patterns(df)
+    report = compression_report(len(df), patterns)
+
+    assert report["rows"] == len(df)
+    assert report["patterns"] == len(patterns)
+    assert report["compression_ratio"] > 1
+    assert "patterns" in capfd.readouterr().out
+
+
+def test_compression_report_raises_on_bad_n_rows():
+    with pytest.raises(ValueError, match="`n_rows` must be a non-negative int"):
+        compression_report(-1, pd.DataFrame({"n_pos": [], "n_neg": []}))
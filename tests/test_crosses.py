@@ -0,0 +1,156 @@
+# tests/test_crosses.py
+
+import pickle
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+from scipy import sparse
+
+from brfss_diabetes.crosses import hash_crosses, make_crosses
+from brfss_diabetes.preprocessing import prepare_common_features
+from brfss_diabetes.synthetic import make_cleaned_brfss
+
+COMMON_FEATURES = ["age", "sex", "educa", "bmi", "bmi_cat", "smoke_100", "exercise_any"]
+
+
+@pytest.fixture(scope="module")
+def cleaned():
+    return make_cleaned_brfss(2022, 3_000)
+
+
+@pytest.fixture(scope="module")
+def df_common(cleaned):
+    return prepare_common_features(cleaned, COMMON_FEATURES)
+
+
+@pytest.fixture(scope="module")
+def rows(cleaned, df_common):
+    # The cleaned rows behind the encoded features
+    return cleaned.loc[df_common.index, COMMON_FEATURES]
+
+
+# ------------------------------------------------------------------------------
+# testing make_crosses
+# ------------------------------------------------------------------------------
+
+
+def test_make_crosses_pairs_and_triples():
+    crosses = make_crosses(COMMON_FEATURES)
+    assert len(crosses) == 21 + 35
+    assert crosses[0] == ("age", "sex")
+    assert ("age", "bmi") in crosses
+    assert ("sex", "educa", "bmi_cat") in crosses
+
+
+def test_make_crosses_uses_only_the_given_features():
+    # e.g. 2019 has snap_used and fruit_low, 2022 has food_insecurity
+    assert make_crosses(["snap_used", "survey_weight", "food_insecurity"]) == [
+        ("snap_used", "food_insecurity")
+    ]
+    assert make_crosses(["snap_used", "fruit_low"], degrees=(2,)) == [
+        ("snap_used", "fruit_low")
+    ]
+
+
+def test_make_crosses_raises_on_bad_degrees():
+    with pytest.raises(ValueError, match="`degrees` must be"):
+        make_crosses(COMMON_FEATURES, degrees=(1,))
+
+
+# ------------------------------------------------------------------------------
+# testing hash_crosses
+# ------------------------------------------------------------------------------
+
+
+def test_hash_crosses_one_entry_per_row_and_cross(rows):
+    crosses = make_crosses(COMMON_FEATURES)
+    X = hash_crosses(rows, crosses, n_features=2**12)
+
+    assert sparse.isspmatrix_csr(X)
+    assert X.shape == (len(rows), 2**12)
+    np.testing.assert_array_equal(np.asarray(X.sum(axis=1)).ravel(), len(crosses))
+    assert X.has_canonical_format
+
+
+def test_collisions_are_summed(rows):
+    crosses = make_crosses(COMMON_FEATURES)
+    X = hash_crosses(rows, crosses, n_features=7)
+    assert X.max() > 1
+    np.testing.assert_array_equal(np.asarray(X.sum(axis=1)).ravel(), len(crosses))
+    assert X.has_canonical_format
+
+
+def test_cross_columns_follow_the_level_combination(rows):
+    X = hash_crosses(rows, [("sex", "educa")], n_features=2**20)
+    columns = X.indices
+
+    groups = rows.groupby(["sex", "educa"], observed=True).indices
+    # One column per combination, and different combinations do not collide
+    seen = {tuple(np.unique(columns[idx])) for idx in groups.values()}
+    assert all(len(cols) == 1 for cols in seen)
+    assert len(seen) == len(groups)
+
+
+def test_cross_columns_do_not_depend_on_other_rows_or_order(rows):
+    crosses = [("age", "bmi"), ("bmi_cat", "sex", "smoke_100")]
+    X = hash_crosses(rows, crosses)
+    head = hash_crosses(rows.iloc[:10], [c[::-1] for c in crosses])
+    np.testing.assert_array_equal(head.toarray(), X[:10].toarray())
+
+
+def test_hashing_is_stable_across_processes(rows):
+    crosses = [("age", "bmi"), ("educa", "exercise_any", "sex")]
+    X = hash_crosses(rows.iloc[:5], crosses, n_features=2**16)
+    code = (
+        "import pickle, sys\n"
+        "from brfss_diabetes.crosses import hash_crosses\n"
+        "df = pickle.loads(sys.stdin.buffer.read())\n"
+        f"X = hash_crosses(df, {crosses!r}, n_features=2**16)\n"
+        "print(*X.indices)\n"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        input=pickle.dumps(rows.iloc[:5]),
+        capture_output=True,
+        check=True,
+    ).stdout.split()
+    assert [int(i) for i in out] == X.indices.tolist()
+
+
+def test_cells_match_across_years_with_missing_levels():
+    # 2022 has every food_insecurity answer, the 2023 rows have no "Always"
+    # and only women, so get_dummies would drop a different first level
+    full = make_cleaned_brfss(2022, 3_000).dropna(subset=["food_insecurity", "sex"])
+    part = make_cleaned_brfss(2023, 3_000).dropna(subset=["food_insecurity", "sex"])
+    part = part[(part["food_insecurity"] != "Always") & (part["sex"] == "Female")]
+    cross = [("food_insecurity", "sex")]
+
+    X_full = hash_crosses(full, cross)
+    X_part = hash_crosses(part, cross)
+
+    def cell(df):
+        # First (Never, Female) row
+        rows = (df["food_insecurity"] == "Never") & (df["sex"] == "Female")
+        return np.flatnonzero(rows)[0]
+
+    assert X_full[cell(full)].indices[0] == X_part[cell(part)].indices[0]
+
+
+def test_encoded_yes_no_columns_hash_like_cleaned_ones(rows, df_common):
+    crosses = [("age", "smoke_100", "exercise_any")]
+    np.testing.assert_array_equal(
+        hash_crosses(df_common, crosses).indices, hash_crosses(rows, crosses).indices
+    )
+
+
+def test_hash_crosses_raises_on_uncrossable_features(rows, df_common):
+    with pytest.raises(ValueError, match="one-hot encoded"):
+        hash_crosses(df_common, [("age", "sex")])
+    with pytest.raises(ValueError, match="give it bin edges"):
+        hash_crosses(rows, [("age", "bmi")], bins={})
+    with pytest.raises(ValueError, match="not found"):
+        hash_crosses(rows, [("age", "food_insecurity")])
+    with pytest.raises(ValueError, match="tuples of 2"):
+        hash_crosses(rows, [("age",)])
@@ -0,0 +1,170 @@
+# tests/test_cube.py
+
+import os
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import brfss_diabetes.cube as cube_module
+from brfss_diabetes.cube import (
+    add_year,
+    build_cube,
+    load_cube,
+    marginal,
+    prevalence_table,
+)
+
+YEARS = [2019, 2020, 2021]
+CLEANED_ROWS = 3_000
+
+
+@pytest.fixture(scope="module")
+def df_all(cleaned_dir):
+    return pd.concat(
+        [pd.read_csv(cleaned_dir / f"brfss_cleaned_{year}.csv") for year in YEARS],
+        ignore_index=True,
+    )
+
+
+@pytest.fixture(scope="module")
+def cube(cleaned_dir):
+    return build_cube(YEARS, cleaned_dir, weight_col="survey_weight", chunksize=700)
+
+
+# ------------------------------------------------------------------------------
+# testing build_cube and add_year
+# ------------------------------------------------------------------------------
+
+
+def test_cube_matches_groupby(cube, df_all):
+    expected = df_all.groupby(["year", "sex", "diabetes"]).size().unstack()
+    counts = marginal(cube, ["year", "sex"])
+    np.testing.assert_array_equal(counts[:, :2, 0], expected["No"].unstack())
+    np.testing.assert_array_equal(counts[:, :2, 1], expected["Yes"].unstack())
+
+
+def test_cube_counts_every_row_including_missing(cube, df_all):
+    assert marginal(cube).sum() == len(df_all)
+    missing_bmi = marginal(cube, bmi_cat=None).sum()
+    assert missing_bmi == df_all["bmi_cat"].isna().sum() > 0
+
+
+def test_weighted_cube_sums_survey_weights(cube, df_all):
+    expected = df_all.groupby(["year", "diabetes"])["survey_weight"].sum().unstack()
+    np.testing.assert_allclose(
+        marginal(cube, ["year"], weighted=True), expected[["No", "Yes"]]
+    )
+
+
+def test_add_year_reads_only_that_year(cleaned_dir, tmp_path):
+    cube_path = tmp_path / "cube.npz"
+    partial = build_cube([2021, 2019], cleaned_dir, cube_path)
+    assert partial["labels"]["year"] == [2019, 2021]
+
+    read = []
+    original = cube_module.iter_csv_chunks
+
+    def tracking(year, **kwargs):
+        read.append(year)
+        return original(year, **kwargs)
+
+    with patch.object(cube_module, "iter_csv_chunks", side_effect=tracking):
+        full = build_cube(YEARS, cleaned_dir, cube_path)
+
+    assert read == [2020]
+    assert full["labels"]["year"] == YEARS
+    np.testing.assert_array_equal(
+        full["counts"], build_cube(YEARS, cleaned_dir)["counts"]
+    )
+
+
+def test_build_cube_only_hashes_files_whose_stamp_changed(cleaned_dir, tmp_path):
+    cube_path = tmp_path / "cube.npz"
+    first = build_cube(YEARS, cleaned_dir, cube_path)
+
+    with patch.object(cube_module, "file_hash", side_effect=AssertionError):
+        again = build_cube(YEARS, cleaned_dir, cube_path)
+    np.testing.assert_array_equal(again["counts"], first["counts"])
+
+    # Touched but unchanged: hashed once, not read
+    path = cleaned_dir / "brfss_cleaned_2020.csv"
+    os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 10**9))
+    with patch.object(
+        cube_module, "file_hash", wraps=cube_module.file_hash
+    ) as hashed, patch.object(
+        cube_module, "iter_csv_chunks", side_effect=AssertionError
+    ):
+        build_cube(YEARS, cleaned_dir, cube_path)
+    assert [c.args[0].name for c in hashed.call_args_list] == [path.name]
+
+
+def test_add_year_replaces_an_existing_slice(cube, cleaned_dir):
+    again = add_year(cube, 2020, cleaned_dir)
+    assert again["labels"]["year"] == YEARS
+    np.testing.assert_array_equal(again["counts"], cube["counts"])
+
+
+def test_build_cube_raises_on_bad_cube_path(cleaned_dir):
+    with pytest.raises(ValueError, match="`cube_path` must be"):
+        build_cube(YEARS, cleaned_dir, cube_path="cube.npz")
+
+
+# ------------------------------------------------------------------------------
+# testing marginal and prevalence_table
+# ------------------------------------------------------------------------------
+
+
+def test_marginal_filters_and_orders_axes(cube, df_all):
+    counts = marginal(cube, ["sex", "year"], age=[62, 67], educa="HS or GED")
+    assert counts.shape == (3, 3, 2)
+
+    rows = df_all[df_all["age"].isin([62, 67]) & (df_all["educa"] == "HS or GED")]
+    female = rows[rows["sex"] == "Female"]
+    expected = pd.crosstab(female["year"], female["diabetes"])
+    np.testing.assert_array_equal(counts[0], expected[["No", "Yes"]])
+
+
+def test_prevalence_table_matches_target_rate_layout(cube, df_all):
+    table = prevalence_table(cube)
+    assert table.index.name == "year"
+    assert table.columns.tolist() == ["rows", "positives", "rate"]
+    assert table.loc[2020, "rows"] == (df_all["year"] == 2020).sum()
+    assert table.loc[2020, "rate"] == pytest.approx(
+        (df_all.loc[df_all["year"] == 2020, "diabetes"] == "Yes").mean()
+    )
+
+    by_sex = prevalence_table(cube, ["year", "sex"], sex=["Female", "Male"])
+    assert by_sex.index.names == ["year", "sex"]
+    assert len(by_sex) == len(YEARS) * 2
+
+
+def test_marginal_raises_on_unknown_axis_or_label(cube):
+    with pytest.raises(ValueError, match="Unknown axes"):
+        marginal(cube, ["diabetes"])
+    with pytest.raises(ValueError, match="Unknown sex labels"):
+        marginal(cube, sex="F")
+
+
+def test_weighted_query_needs_weight_col(cleaned_dir):
+    with pytest.raises(ValueError, match="without `weight_col`"):
+        marginal(build_cube([2019], cleaned_dir), weighted=True)
+
+
+# ------------------------------------------------------------------------------
+# testing save_cube and load_cube
+# ------------------------------------------------------------------------------
+
+
+def test_save_load_round_trip(cleaned_dir, tmp_path):
+    cube = build_cube(YEARS, cleaned_dir, tmp_path / "cube.npz", "survey_weight")
+    loaded = load_cube(tmp_path / "cube.npz")
+
+    assert loaded["labels"] == cube["labels"]
+    assert loaded["hashes"] == cube["hashes"]
+    np.testing.assert_array_equal(loaded["counts"], cube["counts"])
+    np.testing.assert_array_equal(loaded["weighted"], cube["weighted"])
+    np.testing.assert_array_equal(
+        marginal(loaded, ["year"], age=85), marginal(cube, ["year"], age=85)
+    )
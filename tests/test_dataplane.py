@@ -0,0 +1,126 @@
+# tests/test_dataplane.py
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+
+from brfss_diabetes.dataplane import (
+    attach,
+    detach,
+    publish,
+    publish_frame,
+    release,
+    shared_arrays,
+)
+from brfss_diabetes.preprocessing import prepare_common_features
+from brfss_diabetes.synthetic import make_cleaned_brfss
+
+COMMON_FEATURES = ["age", "sex", "educa", "bmi", "smoke_100"]
+
+
+def _column_sums(spec):
+    attached = attach(spec)
+    sums = attached["arrays"]["X"].sum(axis=0)
+    detach(attached)
+    return sums
+
+
+def _double_first_row(spec):
+    attached = attach(spec, writeable=True)
+    attached["arrays"]["X"][0] *= 2
+    detach(attached)
+
+
+# ------------------------------------------------------------------------------
+# testing publish, attach, detach and release
+# ------------------------------------------------------------------------------
+
+
+def test_attach_maps_published_arrays_read_only():
+    X = np.arange(12, dtype=np.float64).reshape(4, 3)
+    y = np.array([0, 1, 1, 0], dtype=np.int8)
+    plane = publish({"X": X, "y": y}, columns=["a", "b", "c"])
+    try:
+        attached = attach(plane["spec"])
+        np.testing.assert_array_equal(attached["arrays"]["X"], X)
+        np.testing.assert_array_equal(attached["arrays"]["y"], y)
+        assert attached["columns"] == ["a", "b", "c"]
+        with pytest.raises(ValueError, match="read-only"):
+            attached["arrays"]["X"][0, 0] = 1
+        detach(attached)
+    finally:
+        release(plane)
+
+
+def test_workers_share_memory_with_the_parent():
+    X = np.random.default_rng(0).random((1_000, 5))
+    with shared_arrays({"X": X}) as plane:
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            sums = list(pool.map(_column_sums, [plane["spec"]] * 2))
+            pool.submit(_double_first_row, plane["spec"]).result()
+
+        for row_sums in sums:
+            np.testing.assert_allclose(row_sums, X.sum(axis=0))
+
+        # The worker's write went to the shared block, not to a copy
+        attached = attach(plane["spec"])
+        np.testing.assert_array_equal(attached["arrays"]["X"][0], 2 * X[0])
+        np.testing.assert_array_equal(attached["arrays"]["X"][1:], X[1:])
+        detach(attached)
+
+
+def test_release_frees_the_blocks():
+    plane = publish({"X": np.ones((2, 2))})
+    spec = plane["spec"]
+    release(plane)
+    with pytest.raises(FileNotFoundError):
+        attach(spec)
+
+
+def test_shared_arrays_releases_on_error():
+    with pytest.raises(RuntimeError):
+        with shared_arrays({"X": np.ones(3)}) as plane:
+            spec = plane["spec"]
+            raise RuntimeError
+    with pytest.raises(FileNotFoundError):
+        attach(spec)
+
+
+def test_publish_raises_on_object_arrays():
+    with pytest.raises(ValueError, match="dtype object"):
+        publish({"X": np.ones(3), "names": np.array(["a", None], dtype=object)})
+
+
+# ------------------------------------------------------------------------------
+# testing publish_frame
+# ------------------------------------------------------------------------------
+
+
+def test_publish_frame_splits_prepare_common_features_output():
+    df = make_cleaned_brfss(2022, 500)
+    df_common = prepare_common_features(df, COMMON_FEATURES, weight_col="survey_weight")
+    plane = publish_frame(df_common, weight_col="survey_weight")
+    try:
+        attached = attach(plane["spec"])
+        features = [
+            c for c in df_common.columns if c not in ("diabetes", "survey_weight")
+        ]
+        assert attached["columns"] == features
+        np.testing.assert_array_equal(
+            attached["arrays"]["X"], df_common[features].to_numpy(float)
+        )
+        np.testing.assert_array_equal(attached["arrays"]["y"], df_common["diabetes"])
+        np.testing.assert_array_equal(
+            attached["arrays"]["w"], df_common["survey_weight"]
+        )
+        detach(attached)
+    finally:
+        release(plane)
+
+
+def test_publish_frame_raises_on_missing_target():
+    df = make_cleaned_brfss(2022, 100)
+    df_common = prepare_common_features(df, COMMON_FEATURES)
+    with pytest.raises(ValueError, match="Missing target column"):
+        publish_frame(df_common.drop(columns="diabetes"))
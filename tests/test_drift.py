@@ -0,0 +1,185 @@
+# tests/test_drift.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import brfss_diabetes.drift as drift
+from brfss_diabetes.drift import (
+    build_profile,
+    compare_profiles,
+    js_divergence,
+    ks_statistic,
+    load_profile,
+    psi,
+    save_profile,
+    target_rate_shift,
+)
+from brfss_diabetes.eda import summarize_frame
+from brfss_diabetes.io import load_all_years
+from brfss_diabetes.synthetic import write_cleaned_years
+
+YEARS = [2019, 2020, 2021, 2022, 2023]
+CLEANED_ROWS = 4_000
+
+
+@pytest.fixture(scope="module")
+def cleaned_dir(cleaned_dir):
+    # The shared years, with 2023's BMI shifted up by a third
+    path = cleaned_dir / "brfss_cleaned_2023.csv"
+    df = pd.read_csv(path)
+    df["bmi"] = df["bmi"] * 1.33
+    df.to_csv(path, index=False)
+    return cleaned_dir
+
+
+# ------------------------------------------------------------------------------
+# testing def psi, js_divergence, ks_statistic
+# ------------------------------------------------------------------------------
+
+
+def test_metrics_are_zero_for_identical_distributions():
+    counts = [10, 30, 60]
+    assert psi(counts, [1, 3, 6]) == pytest.approx(0.0)
+    assert js_divergence(counts, counts) == pytest.approx(0.0)
+    assert ks_statistic(counts, counts) == pytest.approx(0.0)
+
+
+def test_metrics_known_values():
+    e = np.array([0.5, 0.5])
+    a = np.array([0.9, 0.1])
+    assert psi(e, a) == pytest.approx(0.4 * np.log(1.8) - 0.4 * np.log(0.2))
+    assert ks_statistic(e, a) == pytest.approx(0.4)
+    assert js_divergence([1, 0], [0, 1]) == pytest.approx(1.0)
+
+
+def test_psi_stays_finite_with_empty_bins():
+    assert np.isfinite(psi([10, 0], [5, 5]))
+
+
+def test_metrics_raise_on_misaligned_counts():
+    with pytest.raises(ValueError, match="same length"):
+        psi([1, 2], [1, 2, 3])
+
+
+# ------------------------------------------------------------------------------
+# testing def build_profile(years, data_dir, profile_dir=None, chunksize=100_000)
+# ------------------------------------------------------------------------------
+
+
+def test_build_profile_persists_years_and_reuses_them(
+    cleaned_dir, tmp_path, monkeypatch
+):
+    profile_dir = tmp_path / "profiles"
+    first = build_profile([2019, 2020], data_dir=cleaned_dir, profile_dir=profile_dir)
+    names = sorted(p.name for p in profile_dir.glob("profile_*.json"))
+    assert [name[: len("profile_2019_")] for name in names] == [
+        "profile_2019_",
+        "profile_2020_",
+    ]
+
+    def fail(*args, **kwargs):
+        raise AssertionError("stored profile should have been used")
+
+    monkeypatch.setattr(drift, "summarize_year", fail)
+    # Unchanged files are not even hashed
+    monkeypatch.setattr(drift, "file_hash", fail)
+    assert (
+        build_profile([2019, 2020], data_dir=cleaned_dir, profile_dir=profile_dir)
+        == first
+    )
+
+
+def test_build_profile_rebuilds_a_regenerated_year(tmp_path):
+    data_dir = tmp_path / "cleaned"
+    profile_dir = tmp_path / "profiles"
+    write_cleaned_years([2019], 2_000, data_dir)
+    first = build_profile([2019], data_dir=data_dir, profile_dir=profile_dir)
+
+    path = data_dir / "brfss_cleaned_2019.csv"
+    df = pd.read_csv(path)
+    df["bmi"] = df["bmi"] * 1.33
+    df.to_csv(path, index=False)
+
+    second = build_profile([2019], data_dir=data_dir, profile_dir=profile_dir)
+    assert second != first
+    assert len(list(profile_dir.glob("profile_2019_*.json"))) == 2
+
+
+def test_save_and_load_profile_round_trip(cleaned_dir, tmp_path):
+    profile = build_profile([2021], data_dir=cleaned_dir)
+    save_profile(profile, tmp_path / "nested" / "ref.json")
+    assert load_profile(tmp_path / "nested" / "ref.json") == profile
+
+
+def test_build_profile_raises_on_bad_profile_dir(cleaned_dir):
+    with pytest.raises(ValueError, match="`profile_dir` must be a pathlib.Path"):
+        build_profile([2019], data_dir=cleaned_dir, profile_dir="profiles")
+
+
+# ------------------------------------------------------------------------------
+# testing def compare_profiles(reference, current)
+# ------------------------------------------------------------------------------
+
+
+def test_compare_profiles_flags_shifted_feature_only(cleaned_dir):
+    reference = build_profile([2019, 2020, 2021], data_dir=cleaned_dir)
+
+    stable = compare_profiles(reference, build_profile([2022], data_dir=cleaned_dir))
+    assert (stable["status"] == "stable").all()
+
+    shifted = compare_profiles(reference, build_profile([2023], data_dir=cleaned_dir))
+    by_feature = shifted.set_index("feature")
+    assert by_feature.loc["bmi", "status"] == "major"
+    assert by_feature.loc["bmi", "ks"] > 0.3
+    assert by_feature.loc["age", "status"] == "stable"
+    assert np.isnan(by_feature.loc["sex", "ks"])
+
+
+def test_compare_profiles_reports_missing_shares(cleaned_dir):
+    reference = build_profile([2019], data_dir=cleaned_dir)
+    report = compare_profiles(reference, reference).set_index("feature")
+    expected = pd.read_csv(cleaned_dir / "brfss_cleaned_2019.csv")["bmi"].isna().mean()
+    assert report.loc["bmi", "missing_ref"] == pytest.approx(expected)
+    assert report.loc["bmi", "psi"] == pytest.approx(0.0)
+
+
+def test_target_rate_shift(cleaned_dir):
+    reference = build_profile([2019], data_dir=cleaned_dir)
+    df = pd.read_csv(cleaned_dir / "brfss_cleaned_2019.csv")
+    shift = target_rate_shift(reference, reference)
+    assert shift["rate_ref"] == pytest.approx((df["diabetes"] == "Yes").mean())
+    assert shift["diff"] == 0
+
+
+def test_compare_profiles_raises_on_non_dict():
+    with pytest.raises(ValueError, match="profile dicts"):
+        compare_profiles([], {})
+
+
+# ------------------------------------------------------------------------------
+# testing load_all_years(..., drift_profile=...)
+# ------------------------------------------------------------------------------
+
+
+def test_load_all_years_attaches_drift(cleaned_dir, tmp_path, capsys):
+    reference = build_profile([2019, 2020, 2021], data_dir=cleaned_dir)
+    save_profile(reference, tmp_path / "ref.json")
+
+    df = load_all_years(
+        [2022, 2023], data_dir=cleaned_dir, drift_profile=tmp_path / "ref.json"
+    )
+
+    assert set(df.attrs["drift"]) == {2022, 2023}
+    bmi_2023 = next(r for r in df.attrs["drift"][2023] if r["feature"] == "bmi")
+    assert bmi_2023["status"] == "major"
+    assert "[Drift] 2023: major drift in ['bmi']" in capsys.readouterr().out
+
+
+def test_load_all_years_without_profile_has_no_drift(cleaned_dir):
+    assert "drift" not in load_all_years([2022], data_dir=cleaned_dir).attrs
+
+
+def test_load_all_years_raises_on_bad_drift_profile(cleaned_dir):
+    with pytest.raises(ValueError, match="`drift_profile` must be a dict or Path"):
+        load_all_years([2022], data_dir=cleaned_dir, drift_profile=42)
@@ -0,0 +1,166 @@
+# tests/test_eda.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import brfss_diabetes.eda as eda
+from brfss_diabetes.eda import (
+    HIST_BINS,
+    merge_summaries,
+    missing_table,
+    plot_histograms,
+    plot_target_by_year,
+    plot_value_counts,
+    summarize_frame,
+    summarize_year,
+    summarize_years,
+    target_rate_table,
+)
+from brfss_diabetes.io import load_all_years
+from brfss_diabetes.synthetic import write_cleaned_years
+
+YEARS = [2019, 2020, 2021, 2022, 2023]
+
+
+@pytest.fixture(scope="module")
+def df_all(cleaned_dir):
+    return load_all_years(YEARS, data_dir=cleaned_dir)
+
+
+# ------------------------------------------------------------------------------
+# testing def summarize_years(years, data_dir, chunksize=100_000, cache_dir=None,
+#                             hist_bins=None)
+# ------------------------------------------------------------------------------
+
+
+def test_summarize_years_matches_full_frame(cleaned_dir, df_all):
+    summary = summarize_years(YEARS, data_dir=cleaned_dir, chunksize=700)
+
+    assert summary["rows"] == len(df_all)
+    expected_missing = df_all.isnull().sum()
+    expected_missing = expected_missing[expected_missing > 0]
+    table = missing_table(summary)
+    pd.testing.assert_series_equal(
+        table["Missing Values"].sort_index(),
+        expected_missing.sort_index(),
+        check_names=False,
+    )
+
+    for col in ["sex", "educa", "bmi_cat", "food_insecurity", "diabetes"]:
+        expected = df_all[col].value_counts().to_dict()
+        assert summary["value_counts"][col] == expected
+
+    for col, edges in HIST_BINS.items():
+        values = df_all[col].dropna().clip(edges[0], edges[-1])
+        expected, _ = np.histogram(values, bins=edges)
+        assert summary["histograms"][col]["counts"] == expected.tolist()
+
+
+def test_target_rate_table_matches_groupby(cleaned_dir, df_all):
+    table = target_rate_table(summarize_years(YEARS, data_dir=cleaned_dir))
+    expected = df_all.groupby("year")["diabetes"].apply(lambda s: (s == "Yes").mean())
+
+    assert table.index.tolist() == YEARS
+    np.testing.assert_allclose(table["rate"], expected.to_numpy())
+    assert table["rows"].tolist() == df_all.groupby("year").size().tolist()
+
+
+def test_summarize_years_raises_on_bad_years(cleaned_dir):
+    with pytest.raises(ValueError, match="`years` must be a list of integers"):
+        summarize_years(2020, data_dir=cleaned_dir)
+
+
+# ------------------------------------------------------------------------------
+# testing def merge_summaries(summaries)
+# ------------------------------------------------------------------------------
+
+
+def test_merge_summaries_equals_summary_of_concatenation(df_all):
+    half = len(df_all) // 2
+    merged = merge_summaries(
+        [summarize_frame(df_all.iloc[:half]), summarize_frame(df_all.iloc[half:])]
+    )
+    assert merged == merge_summaries([summarize_frame(df_all)])
+
+
+def test_merge_summaries_rejects_different_bins(df_all):
+    a = summarize_frame(df_all, hist_bins={"bmi": [10.0, 30.0, 80.0]})
+    b = summarize_frame(df_all, hist_bins={"bmi": [10.0, 40.0, 80.0]})
+    with pytest.raises(ValueError, match="Histogram bins of 'bmi' differ"):
+        merge_summaries([a, b])
+
+
+def test_merge_summaries_raises_on_non_list():
+    with pytest.raises(ValueError, match="must be a list of dicts"):
+        merge_summaries({"rows": 1})
+
+
+def test_summarize_frame_raises_on_non_dataframe():
+    with pytest.raises(ValueError, match="must be a pandas DataFrame"):
+        summarize_frame([1, 2, 3])
+
+
+# ------------------------------------------------------------------------------
+# testing summarize_year caching
+# ------------------------------------------------------------------------------
+
+
+def test_summarize_year_reuses_cache_until_file_changes(tmp_path, monkeypatch):
+    data_dir = tmp_path / "cleaned"
+    cache_dir = tmp_path / "cache"
+    write_cleaned_years([2020], 500, data_dir)
+
+    first = summarize_year(2020, data_dir=data_dir, cache_dir=cache_dir)
+    assert len(list(cache_dir.glob("eda_2020_*.json"))) == 1
+
+    def fail(*args, **kwargs):
+        raise AssertionError("cached summary should have been used")
+
+    monkeypatch.setattr(eda, "iter_csv_chunks", fail)
+    assert summarize_year(2020, data_dir=data_dir, cache_dir=cache_dir) == first
+
+    # A changed file hashes differently and is read again
+    monkeypatch.undo()
+    write_cleaned_years([2020], 400, data_dir, seed=1)
+    second = summarize_year(2020, data_dir=data_dir, cache_dir=cache_dir)
+    assert second["rows"] != first["rows"]
+    assert len(list(cache_dir.glob("eda_2020_*.json"))) == 2
+
+
+def test_summarize_year_raises_on_bad_cache_dir(cleaned_dir):
+    with pytest.raises(ValueError, match="`cache_dir` must be a pathlib.Path"):
+        summarize_year(2020, data_dir=cleaned_dir, cache_dir="cache")
+
+
+# ------------------------------------------------------------------------------
+# testing the summary plots
+# ------------------------------------------------------------------------------
+
+
+def test_plots_save_from_summary(cleaned_dir, tmp_path):
+    summary = summarize_years(YEARS, data_dir=cleaned_dir)
+
+    plot_target_by_year(summary, save_path=tmp_path / "by_year.png")
+    plot_histograms(summary, save_path=tmp_path / "hist.png")
+    plot_value_counts(
+        summary,
+        ["sex", "bmi_cat"],
+        orders={"bmi_cat": ["Underweight", "Normal", "Overweight", "Obese"]},
+        save_path=tmp_path / "counts.png",
+    )
+
+    for name in ["by_year.png", "hist.png", "counts.png"]:
+        assert (tmp_path / name).exists()
+
+
+def test_plot_value_counts_raises_on_unknown_column(cleaned_dir):
+    summary = summarize_years([2020], data_dir=cleaned_dir)
+    with pytest.raises(ValueError, match="No value counts in the summary"):
+        plot_value_counts(summary, ["age"])
+
+
+def test_plot_histograms_bad_savepath(cleaned_dir):
+    summary = summarize_years([2020], data_dir=cleaned_dir)
+    with pytest.raises(ValueError):
+        plot_histograms(summary, save_path=12345)
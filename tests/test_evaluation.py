@@ -1,8 +1,29 @@
+import subprocess
+import sys
+
 import numpy as np
+import pandas as pd
 import pytest
 from pathlib import Path
 
-from brfss_diabetes.evaluation import find_optimal_threshold, plot_classification_report
+from sklearn.metrics import (
+    average_precision_score,
+    fbeta_score,
+    precision_recall_curve,
+    roc_auc_score,
+)
+
+from brfss_diabetes.evaluation import (
+    find_optimal_threshold,
+    grouped_metrics,
+    plot_classification_report,
+    weighted_precision_recall_curve,
+)
+
+# Cumulative import budget for `import brfss_diabetes.evaluation`; numpy alone
+# takes ~0.1s, the old eager matplotlib/seaborn/pandas/sklearn imports ~1.5s
+IMPORT_BUDGET_SECONDS = 0.5
+REPO_ROOT = Path(__file__).resolve().parents[1]
 
 # Sample binary classification data
 y_true = np.array([0, 1, 0, 1, 1, 0, 0, 1, 0, 1])
@@ -53,6 +74,42 @@ def test_find_optimal_threshold_invalid_probs_lt_zero():
         find_optimal_threshold(y_true, y_probs)
 
 
+def test_find_optimal_threshold_weights_match_repeated_rows():
+    weights = np.array([1, 3, 2, 1, 1, 4, 1, 2, 1, 1])
+    weighted = find_optimal_threshold(y_true, y_probs, beta=2.0, sample_weight=weights)
+    repeated = find_optimal_threshold(
+        np.repeat(y_true, weights), np.repeat(y_probs, weights), beta=2.0
+    )
+    assert weighted == repeated
+
+
+def test_find_optimal_threshold_weights_shift_threshold():
+    # Upweighting the negatives scored 0.4/0.3 pushes the F1 threshold above them
+    weights = np.array([1, 1, 1, 1, 1, 50, 50, 1, 1, 1])
+    assert find_optimal_threshold(y_true, y_probs, sample_weight=weights) >= 0.6
+
+
+def test_find_optimal_threshold_invalid_weights():
+    with pytest.raises(ValueError, match="`sample_weight` must have the same shape"):
+        find_optimal_threshold(y_true, y_probs, sample_weight=np.ones(3))
+    with pytest.raises(ValueError, match="finite and non-negative"):
+        find_optimal_threshold(y_true, y_probs, sample_weight=-np.ones(10))
+
+
+def test_weighted_precision_recall_curve_matches_sklearn():
+    rng = np.random.default_rng(0)
+    y = rng.integers(0, 2, size=500)
+    probs = rng.random(500).round(2)  # plenty of ties
+    weights = rng.gamma(2.0, 500.0, size=500)
+    weights[:20] = 0.0
+
+    for w in [None, weights]:
+        expected = precision_recall_curve(y, probs, sample_weight=w)
+        result = weighted_precision_recall_curve(y, probs, sample_weight=w)
+        for a, b in zip(result, expected):
+            np.testing.assert_allclose(a, b)
+
+
 def test_plot_classification_report_valid(tmp_path):
     save_path = tmp_path / "test_classification_report.png"
     plot_classification_report(y_true, y_pred, title="Test Report", save_path=save_path)
@@ -83,3 +140,118 @@ def test_plot_classification_report_no_save(monkeypatch):
 
     # This should run silently and hit the `else: plt.show()` block
     plot_classification_report(y_true, y_pred, save_path=None)
+
+
+# ------------------------------------------------------------------------------
+# testing def grouped_metrics(y_true, y_probs, groups, beta=1.0, sample_weight=None)
+# ------------------------------------------------------------------------------
+
+
+def make_grouped_scores(n=3000, seed=0):
+    rng = np.random.default_rng(seed)
+    groups = pd.DataFrame(
+        {
+            "year": rng.choice([2019, 2020, 2021], size=n),
+            "sex": rng.choice(["Male", "Female", None], size=n, p=[0.45, 0.45, 0.1]),
+        }
+    )
+    y = rng.integers(0, 2, size=n)
+    probs = np.clip(0.3 * y + rng.random(n) * 0.7, 0, 1).round(3)
+    return y, probs, groups
+
+
+def test_grouped_metrics_matches_per_slice_sklearn():
+    y, probs, groups = make_grouped_scores()
+    weights = np.random.default_rng(1).gamma(2.0, 100.0, size=len(y))
+
+    for w in [None, weights]:
+        table = grouped_metrics(y, probs, groups, beta=2.0, sample_weight=w)
+        global_t = find_optimal_threshold(y, probs, beta=2.0, sample_weight=w)
+
+        for _, row in table[table["variable"] != "all"].iterrows():
+            mask = (groups[row["variable"]] == row["group"]).to_numpy()
+            w_g = None if w is None else w[mask]
+            assert row["n"] == mask.sum()
+            assert row["auc"] == pytest.approx(
+                roc_auc_score(y[mask], probs[mask], sample_weight=w_g)
+            )
+            assert row["pr_auc"] == pytest.approx(
+                average_precision_score(y[mask], probs[mask], sample_weight=w_g)
+            )
+            assert row["group_threshold"] == find_optimal_threshold(
+                y[mask], probs[mask], beta=2.0, sample_weight=w_g
+            )
+            assert row["global_threshold"] == global_t
+            assert row["fbeta_global"] == pytest.approx(
+                fbeta_score(
+                    y[mask], probs[mask] >= global_t, beta=2.0, sample_weight=w_g
+                ),
+                abs=1e-6,
+            )
+
+
+def test_grouped_metrics_overall_row_and_missing_groups():
+    y, probs, groups = make_grouped_scores()
+    table = grouped_metrics(y, probs, {"sex": groups["sex"]})
+
+    overall = table[table["variable"] == "all"].iloc[0]
+    assert overall["n"] == len(y)
+    assert overall["auc"] == pytest.approx(roc_auc_score(y, probs))
+    assert set(table.loc[table["variable"] == "sex", "group"]) == {"Male", "Female"}
+
+
+def test_grouped_metrics_single_class_group_has_nan_auc():
+    y = np.array([0, 0, 1, 0, 1])
+    probs = np.array([0.1, 0.2, 0.9, 0.4, 0.7])
+    table = grouped_metrics(y, probs, {"g": ["a", "a", "b", "b", "b"]})
+    row_a = table[table["group"] == "a"].iloc[0]
+    assert np.isnan(row_a["auc"])
+    assert np.isnan(row_a["pr_auc"])
+
+
+def test_grouped_metrics_invalid_groups():
+    with pytest.raises(ValueError, match="`groups` must be a pandas DataFrame or dict"):
+        grouped_metrics(y_true, y_probs, ["a"] * 10)
+    with pytest.raises(ValueError, match="same length as `y_true`"):
+        grouped_metrics(y_true, y_probs, {"g": [1, 2]})
+    with pytest.raises(ValueError, match="`beta` must be a positive number"):
+        grouped_metrics(y_true, y_probs, {"g": [1] * 10}, beta=0)
+
+
+# ------------------------------------------------------------------------------
+# testing import cost of brfss_diabetes.evaluation
+# ------------------------------------------------------------------------------
+
+
+def test_evaluation_import_skips_heavy_dependencies():
+    code = (
+        "import sys, brfss_diabetes.evaluation; "
+        "print(','.join(m for m in ['pandas', 'matplotlib', 'seaborn', 'sklearn'] "
+        "if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=REPO_ROOT,
+    )
+    assert result.stdout.strip() == ""
+
+
+def test_evaluation_import_time_within_budget():
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import brfss_diabetes.evaluation"],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=REPO_ROOT,
+    )
+    # Lines look like "import time:  self [us] | cumulative | imported package"
+    cumulative_us = [
+        int(line.split("|")[1])
+        for line in result.stderr.splitlines()
+        if line.rstrip().endswith("| brfss_diabetes.evaluation")
+    ]
+    assert len(cumulative_us) == 1
+    assert cumulative_us[0] / 1e6 < IMPORT_BUDGET_SECONDS
@@ -0,0 +1,158 @@
+# tests/test_explain.py
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LogisticRegression
+
+import brfss_diabetes.explain as explain_module
+from brfss_diabetes.explain import (
+    contribution_importance,
+    feature_groups,
+    grouped_permutation_importance,
+    plot_feature_importance,
+    xgb_contributions,
+)
+
+COMMON_FEATURES = ["age", "sex", "educa", "bmi", "bmi_cat", "smoke_100"]
+ENCODED_YEARS = [2022, 2023]
+ENCODED_ROWS = 6_000
+
+
+@pytest.fixture(scope="module")
+def logistic(encoded):
+    X, y = encoded
+    return LogisticRegression(max_iter=1000).fit(X, y)
+
+
+# ------------------------------------------------------------------------------
+# testing def feature_groups(feature_names, common_features)
+# ------------------------------------------------------------------------------
+
+
+def test_feature_groups_keeps_bmi_and_bmi_cat_apart():
+    names = ["age", "bmi", "sex_Male", "bmi_cat_Obese", "bmi_cat_Overweight"]
+    groups = feature_groups(names, ["age", "sex", "bmi", "bmi_cat"])
+    assert groups == {"age": [0], "sex": [2], "bmi": [1], "bmi_cat": [3, 4]}
+
+
+def test_feature_groups_raises_on_unknown_column():
+    with pytest.raises(ValueError, match="'veg_servings' does not belong"):
+        feature_groups(["age", "veg_servings"], ["age"])
+
+
+# ------------------------------------------------------------------------------
+# testing def grouped_permutation_importance(model, X, y, feature_names, ...)
+# ------------------------------------------------------------------------------
+
+
+def test_grouped_permutation_importance_ranks_signal_features(encoded, logistic):
+    X, y = encoded
+    result = grouped_permutation_importance(
+        logistic, X, y, list(X.columns), COMMON_FEATURES, n_repeats=3
+    )
+
+    assert set(result["feature"]) == set(COMMON_FEATURES)
+    assert result.set_index("feature").loc["educa", "n_columns"] == 3
+    # The synthetic outcome depends on age and BMI only
+    assert set(result["feature"].head(2)) <= {"age", "bmi", "bmi_cat"}
+    assert 0.5 < result.attrs["baseline"] <= 1.0
+
+
+def test_grouped_permutation_importance_same_in_pool(encoded, logistic, monkeypatch):
+    # A budget of 2 cores, so the pool runs even on a single-core machine
+    monkeypatch.setenv("BRFSS_CPU_BUDGET", "2")
+    X, y = encoded
+    args = (logistic, X, y, list(X.columns), COMMON_FEATURES)
+    serial = grouped_permutation_importance(
+        *args, n_repeats=2, scoring="average_precision"
+    )
+    pooled = grouped_permutation_importance(
+        *args, n_repeats=2, scoring="average_precision", n_jobs=2
+    )
+    pd.testing.assert_frame_equal(serial, pooled)
+    assert serial.attrs["baseline"] == pooled.attrs["baseline"]
+
+
+def test_grouped_permutation_importance_leaves_input_untouched(encoded, logistic):
+    X, y = encoded
+    before = X.to_numpy().copy()
+    grouped_permutation_importance(
+        logistic, X, y, list(X.columns), COMMON_FEATURES, n_repeats=1
+    )
+    np.testing.assert_array_equal(X.to_numpy(), before)
+
+
+class _FailingModel:
+    def predict_proba(self, X):
+        raise RuntimeError("scoring failed")
+
+
+def test_grouped_permutation_importance_clears_worker_state_on_error(encoded):
+    X, y = encoded
+    with pytest.raises(RuntimeError, match="scoring failed"):
+        grouped_permutation_importance(
+            _FailingModel(), X, y, list(X.columns), COMMON_FEATURES, n_repeats=1
+        )
+    assert explain_module._WORKER == {}
+
+
+def test_grouped_permutation_importance_raises_on_bad_scoring(encoded, logistic):
+    X, y = encoded
+    with pytest.raises(ValueError, match="`scoring` must be one of"):
+        grouped_permutation_importance(
+            logistic, X, y, list(X.columns), COMMON_FEATURES, scoring="accuracy"
+        )
+
+
+def test_grouped_permutation_importance_raises_on_name_mismatch(encoded, logistic):
+    X, y = encoded
+    with pytest.raises(ValueError, match="must name every column"):
+        grouped_permutation_importance(logistic, X, y, ["age"], ["age"])
+
+
+# ------------------------------------------------------------------------------
+# testing def xgb_contributions(model, X, feature_names, common_features)
+# ------------------------------------------------------------------------------
+
+
+def test_xgb_contributions_sum_to_margin(encoded):
+    xgb = pytest.importorskip("xgboost")
+    X, y = encoded
+    model = xgb.XGBClassifier(n_estimators=20, max_depth=3).fit(X, y)
+
+    contribs = xgb_contributions(model, X.iloc[:500], list(X.columns), COMMON_FEATURES)
+    margin = model.predict(X.iloc[:500], output_margin=True)
+
+    assert list(contribs.columns) == COMMON_FEATURES + ["bias"]
+    np.testing.assert_allclose(contribs.sum(axis=1), margin, rtol=1e-4, atol=1e-4)
+
+    importance = contribution_importance(contribs)
+    assert importance["feature"].iloc[0] in {"age", "bmi", "bmi_cat"}
+    assert "bias" not in set(importance["feature"])
+
+
+def test_xgb_contributions_raises_on_non_xgboost_model(encoded, logistic):
+    X, _ = encoded
+    with pytest.raises(ValueError, match="must be an XGBoost model"):
+        xgb_contributions(logistic, X, list(X.columns), COMMON_FEATURES)
+
+
+# ------------------------------------------------------------------------------
+# testing def plot_feature_importance(importance, title, save_path=None)
+# ------------------------------------------------------------------------------
+
+
+def test_plot_feature_importance_saves(encoded, logistic, tmp_path):
+    X, y = encoded
+    result = grouped_permutation_importance(
+        logistic, X, y, list(X.columns), COMMON_FEATURES, n_repeats=1
+    )
+    plot_feature_importance(result, save_path=tmp_path / "importance.png")
+    assert (tmp_path / "importance.png").exists()
+
+
+def test_plot_feature_importance_bad_savepath():
+    table = pd.DataFrame({"feature": ["age"], "mean_abs_contribution": [0.1]})
+    with pytest.raises(ValueError):
+        plot_feature_importance(table, save_path=123)
@@ -0,0 +1,154 @@
+# tests/test_incremental.py
+
+import numpy as np
+import pandas as pd
+import pytest
+from pathlib import Path
+from sklearn.metrics import roc_auc_score
+
+from brfss_diabetes.incremental import (
+    encode_chunk,
+    transform_chunk,
+    train_incremental_logistic,
+)
+
+common_features = ["age", "sex", "educa", "bmi", "bmi_cat", "smoke_100", "exercise_any"]
+
+
+def make_cleaned(n, seed):
+    rng = np.random.default_rng(seed)
+    bmi = rng.normal(28, 5, size=n).round(2)
+    age = rng.choice([22, 37, 52, 67, 85], size=n)
+    logit = -9 + 0.06 * age + 0.15 * bmi
+    diabetes = rng.random(n) < 1 / (1 + np.exp(-logit))
+    return pd.DataFrame(
+        {
+            "year": 0,
+            "age": age,
+            "sex": rng.choice(["Male", "Female"], size=n),
+            "educa": rng.choice(["Less than HS", "HS or GED", "Some college"], size=n),
+            "bmi": bmi,
+            "bmi_cat": np.where(bmi >= 30, "Obese", "Normal"),
+            "smoke_100": rng.choice(["Yes", "No"], size=n),
+            "exercise_any": rng.choice(["Yes", "No", None], size=n),
+            "survey_weight": rng.gamma(2.0, 300.0, size=n),
+            "diabetes": np.where(diabetes, "Yes", "No"),
+        }
+    )
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    for i, year in enumerate([2019, 2020, 2021]):
+        make_cleaned(3000, seed=i).assign(year=year).to_csv(
+            tmp_path / f"brfss_cleaned_{year}.csv", index=False
+        )
+    return tmp_path
+
+
+# ------------------------------------------------------------------------------
+# testing def encode_chunk(df, common_features)
+# ------------------------------------------------------------------------------
+
+
+def test_encode_chunk_layout_is_fixed_across_chunks():
+    df = make_cleaned(50, seed=1)
+    _, _, names_a, _ = encode_chunk(df.iloc[:5], common_features)
+    _, _, names_b, _ = encode_chunk(df.assign(bmi_cat="Normal"), common_features)
+
+    assert names_a == names_b
+    assert "bmi_cat_Underweight" in names_a
+    assert "educa_College graduate" not in names_a  # dropped baseline level
+
+
+def test_encode_chunk_raises_on_non_dataframe():
+    with pytest.raises(ValueError, match="must be a pandas DataFrame"):
+        encode_chunk("not_a_df", common_features)
+
+
+# ------------------------------------------------------------------------------
+# testing def train_incremental_logistic(train_years, valid_year, ...)
+# ------------------------------------------------------------------------------
+
+
+def test_train_incremental_logistic_learns_signal(data_dir):
+    model, schema, history = train_incremental_logistic(
+        [2019, 2020],
+        2021,
+        common_features,
+        data_dir=data_dir,
+        chunksize=700,
+        max_epochs=5,
+    )
+
+    assert 1 <= len(history) <= 5
+    assert history["valid_log_loss"].notna().all()
+    assert schema["class_weight"].shape == (2,)
+
+    df_valid = pd.read_csv(data_dir / "brfss_cleaned_2021.csv")
+    X, y = transform_chunk(df_valid, schema)
+    assert X.shape[1] == len(schema["feature_names"])
+    assert roc_auc_score(y, model.predict_proba(X)[:, 1]) > 0.6
+
+
+def test_train_incremental_logistic_early_stops(data_dir):
+    _, _, history = train_incremental_logistic(
+        [2019],
+        2021,
+        common_features,
+        data_dir=data_dir,
+        chunksize=1000,
+        max_epochs=50,
+        n_iter_no_change=1,
+        tol=10.0,
+    )
+    assert len(history) == 2
+
+
+def test_train_incremental_logistic_survey_weights(data_dir):
+    model, schema, history = train_incremental_logistic(
+        [2019, 2020],
+        2021,
+        common_features,
+        data_dir=data_dir,
+        max_epochs=3,
+        weight_col="survey_weight",
+    )
+    assert schema["weight_col"] == "survey_weight"
+    assert history["valid_log_loss"].notna().all()
+    assert np.isfinite(model.coef_).all()
+
+
+def test_train_incremental_logistic_keeps_spill_dir(data_dir, tmp_path):
+    spill_dir = tmp_path / "spill"
+    train_incremental_logistic(
+        [2019],
+        2020,
+        common_features,
+        data_dir=data_dir,
+        max_epochs=1,
+        spill_dir=spill_dir,
+    )
+    assert len(list(spill_dir.glob("*.npy"))) == 2
+
+
+def test_train_incremental_logistic_raises_on_overlapping_valid_year():
+    with pytest.raises(ValueError, match="is also in `train_years`"):
+        train_incremental_logistic([2019, 2020], 2020, common_features)
+
+
+def test_train_incremental_logistic_raises_on_bad_years():
+    with pytest.raises(ValueError, match="`train_years` must be a list of integers"):
+        train_incremental_logistic("2019", 2020, common_features)
+    with pytest.raises(ValueError, match="`valid_year` must be an int"):
+        train_incremental_logistic([2019], "2020", common_features)
+
+
+def test_train_incremental_logistic_raises_on_bad_spill_dir():
+    with pytest.raises(ValueError, match="`spill_dir` must be a pathlib.Path"):
+        train_incremental_logistic([2019], 2020, common_features, spill_dir="spill")
+
+
+def test_transform_chunk_raises_on_bad_schema():
+    with pytest.raises(ValueError, match="`schema` must be a dict"):
+        transform_chunk(make_cleaned(5, seed=0), "schema")
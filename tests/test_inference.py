@@ -0,0 +1,163 @@
+# tests/test_inference.py
+
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+
+from brfss_diabetes.inference import (
+    decision_function,
+    export_kernel,
+    kernel_from_artifact,
+    load_kernel,
+    make_kernel,
+    predict,
+    predict_proba,
+    sigmoid,
+)
+from brfss_diabetes.registry import load_artifact, save_model
+
+COMMON_FEATURES = ["age", "sex", "educa", "bmi", "smoke_100"]
+
+
+@pytest.fixture(scope="module")
+def logistic(encoded):
+    X, y = encoded
+    return LogisticRegression(max_iter=1000, class_weight="balanced").fit(X, y)
+
+
+# ------------------------------------------------------------------------------
+# testing export_kernel and predict_proba
+# ------------------------------------------------------------------------------
+
+
+def test_predict_proba_matches_sklearn(encoded, logistic):
+    X, _ = encoded
+    kernel = export_kernel(logistic, X.columns, threshold=0.4)
+
+    expected = logistic.predict_proba(X)[:, 1]
+    probs = predict_proba(kernel, X.to_numpy())
+    assert probs.dtype == np.float32
+    np.testing.assert_allclose(probs, expected, atol=1e-5)
+    np.testing.assert_array_equal(
+        predict(kernel, X.to_numpy()), (probs >= 0.4).astype(np.int8)
+    )
+
+
+def test_predict_proba_reorders_dataframe_columns(encoded, logistic):
+    X, _ = encoded
+    kernel = export_kernel(logistic, X.columns)
+    shuffled = X[X.columns[::-1]]
+    np.testing.assert_allclose(
+        predict_proba(kernel, shuffled), predict_proba(kernel, X), atol=0
+    )
+
+
+def test_single_row_is_scored(encoded, logistic):
+    X, _ = encoded
+    kernel = export_kernel(logistic, X.columns)
+    row = X.to_numpy()[0]
+    assert predict_proba(kernel, row).shape == (1,)
+
+
+def test_predict_proba_raises_on_wrong_width(encoded, logistic):
+    X, _ = encoded
+    kernel = export_kernel(logistic, X.columns)
+    with pytest.raises(ValueError, match="columns"):
+        predict_proba(kernel, np.zeros((3, X.shape[1] + 1)))
+
+
+def test_export_kernel_raises_on_unfitted_model():
+    with pytest.raises(ValueError, match="fitted binary linear"):
+        export_kernel(LogisticRegression(), ["a"])
+
+
+def test_make_kernel_raises_on_bad_threshold():
+    with pytest.raises(ValueError, match="threshold"):
+        make_kernel([1.0], 0.0, ["a"], threshold=1.5)
+
+
+def test_folded_standardization_matches_scaled_model(encoded):
+    X, y = encoded
+    X = X.to_numpy(dtype=np.float64)
+    mean = X.mean(axis=0)
+    scale = X.std(axis=0) + 1.0
+    model = SGDClassifier(loss="log_loss", random_state=0).fit((X - mean) / scale, y)
+
+    kernel = export_kernel(
+        model, [f"x{i}" for i in range(X.shape[1])], 0.5, mean, scale
+    )
+    np.testing.assert_allclose(
+        decision_function(kernel, X),
+        model.decision_function((X - mean) / scale),
+        rtol=1e-4,
+        atol=1e-4,
+    )
+
+
+def test_sigmoid_is_stable_for_large_margins():
+    z = np.array([-1000.0, -50.0, 0.0, 50.0, 1000.0], dtype=np.float32)
+    with np.errstate(over="raise"):
+        p = sigmoid(z)
+    assert np.all(np.isfinite(p))
+    assert p[0] == 0.0 and p[2] == 0.5 and p[-1] == 1.0
+    assert 0 < p[1] < 1e-20
+
+
+# ------------------------------------------------------------------------------
+# testing save_kernel, load_kernel and kernel_from_artifact
+# ------------------------------------------------------------------------------
+
+
+def test_kernel_round_trip(encoded, logistic, tmp_path):
+    X, _ = encoded
+    path = tmp_path / "kernel.npz"
+    kernel = export_kernel(logistic, X.columns, threshold=0.3, path=path)
+
+    loaded = load_kernel(path)
+    assert loaded["feature_names"] == kernel["feature_names"]
+    assert loaded["threshold"] == 0.3
+    np.testing.assert_array_equal(predict_proba(loaded, X), predict_proba(kernel, X))
+
+
+def test_kernel_from_artifact_uses_stored_threshold(encoded, logistic, tmp_path):
+    X, _ = encoded
+    save_model(
+        logistic,
+        tmp_path,
+        "logistic",
+        list(X.columns),
+        [2022],
+        thresholds={"crosspoint": 0.42, "f2": 0.2},
+    )
+    kernel = kernel_from_artifact(load_artifact(tmp_path, "logistic"))
+
+    assert kernel["threshold"] == 0.42
+    np.testing.assert_allclose(
+        predict_proba(kernel, X), logistic.predict_proba(X)[:, 1], atol=1e-5
+    )
+    with pytest.raises(ValueError, match="No threshold 'f1'"):
+        kernel_from_artifact(load_artifact(tmp_path, "logistic"), threshold="f1")
+
+
+def test_scoring_from_registry_skips_sklearn(encoded, logistic, tmp_path):
+    X, _ = encoded
+    save_model(
+        logistic, tmp_path, "logistic", list(X.columns), [2022], {"crosspoint": 0.5}
+    )
+    code = (
+        "import sys\n"
+        "from pathlib import Path\n"
+        "import numpy as np\n"
+        "from brfss_diabetes.registry import load_artifact\n"
+        "from brfss_diabetes.inference import kernel_from_artifact, predict\n"
+        f"kernel = kernel_from_artifact(load_artifact(Path({str(tmp_path)!r}), 'logistic'))\n"
+        "predict(kernel, np.zeros((4, len(kernel['coef'])), dtype=np.float32))\n"
+        "print('sklearn' in sys.modules)\n"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout.split()
+    assert out == ["False"]
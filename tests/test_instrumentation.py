@@ -0,0 +1,125 @@
+# tests/test_instrumentation.py
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from brfss_diabetes import instrumentation as inst
+from brfss_diabetes.cleaning import clean_brfss
+from brfss_diabetes.evaluation import find_optimal_threshold
+from brfss_diabetes.synthetic import make_raw_brfss
+
+
+@pytest.fixture(autouse=True)
+def clean_registry():
+    inst.reset()
+    yield
+    inst.disable()
+    inst.reset()
+
+
+# ------------------------------------------------------------------------------
+# testing enable/disable and the instrument decorator
+# ------------------------------------------------------------------------------
+
+
+def test_instrumentation_is_off_by_default():
+    assert not inst.is_enabled()
+    find_optimal_threshold(np.array([0, 1]), np.array([0.2, 0.8]))
+    assert inst.get_records() == []
+
+
+def test_instrument_records_nested_pipeline_stages():
+    inst.enable(trace_memory=True)
+    clean_brfss(make_raw_brfss(2020, 1000), 2020)
+    records = {r["path"]: r for r in inst.get_records()}
+
+    assert set(records) == {
+        "clean_brfss",
+        "clean_brfss;clean_common_fields",
+        "clean_brfss;clean_year_specific",
+    }
+    outer = records["clean_brfss"]
+    inner = records["clean_brfss;clean_common_fields"]
+    assert outer["rows_in"] == outer["rows_out"] == 1000
+    assert outer["wall_s"] >= inner["wall_s"] > 0
+    assert outer["peak_bytes"] >= inner["peak_bytes"] > 0
+
+
+def test_instrument_without_memory_tracing():
+    inst.enable(trace_memory=False)
+    find_optimal_threshold(np.array([0, 1, 1]), np.array([0.2, 0.8, 0.6]))
+    (record,) = inst.get_records()
+    assert record["name"] == "find_optimal_threshold"
+    assert record["rows_in"] == 3
+    assert record["peak_bytes"] is None
+
+
+def test_instrument_preserves_function_metadata():
+    assert find_optimal_threshold.__name__ == "find_optimal_threshold"
+    assert "F-beta" in find_optimal_threshold.__doc__
+
+
+# ------------------------------------------------------------------------------
+# testing def stage(name, rows_in=None)
+# ------------------------------------------------------------------------------
+
+
+def test_stage_context_manager_records_rows_out():
+    inst.enable(trace_memory=False)
+    with inst.stage("smote", rows_in=10) as record:
+        record["rows_out"] = 18
+    (result,) = inst.get_records()
+    assert (result["rows_in"], result["rows_out"]) == (10, 18)
+
+
+def test_stage_is_a_no_op_when_disabled():
+    with inst.stage("fit") as record:
+        assert record == {}
+    assert inst.get_records() == []
+
+
+def test_stage_records_even_when_block_raises():
+    inst.enable(trace_memory=False)
+    with pytest.raises(RuntimeError):
+        with inst.stage("fit"):
+            raise RuntimeError("boom")
+    assert inst.get_records()[0]["name"] == "fit"
+
+
+# ------------------------------------------------------------------------------
+# testing dump_json and summary
+# ------------------------------------------------------------------------------
+
+
+def test_dump_json_writes_trace(tmp_path):
+    inst.enable(trace_memory=False)
+    with inst.stage("load"):
+        pass
+    path = tmp_path / "trace.json"
+    inst.dump_json(path)
+    assert json.loads(path.read_text())[0]["name"] == "load"
+
+
+def test_dump_json_raises_on_bad_path():
+    with pytest.raises(ValueError, match="`path` must be a string or Path"):
+        inst.dump_json(123)
+
+
+def test_summary_table_and_folded_stacks():
+    inst.enable(trace_memory=False)
+    with inst.stage("pipeline"):
+        for _ in range(2):
+            with inst.stage("fit"):
+                sum(range(10_000))
+
+    table = inst.summary()
+    assert "pipeline" in table and "  fit" in table
+
+    folded = dict(
+        line.rsplit(" ", 1) for line in inst.summary(folded=True).splitlines()
+    )
+    assert set(folded) == {"pipeline", "pipeline;fit"}
+    assert int(folded["pipeline;fit"]) > 0
@@ -6,8 +6,12 @@ import pytest
 import sys
 from unittest.mock import patch, MagicMock
 
-from brfss_diabetes.io import get_csv, load_all_years, finalize_columns
-
+from brfss_diabetes.io import (
+    get_csv,
+    iter_csv_chunks,
+    load_all_years,
+    finalize_columns,
+)
 
 # ------------------------------------------------------------------------------
 # testing def get_csv(year, data_dir=Path("../data/cleaned"))
@@ -118,3 +122,89 @@ def test_finalize_columns_raises_on_keep_cols_not_list():
     df = pd.DataFrame({"A": [1]})
     with pytest.raises(KeyError, match="Keep_cols .* is not a list"):
         finalize_columns(df, "A")
+
+
+# ------------------------------------------------------------------------------
+# testing def iter_csv_chunks(year, data_dir=Path("../data/cleaned"), ...)
+# ------------------------------------------------------------------------------
+
+
+def test_iter_csv_chunks_streams_file(tmp_path):
+    pd.DataFrame({"a": range(10), "diabetes": ["No"] * 10}).to_csv(
+        tmp_path / "brfss_cleaned_2020.csv", index=False
+    )
+    chunks = list(iter_csv_chunks(2020, data_dir=tmp_path, chunksize=4, usecols=["a"]))
+    assert [len(c) for c in chunks] == [4, 4, 2]
+    assert list(chunks[0].columns) == ["a"]
+
+
+def test_iter_csv_chunks_raises_on_bad_chunksize():
+    with pytest.raises(ValueError, match="`chunksize` must be a positive int"):
+        iter_csv_chunks(2020, data_dir=Path("."), chunksize=0)
+
+
+def test_iter_csv_chunks_raises_on_non_integer_year():
+    with pytest.raises(ValueError, match="`year` must be an int"):
+        iter_csv_chunks("2020")
+
+
+# ------------------------------------------------------------------------------
+# testing load_all_years(..., sample_size=...)
+# ------------------------------------------------------------------------------
+
+
+@pytest.fixture(scope="module")
+def sample_dir(tmp_path_factory):
+    from brfss_diabetes.synthetic import write_cleaned_years
+
+    data_dir = tmp_path_factory.mktemp("cleaned")
+    write_cleaned_years([2019, 2020, 2021], 4_000, data_dir)
+    return data_dir
+
+
+def test_sample_is_stratified_by_year_and_diabetes(sample_dir):
+    full = load_all_years([2019, 2020, 2021], data_dir=sample_dir)
+    sample = load_all_years(
+        [2019, 2020, 2021], data_dir=sample_dir, sample_size=600, chunksize=500
+    )
+
+    assert len(sample) == 600
+    assert sample.columns.tolist() == full.columns.tolist()
+    sampling = pd.DataFrame(sample.attrs["sampling"])
+    expected = full.groupby(["year", "diabetes"]).size()
+    assert sampling.set_index(["year", "diabetes"])["population"].equals(
+        expected.rename("population")
+    )
+    counts = sample.groupby(["year", "diabetes"]).size()
+    assert (counts.to_numpy() == sampling["sampled"].to_numpy()).all()
+    assert (abs(counts / expected - 600 / len(full)) < 0.002).all()
+
+    # Sampled rows are real rows of the full data
+    merged = sample.merge(full.drop_duplicates(), how="left", indicator=True)
+    assert (merged["_merge"] == "both").all()
+
+
+def test_sample_is_reproducible_across_chunksizes(sample_dir):
+    first = load_all_years(
+        [2019, 2020], data_dir=sample_dir, sample_size=300, chunksize=333
+    )
+    second = load_all_years(
+        [2019, 2020], data_dir=sample_dir, sample_size=300, chunksize=4_000
+    )
+    other = load_all_years(
+        [2019, 2020], data_dir=sample_dir, sample_size=300, seed=1, chunksize=333
+    )
+    pd.testing.assert_frame_equal(first, second)
+    assert not first.equals(other)
+
+
+def test_sample_larger_than_data_returns_every_row(sample_dir):
+    sample = load_all_years([2019], data_dir=sample_dir, sample_size=10**6)
+    full = load_all_years([2019], data_dir=sample_dir)
+    pd.testing.assert_frame_equal(sample, full)
+    assert all(record["fraction"] == 1 for record in sample.attrs["sampling"])
+
+
+def test_load_all_years_raises_on_bad_sample_size():
+    with pytest.raises(ValueError, match="`sample_size` must be a positive int"):
+        load_all_years([2019], sample_size=0.01)
@@ -0,0 +1,184 @@
+# tests/test_polars_backend.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pl = pytest.importorskip("polars")
+
+from brfss_diabetes import polars_backend as plb
+from brfss_diabetes.cleaning import clean_brfss, to_cleaned_layout
+from brfss_diabetes.config import FEATURE_LEVELS, VARS_BY_YEAR
+from brfss_diabetes.incremental import encode_chunk
+from brfss_diabetes.io import load_all_years
+from brfss_diabetes.preprocessing import prepare_common_features
+from brfss_diabetes.synthetic import make_raw_brfss
+
+YEARS = sorted(VARS_BY_YEAR)
+CLEANED_ROWS = 3_000
+FEATURES = ["age", "sex", "educa", "bmi", "bmi_cat", "smoke_100", "drink_any"]
+
+
+def normalize(df):
+    """
+    Bring pandas and polars output to common dtypes: numbers as float64 with
+    NaN, everything else as object with None. pandas leaves recoded raw codes
+    as object columns holding numbers and pd.NA, so those count as numbers.
+    """
+    out = {}
+    for col in df.columns:
+        series = df[col]
+        non_null = series.dropna()
+        if (
+            pd.api.types.is_numeric_dtype(series)
+            or pd.api.types.is_bool_dtype(series)
+            or (
+                series.dtype == object
+                and non_null.map(lambda v: isinstance(v, (int, float))).all()
+            )
+        ):
+            out[col] = pd.to_numeric(series).astype("float64")
+        else:
+            values = series.astype(object)
+            out[col] = values.where(series.notna(), None)
+    return pd.DataFrame(out).reset_index(drop=True)
+
+
+# ------------------------------------------------------------------------------
+# testing def clean_brfss(lf, year) and def to_cleaned_layout(lf)
+# ------------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize("year", YEARS)
+def test_clean_brfss_matches_pandas(year, tmp_path):
+    raw = make_raw_brfss(year, 3_000)
+    path = tmp_path / f"brfss_subset_{year}.csv"
+    raw.to_csv(path, index=False)
+
+    expected = clean_brfss(pd.read_csv(path), year)
+    result = plb.to_pandas(plb.clean_brfss(plb.scan_subset_csv(path), year))
+
+    assert set(result.columns) == set(expected.columns)
+    pd.testing.assert_frame_equal(
+        normalize(result[expected.columns]), normalize(expected)
+    )
+
+
+@pytest.mark.parametrize("year", [2019, 2023])
+def test_to_cleaned_layout_matches_pandas(year):
+    raw = make_raw_brfss(year, 3_000)
+
+    expected = to_cleaned_layout(clean_brfss(raw.copy(), year))
+    lf = plb.to_cleaned_layout(plb.clean_brfss(pl.from_pandas(raw).lazy(), year))
+    result = plb.to_pandas(lf)
+
+    assert list(result.columns) == list(expected.columns)
+    pd.testing.assert_frame_equal(normalize(result), normalize(expected))
+
+
+def test_clean_brfss_raises_on_non_lazyframe():
+    with pytest.raises(ValueError, match="polars LazyFrame"):
+        plb.clean_brfss(pd.DataFrame(), 2019)
+
+
+def test_clean_brfss_raises_on_non_int_year():
+    with pytest.raises(ValueError, match="`year` must be an int"):
+        plb.clean_brfss(pl.LazyFrame(), "2019")
+
+
+# ------------------------------------------------------------------------------
+# testing def load_all_years(years, data_dir=Path("../data/cleaned"))
+# ------------------------------------------------------------------------------
+
+
+def test_load_all_years_matches_pandas(cleaned_dir):
+    expected = load_all_years(YEARS, data_dir=cleaned_dir)
+    result = plb.to_pandas(plb.load_all_years(YEARS, data_dir=cleaned_dir))
+
+    assert list(result.columns) == list(expected.columns)
+    pd.testing.assert_frame_equal(normalize(result), normalize(expected))
+
+
+def test_load_all_years_raises_without_target(tmp_path):
+    pd.DataFrame({"age": [22.0]}).to_csv(tmp_path / "brfss_cleaned_2020.csv")
+    with pytest.raises(ValueError, match="'diabetes' column missing in 2020"):
+        plb.load_all_years([2020], data_dir=tmp_path)
+
+
+def test_load_all_years_raises_on_bad_years(tmp_path):
+    with pytest.raises(ValueError, match="`years` must be a list of integers"):
+        plb.load_all_years(2020, data_dir=tmp_path)
+
+
+# ------------------------------------------------------------------------------
+# testing def prepare_common_features(lf, common_features, weight_col=None,
+#                                     levels=None)
+# ------------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize("weight_col", [None, "survey_weight"])
+def test_prepare_common_features_matches_pandas(cleaned_dir, weight_col):
+    expected = prepare_common_features(
+        load_all_years(YEARS, data_dir=cleaned_dir), FEATURES, weight_col=weight_col
+    )
+    lf = plb.prepare_common_features(
+        plb.load_all_years(YEARS, data_dir=cleaned_dir), FEATURES, weight_col=weight_col
+    )
+    result = plb.to_pandas(lf)
+
+    assert list(result.columns) == list(expected.columns)
+    pd.testing.assert_frame_equal(normalize(result), normalize(expected))
+
+
+def test_prepare_common_features_fixed_levels_match_encode_chunk(cleaned_dir):
+    features = FEATURES + ["food_insecurity"]
+    df = load_all_years([2022, 2023], data_dir=cleaned_dir)
+    X_pd, y_pd, names_pd, _ = encode_chunk(df, features)
+
+    lf = plb.prepare_common_features(
+        plb.load_all_years([2022, 2023], data_dir=cleaned_dir),
+        features,
+        levels=FEATURE_LEVELS,
+    )
+    X, y, names, w = plb.to_numpy(lf)
+
+    assert names == names_pd
+    np.testing.assert_allclose(X, X_pd)
+    np.testing.assert_array_equal(y, y_pd)
+    assert X.dtype == np.float64 and y.dtype == np.int64
+    np.testing.assert_array_equal(w, np.ones(len(y)))
+
+
+def test_prepare_common_features_raises_on_missing_feature(cleaned_dir):
+    lf = plb.load_all_years([2020], data_dir=cleaned_dir)
+    with pytest.raises(ValueError, match="missing from the DataFrame"):
+        plb.prepare_common_features(lf, ["age", "food_insecurity"])
+
+
+def test_prepare_common_features_raises_on_missing_weight(cleaned_dir):
+    lf = plb.load_all_years([2020], data_dir=cleaned_dir)
+    with pytest.raises(ValueError, match="Missing survey weight column"):
+        plb.prepare_common_features(lf, ["age"], weight_col="final_weight")
+
+
+# ------------------------------------------------------------------------------
+# testing def to_numpy(frame, weight_col=None)
+# ------------------------------------------------------------------------------
+
+
+def test_to_numpy_returns_weights(cleaned_dir):
+    lf = plb.prepare_common_features(
+        plb.load_all_years([2020], data_dir=cleaned_dir),
+        ["age", "sex"],
+        weight_col="survey_weight",
+    )
+    X, y, names, w = plb.to_numpy(lf, weight_col="survey_weight")
+
+    assert names == ["age", "sex_Male"]
+    assert X.shape == (len(y), 2)
+    assert (w > 0).all()
+
+
+def test_to_numpy_raises_on_non_polars_frame():
+    with pytest.raises(ValueError, match="polars LazyFrame or DataFrame"):
+        plb.to_numpy(pd.DataFrame({"diabetes": [1]}))
@@ -1,8 +1,10 @@
 # tests/test_preprocessing.py
 
+import numpy as np
 import pandas as pd
 import pandas.testing as pdt
 import pytest
+from scipy import sparse
 import brfss_diabetes
 from brfss_diabetes import preprocessing as pp
 
@@ -348,3 +350,103 @@ def test_prepare_common_features_warns_on_unexpected_binary_values(capfd):
     # Capture the printed output
     captured = capfd.readouterr()
     assert "Warning: Unexpected values found in column smoke_100" in captured.out
+
+
+def test_prepare_common_features_carries_weight_column():
+    df = sample_df.assign(survey_weight=[100.0, 250.0, 80.0, None])
+    result = pp.prepare_common_features(df, common_features, weight_col="survey_weight")
+    assert result["survey_weight"].tolist() == [100.0, 250.0]
+    assert not any(col.startswith("survey_weight_") for col in result.columns)
+
+
+def test_prepare_common_features_encodes_year_specific_features():
+    df = sample_df.assign(
+        drink_any=["Yes", "No", "No", "No"],
+        snap_used=["No", "Yes", "No", "Yes"],
+        fruit_low=["< 1x per day", ">= 1x per day", "< 1x per day", "< 1x per day"],
+        food_insecurity=["Never", "Always", "Rarely", "Never"],
+    )
+    features = common_features + [
+        "drink_any",
+        "snap_used",
+        "fruit_low",
+        "food_insecurity",
+    ]
+    result = pp.prepare_common_features(df, features)
+
+    assert result["drink_any"].tolist() == [1, 0]
+    assert result["snap_used"].tolist() == [0, 1]
+    assert result["fruit_low_>= 1x per day"].tolist() == [False, True]
+    assert result["food_insecurity_Never"].tolist() == [True, False]
+    assert "fruit_low" not in result.columns
+    assert "food_insecurity" not in result.columns
+
+
+def test_prepare_common_features_raises_on_missing_weight_column():
+    with pytest.raises(ValueError, match="Missing survey weight column"):
+        pp.prepare_common_features(sample_df, common_features, weight_col="wt")
+
+
+def test_prepare_common_features_raises_on_weight_column_wrong_type():
+    with pytest.raises(ValueError, match="`weight_col` must be a string"):
+        pp.prepare_common_features(sample_df, common_features, weight_col=3)
+
+
+# ------------------------------------------------------------------------------
+# testing def prepare_common_features_sparse(
+#   df: pd.DataFrame, common_features: list[str])
+#   -> tuple[sparse.csr_matrix, np.ndarray, list[str]]
+# ------------------------------------------------------------------------------
+
+
+def test_prepare_common_features_sparse_matches_dense():
+    dense = pp.prepare_common_features(sample_df, common_features)
+    X, y, names = pp.prepare_common_features_sparse(sample_df, common_features)
+
+    expected = dense.drop(columns=["diabetes"])
+    assert sparse.isspmatrix_csr(X)
+    assert names == list(expected.columns)
+    np.testing.assert_array_equal(X.toarray(), expected.to_numpy(dtype=float))
+    np.testing.assert_array_equal(y, dense["diabetes"].to_numpy())
+
+
+def test_prepare_common_features_sparse_uses_categorical_levels():
+    df = sample_df.dropna().copy()
+    df["bmi_cat"] = pd.Categorical(
+        df["bmi_cat"], categories=["Underweight", "Normal", "Overweight", "Obese"]
+    )
+    dense = pp.prepare_common_features(df, common_features)
+    X, _, names = pp.prepare_common_features_sparse(df, common_features)
+
+    assert "bmi_cat_Normal" in names
+    assert names == list(dense.drop(columns=["diabetes"]).columns)
+    assert X.nnz < X.shape[0] * X.shape[1]
+
+
+def test_prepare_common_features_sparse_encodes_year_specific_features():
+    df = sample_df.assign(
+        snap_used=["Yes", "No", "No", "Yes"],
+        food_insecurity=["Never", "Always", "Rarely", "Never"],
+    )
+    features = common_features + ["snap_used", "food_insecurity"]
+    X, _, names = pp.prepare_common_features_sparse(df, features)
+
+    assert "snap_used" in names
+    assert "food_insecurity_Never" in names
+    assert X.shape == (2, len(names))
+
+
+def test_prepare_common_features_sparse_fits_models():
+    from sklearn.linear_model import LogisticRegression
+    from xgboost import XGBClassifier
+
+    df = pd.concat([sample_df] * 5, ignore_index=True)
+    X, y, _ = pp.prepare_common_features_sparse(df, common_features)
+
+    LogisticRegression(solver="liblinear").fit(X, y)
+    XGBClassifier(n_estimators=2, max_depth=2).fit(X, y)
+
+
+def test_prepare_common_features_sparse_invalid_df_type():
+    with pytest.raises(ValueError, match="`df` must be a pandas DataFrame"):
+        pp.prepare_common_features_sparse("not a dataframe", common_features)
@@ -0,0 +1,189 @@
+# tests/test_registry.py
+
+import json
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+
+from brfss_diabetes.evaluation import find_crosspoint_threshold
+from brfss_diabetes.registry import (
+    list_models,
+    load_artifact,
+    load_model,
+    save_model,
+    standard_thresholds,
+    training_data_hash,
+)
+from brfss_diabetes.synthetic import write_cleaned_years
+
+COMMON_FEATURES = ["age", "sex", "educa", "bmi", "smoke_100"]
+ENCODED_YEARS = [2021]
+
+
+@pytest.fixture(scope="module")
+def logistic(encoded):
+    X, y = encoded
+    return LogisticRegression(max_iter=1000, class_weight="balanced").fit(X, y)
+
+
+# ------------------------------------------------------------------------------
+# testing save_model / load_model round trips
+# ------------------------------------------------------------------------------
+
+
+def test_logistic_round_trip(encoded, logistic, tmp_path):
+    X, y = encoded
+    thresholds = standard_thresholds(y, logistic.predict_proba(X)[:, 1])
+    path = save_model(
+        logistic,
+        tmp_path,
+        "logistic",
+        list(X.columns),
+        [2021],
+        thresholds=thresholds,
+        common_features=COMMON_FEATURES,
+        data_hash="abc",
+    )
+
+    assert path == tmp_path / "logistic" / "v0001"
+    assert (path / "model.npz").exists()
+
+    model, artifact = load_model(tmp_path, "logistic")
+    np.testing.assert_array_equal(model.predict_proba(X), logistic.predict_proba(X))
+    assert artifact["thresholds"] == thresholds
+    assert artifact["feature_names"] == list(X.columns)
+    assert artifact["levels"]["sex"] == ["Female", "Male"]
+    assert artifact["params"]["class_weight"] == "balanced"
+
+
+def test_logistic_params_keep_number_keys_and_list_dropped(encoded, tmp_path):
+    X, y = encoded
+    model = LogisticRegression(
+        C=np.float64(0.5), class_weight={0: 1, 1: 5}, max_iter=1000
+    ).fit(X, y)
+    model.set_params(random_state=np.random.RandomState(0))
+    save_model(model, tmp_path, "weighted", list(X.columns), [2021])
+
+    loaded, artifact = load_model(tmp_path, "weighted")
+    assert artifact["params"]["C"] == 0.5
+    assert artifact["params_numeric_keys"] == ["class_weight"]
+    assert artifact["params_dropped"] == ["random_state"]
+    assert loaded.get_params()["class_weight"] == {0: 1, 1: 5}
+    np.testing.assert_array_equal(loaded.predict_proba(X), model.predict_proba(X))
+
+
+def test_sgd_round_trip_with_schema_arrays(encoded, tmp_path):
+    X, y = encoded
+    sgd = SGDClassifier(loss="log_loss", random_state=0).fit(X, y)
+    schema = {"mean": np.arange(X.shape[1], dtype=float), "weight_col": None}
+    save_model(sgd, tmp_path, "sgd", list(X.columns), [2021], schema=schema)
+
+    model, artifact = load_model(tmp_path, "sgd")
+    np.testing.assert_array_equal(model.predict_proba(X), sgd.predict_proba(X))
+    np.testing.assert_array_equal(artifact["schema_arrays"]["mean"], schema["mean"])
+    assert artifact["schema"] == {"weight_col": None}
+
+
+def test_xgboost_round_trip_uses_ubjson(encoded, tmp_path):
+    xgb = pytest.importorskip("xgboost")
+    X, y = encoded
+    booster = xgb.XGBClassifier(n_estimators=10, max_depth=3).fit(X, y)
+    path = save_model(booster, tmp_path, "xgb", list(X.columns), [2021])
+
+    assert (path / "model.ubj").exists()
+    model, artifact = load_model(tmp_path, "xgb")
+    np.testing.assert_allclose(model.predict_proba(X), booster.predict_proba(X))
+    assert artifact["kind"] == "xgboost"
+
+
+def test_save_model_rejects_unsupported_model(tmp_path):
+    with pytest.raises(ValueError, match="Unsupported model"):
+        save_model(object(), tmp_path, "x", ["a"], [2021])
+
+
+def test_save_model_rejects_bad_tag(logistic, tmp_path):
+    with pytest.raises(ValueError, match="`tag` must be"):
+        save_model(logistic, tmp_path, "../escape", ["a"], [2021])
+
+
+# ------------------------------------------------------------------------------
+# testing list_models / load by tag, version and year range
+# ------------------------------------------------------------------------------
+
+
+def test_versions_and_year_range_selection(encoded, logistic, tmp_path):
+    X, _ = encoded
+    names = list(X.columns)
+    save_model(logistic, tmp_path, "logistic", names, [2019, 2020])
+    save_model(logistic, tmp_path, "logistic", names, [2019, 2020, 2021])
+    save_model(logistic, tmp_path, "recent", names, [2022, 2023])
+
+    table = list_models(tmp_path)
+    assert len(table) == 3
+    assert list_models(tmp_path, tag="logistic")["version"].tolist() == [1, 2]
+    assert list_models(tmp_path, years=(2022, 2023))["tag"].tolist() == ["recent"]
+
+    assert load_artifact(tmp_path, "logistic")["version"] == 2
+    assert load_artifact(tmp_path, "logistic", version=1)["train_years"] == [2019, 2020]
+    assert load_artifact(tmp_path, years=(2019, 2020))["train_years"] == [2019, 2020]
+
+
+def test_load_artifact_raises_when_nothing_matches(tmp_path):
+    with pytest.raises(FileNotFoundError, match="No model"):
+        load_artifact(tmp_path, "missing")
+    with pytest.raises(FileNotFoundError, match="No version 3"):
+        load_artifact(tmp_path, "missing", version=3)
+
+
+def test_list_models_raises_on_bad_years(tmp_path):
+    with pytest.raises(ValueError, match="`years` must be a"):
+        list_models(tmp_path, years=[2019, 2020])
+
+
+def test_load_artifact_is_fast_and_skips_sklearn(encoded, logistic, tmp_path):
+    X, _ = encoded
+    save_model(logistic, tmp_path, "logistic", list(X.columns), [2021])
+
+    code = (
+        "import sys, time\n"
+        "from pathlib import Path\n"
+        "from brfss_diabetes.registry import load_artifact\n"
+        "t = time.perf_counter()\n"
+        f"load_artifact(Path({str(tmp_path)!r}), 'logistic')\n"
+        "print(time.perf_counter() - t, 'sklearn' in sys.modules)\n"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout.split()
+    assert float(out[0]) < 0.1
+    assert out[1] == "False"
+
+
+# ------------------------------------------------------------------------------
+# testing standard_thresholds and training_data_hash
+# ------------------------------------------------------------------------------
+
+
+def test_standard_thresholds_orders_recall_and_precision_leaning():
+    rng = np.random.default_rng(0)
+    y = rng.integers(0, 2, 2_000)
+    p = np.clip(0.3 * y + rng.random(2_000) * 0.7, 0, 1)
+    thresholds = standard_thresholds(y, p)
+
+    assert set(thresholds) == {"f2", "f0.5", "crosspoint"}
+    assert thresholds["f2"] <= thresholds["f0.5"]
+    assert thresholds["crosspoint"] == find_crosspoint_threshold(y, p)
+
+
+def test_training_data_hash_tracks_file_contents(tmp_path):
+    write_cleaned_years([2019, 2020], 200, tmp_path)
+    first = training_data_hash([2020, 2019], data_dir=tmp_path)
+    assert first == training_data_hash([2019, 2020], data_dir=tmp_path)
+
+    write_cleaned_years([2020], 200, tmp_path, seed=5)
+    assert training_data_hash([2019, 2020], data_dir=tmp_path) != first
@@ -0,0 +1,81 @@
+# tests/test_resources.py
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+from threadpoolctl import threadpool_info
+
+from brfss_diabetes.resources import (
+    available_cores,
+    configure,
+    cpu_budget,
+    init_worker_threads,
+    limit_threads,
+    plan,
+)
+
+
+@pytest.fixture(autouse=True)
+def default_budget(monkeypatch):
+    monkeypatch.delenv("BRFSS_CPU_BUDGET", raising=False)
+    yield
+    configure(None)
+
+
+def _pool_thread_limits():
+    # Touch BLAS so its thread pool is loaded
+    np.ones((2, 2)) @ np.ones((2, 2))
+    return {info["user_api"]: info["num_threads"] for info in threadpool_info()}
+
+
+# ------------------------------------------------------------------------------
+# testing configure, cpu_budget and plan
+# ------------------------------------------------------------------------------
+
+
+def test_budget_defaults_to_available_cores():
+    assert cpu_budget() == available_cores() >= 1
+
+
+def test_budget_from_environment_and_configure(monkeypatch):
+    monkeypatch.setenv("BRFSS_CPU_BUDGET", "6")
+    assert cpu_budget() == 6
+    configure(3)
+    assert cpu_budget() == 3
+
+
+def test_plan_splits_budget_between_workers_and_threads():
+    configure(8)
+    assert plan(1) == {"workers": 1, "threads": 8}
+    assert plan(3) == {"workers": 3, "threads": 2}
+    assert plan(16) == {"workers": 8, "threads": 1}
+
+
+def test_plan_and_configure_raise_on_bad_values(monkeypatch):
+    with pytest.raises(ValueError, match="`n_workers` must be"):
+        plan(0)
+    with pytest.raises(ValueError, match="`total_cores` must be"):
+        configure(-1)
+    monkeypatch.setenv("BRFSS_CPU_BUDGET", "all")
+    with pytest.raises(ValueError, match="BRFSS_CPU_BUDGET"):
+        cpu_budget()
+
+
+# ------------------------------------------------------------------------------
+# testing limit_threads and init_worker_threads
+# ------------------------------------------------------------------------------
+
+
+def test_limit_threads_caps_blas_in_block():
+    with limit_threads(3):
+        limits = _pool_thread_limits()
+    assert limits and all(n == 3 for n in limits.values())
+
+
+def test_init_worker_threads_caps_pool_workers():
+    with ProcessPoolExecutor(
+        max_workers=1, initializer=init_worker_threads, initargs=(3,)
+    ) as pool:
+        limits = pool.submit(_pool_thread_limits).result()
+    assert limits and all(n == 3 for n in limits.values())
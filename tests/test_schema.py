@@ -0,0 +1,91 @@
+# tests/test_schema.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from brfss_diabetes.config import SURVEY_DESIGN_VARS, VARS_BY_YEAR, VARS_COMMON
+from brfss_diabetes.schema import SchemaError, raw_schema, validate_raw
+from brfss_diabetes.synthetic import make_raw_brfss
+
+# ------------------------------------------------------------------------------
+# testing def raw_schema(year)
+# ------------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize("year", sorted(VARS_BY_YEAR))
+def test_raw_schema_lists_year_columns(year):
+    assert list(raw_schema(year)) == (
+        VARS_COMMON + SURVEY_DESIGN_VARS + VARS_BY_YEAR[year]
+    )
+
+
+def test_raw_schema_raises_on_unknown_year():
+    with pytest.raises(ValueError, match="No schema for year 2030"):
+        raw_schema(2030)
+
+
+def test_raw_schema_raises_on_non_int_year():
+    with pytest.raises(ValueError, match="`year` must be an int"):
+        raw_schema("2019")
+
+
+# ------------------------------------------------------------------------------
+# testing def validate_raw(df, year, raise_errors=True)
+# ------------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize("year", sorted(VARS_BY_YEAR))
+def test_validate_raw_accepts_synthetic_years(year):
+    report = validate_raw(make_raw_brfss(year, 5_000), year)
+    assert report.empty
+    assert list(report.columns) == ["column", "check", "detail", "rows"]
+
+
+def test_validate_raw_design_columns_are_optional():
+    df = make_raw_brfss(2020, 100).drop(columns=SURVEY_DESIGN_VARS)
+    assert validate_raw(df, 2020).empty
+
+
+def test_validate_raw_aggregates_all_violations():
+    df = make_raw_brfss(2022, 1_000).drop(columns=["SEXVAR"])
+    df.loc[:4, "DIABETE4"] = 5
+    df.loc[:1, "SDHFOOD1"] = 6
+    df.loc[:2, "_BMI5"] = 12_000
+    df["EDUCA"] = df["EDUCA"].astype(str)
+
+    report = validate_raw(df, 2022, raise_errors=False)
+    checks = {(row.column, row.check): row for row in report.itertuples()}
+
+    assert set(checks) == {
+        ("SEXVAR", "missing"),
+        ("DIABETE4", "codes"),
+        ("SDHFOOD1", "codes"),
+        ("_BMI5", "range"),
+        ("EDUCA", "dtype"),
+    }
+    assert checks[("DIABETE4", "codes")].rows == 5
+    assert "unexpected codes: 5" in checks[("DIABETE4", "codes")].detail
+    assert checks[("_BMI5", "range")].rows == 3
+
+
+def test_validate_raw_raises_schema_error_with_report():
+    df = make_raw_brfss(2019, 200)
+    df.loc[:9, "_FRTLT1A"] = 3
+
+    with pytest.raises(SchemaError, match="_FRTLT1A") as excinfo:
+        validate_raw(df, 2019)
+
+    assert isinstance(excinfo.value, ValueError)
+    assert excinfo.value.report["rows"].tolist() == [10]
+
+
+def test_validate_raw_ignores_blanks():
+    df = make_raw_brfss(2021, 200)
+    df["SMOKE100"] = np.nan
+    assert validate_raw(df, 2021).empty
+
+
+def test_validate_raw_raises_on_non_dataframe():
+    with pytest.raises(ValueError, match="must be a pandas DataFrame"):
+        validate_raw("not_a_df", 2019)
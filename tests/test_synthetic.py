@@ -0,0 +1,96 @@
+# tests/test_synthetic.py
+
+import numpy as np
+import pandas as pd
+import pytest
+from pathlib import Path
+
+from brfss_diabetes.config import SURVEY_DESIGN_VARS, VARS_BY_YEAR, VARS_COMMON
+from brfss_diabetes.io import load_all_years
+from brfss_diabetes.synthetic import (
+    make_raw_brfss,
+    make_cleaned_brfss,
+    write_cleaned_years,
+)
+
+# ------------------------------------------------------------------------------
+# testing def make_raw_brfss(year, n_rows, seed=SEED)
+# ------------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize("year", sorted(VARS_BY_YEAR))
+def test_make_raw_brfss_follows_year_schema(year):
+    df = make_raw_brfss(year, 500)
+    assert list(df.columns) == VARS_COMMON + SURVEY_DESIGN_VARS + VARS_BY_YEAR[year]
+    assert len(df) == 500
+    assert all(df[col].dtype == np.float64 for col in df.columns)
+
+
+def test_make_raw_brfss_emits_missing_codes():
+    df = make_raw_brfss(2023, 20_000)
+    assert {7, 9} <= set(df["DIABETE4"].dropna().unique())
+    assert 14 in set(df["_AGEG5YR"].unique())
+    assert 9 in set(df["EDUCA"].unique())
+    assert (df["_BMI5"] == 9999).any()
+    assert df["_BMI5"].isna().any()
+    assert {7, 9} <= set(df["SDHFOOD1"].dropna().unique())
+
+
+def test_make_raw_brfss_is_reproducible():
+    pd.testing.assert_frame_equal(
+        make_raw_brfss(2019, 100, seed=1), make_raw_brfss(2019, 100, seed=1)
+    )
+    assert not make_raw_brfss(2019, 100, seed=1).equals(
+        make_raw_brfss(2019, 100, seed=2)
+    )
+
+
+def test_make_raw_brfss_raises_on_unknown_year():
+    with pytest.raises(ValueError, match="No schema for year 1999"):
+        make_raw_brfss(1999, 10)
+
+
+def test_make_raw_brfss_raises_on_bad_inputs():
+    with pytest.raises(ValueError, match="`year` must be an int"):
+        make_raw_brfss("2019", 10)
+    with pytest.raises(ValueError, match="`n_rows` must be a non-negative int"):
+        make_raw_brfss(2019, -1)
+
+
+# ------------------------------------------------------------------------------
+# testing def make_cleaned_brfss(year, n_rows, seed=SEED)
+# ------------------------------------------------------------------------------
+
+
+def test_make_cleaned_brfss_has_cleaned_layout():
+    df = make_cleaned_brfss(2022, 2000)
+    assert df.columns[-1] == "diabetes"
+    assert {"age", "sex", "bmi_cat", "food_insecurity", "survey_weight"} <= set(
+        df.columns
+    )
+    assert set(df["diabetes"].unique()) == {"Yes", "No"}
+    assert 0.05 < (df["diabetes"] == "Yes").mean() < 0.25
+
+
+# ------------------------------------------------------------------------------
+# testing def write_cleaned_years(years, n_rows, data_dir, seed=SEED)
+# ------------------------------------------------------------------------------
+
+
+def test_write_cleaned_years_round_trips_through_load_all_years(tmp_path):
+    paths = write_cleaned_years([2020, 2021], 300, tmp_path)
+    assert [p.name for p in paths] == [
+        "brfss_cleaned_2020.csv",
+        "brfss_cleaned_2021.csv",
+    ]
+
+    df_all = load_all_years([2020, 2021], data_dir=tmp_path)
+    assert set(df_all["year"]) == {2020, 2021}
+    assert df_all.columns[-1] == "diabetes"
+
+
+def test_write_cleaned_years_raises_on_bad_inputs():
+    with pytest.raises(ValueError, match="`years` must be a list of integers"):
+        write_cleaned_years(2020, 10, Path("."))
+    with pytest.raises(ValueError, match="`data_dir` must be a pathlib.Path"):
+        write_cleaned_years([2020], 10, "data")
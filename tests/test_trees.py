@@ -0,0 +1,136 @@
+# tests/test_trees.py
+
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LogisticRegression
+from xgboost import XGBClassifier, XGBRegressor
+
+from brfss_diabetes.trees import (
+    export_trees,
+    load_trees,
+    predict_margin,
+    predict_proba,
+)
+
+N_FEATURES = 8
+
+
+def make_data(n, seed, missing=0.1):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, N_FEATURES)).astype(np.float32)
+    z = 2 * X[:, 0] + X[:, 1] - 1 + 3 * (X[:, 2] * X[:, 3] > 0.5)
+    y = (rng.random(n) < 1 / (1 + np.exp(-z))).astype(int)
+    X[rng.random(X.shape) < missing] = np.nan
+    return X, y
+
+
+@pytest.fixture(scope="module")
+def xgb():
+    X, y = make_data(5_000, 0)
+    return XGBClassifier(n_estimators=60, max_depth=5, random_state=0).fit(X, y)
+
+
+# ------------------------------------------------------------------------------
+# testing export_trees, predict_margin and predict_proba
+# ------------------------------------------------------------------------------
+
+
+def test_predict_proba_matches_xgboost_with_missing_values(xgb):
+    X, _ = make_data(3_000, 1)
+    trees = export_trees(xgb)
+
+    np.testing.assert_allclose(
+        predict_proba(trees, X), xgb.predict_proba(X)[:, 1], atol=1e-6
+    )
+    np.testing.assert_allclose(
+        predict_margin(trees, X), xgb.predict(X, output_margin=True), atol=1e-5
+    )
+
+
+def test_export_keeps_trees_up_to_best_iteration():
+    X, y = make_data(4_000, 2)
+    X_valid, y_valid = make_data(1_000, 3)
+    model = XGBClassifier(
+        n_estimators=300, learning_rate=0.5, early_stopping_rounds=5, random_state=0
+    )
+    model.fit(X, y, eval_set=[(X_valid, y_valid)], verbose=False)
+    assert model.best_iteration < 299
+
+    trees = export_trees(model)
+    assert len(trees["roots"]) == model.best_iteration + 1
+    np.testing.assert_allclose(
+        predict_proba(trees, X_valid), model.predict_proba(X_valid)[:, 1], atol=1e-6
+    )
+
+
+def test_dataframe_columns_are_reordered_by_name():
+    X, y = make_data(2_000, 4)
+    df = pd.DataFrame(X, columns=[f"x{i}" for i in range(N_FEATURES)])
+    model = XGBClassifier(n_estimators=20, max_depth=3).fit(df, y)
+    trees = export_trees(model)
+
+    shuffled = df[df.columns[::-1]]
+    np.testing.assert_allclose(
+        predict_proba(trees, shuffled), model.predict_proba(df)[:, 1], atol=1e-6
+    )
+
+
+def test_single_row_is_accepted(xgb):
+    X, _ = make_data(1, 5)
+    trees = export_trees(xgb)
+    np.testing.assert_allclose(
+        predict_proba(trees, X[0]), xgb.predict_proba(X)[:, 1], atol=1e-6
+    )
+
+
+def test_export_raises_on_unsupported_models():
+    X, y = make_data(500, 6, missing=0.0)
+    with pytest.raises(ValueError, match="objectives"):
+        export_trees(XGBRegressor(n_estimators=2).fit(X, y))
+    with pytest.raises(ValueError, match="XGBoost model"):
+        export_trees(LogisticRegression().fit(X, y))
+
+
+def test_predict_raises_on_wrong_width(xgb):
+    with pytest.raises(ValueError, match=f"{N_FEATURES} columns"):
+        predict_proba(export_trees(xgb), np.zeros((3, N_FEATURES - 1)))
+
+
+# ------------------------------------------------------------------------------
+# testing save_trees and load_trees
+# ------------------------------------------------------------------------------
+
+
+def test_save_load_round_trip(xgb, tmp_path):
+    X, _ = make_data(500, 7)
+    trees = export_trees(xgb, tmp_path / "trees.npz")
+    loaded = load_trees(tmp_path / "trees.npz")
+
+    assert loaded["depth"] == trees["depth"]
+    assert loaded["feature_names"] == trees["feature_names"]
+    np.testing.assert_array_equal(predict_proba(loaded, X), predict_proba(trees, X))
+
+
+def test_load_trees_raises_on_bad_path():
+    with pytest.raises(ValueError, match="`path` must be"):
+        load_trees(42)
+
+
+def test_scoring_from_file_skips_xgboost(xgb, tmp_path):
+    export_trees(xgb, tmp_path / "trees.npz")
+    code = (
+        "import sys\n"
+        "import numpy as np\n"
+        "from brfss_diabetes.trees import load_trees, predict_proba\n"
+        f"trees = load_trees({str(tmp_path / 'trees.npz')!r})\n"
+        f"predict_proba(trees, np.zeros((4, {N_FEATURES}), dtype=np.float32))\n"
+        "print('xgboost' in sys.modules)\n"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout.split()
+    assert out == ["False"]
@@ -0,0 +1,136 @@
+# tests/test_xport.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from brfss_diabetes.config import SURVEY_DESIGN_VARS, VARS_BY_YEAR, VARS_COMMON
+from brfss_diabetes.synthetic import make_raw_brfss
+from brfss_diabetes.xport import (
+    ibm_to_ieee,
+    ieee_to_ibm,
+    read_xport,
+    read_xport_header,
+    write_xport,
+)
+
+KEEP_2023 = VARS_COMMON + SURVEY_DESIGN_VARS + VARS_BY_YEAR[2023]
+
+
+@pytest.fixture(scope="module")
+def llcp_like(tmp_path_factory):
+    # The kept variables scattered among filler variables, as in an LLCP file
+    rng = np.random.default_rng(0)
+    raw = make_raw_brfss(2023, 2_000)
+    filler = pd.DataFrame(
+        {f"X{i:03d}": rng.integers(1, 10, len(raw)).astype(float) for i in range(40)}
+    )
+    filler["IDATE"] = rng.choice(["01022023", "12312023"], len(raw))
+    df = pd.concat([filler.iloc[:, :20], raw, filler.iloc[:, 20:]], axis=1)
+    path = tmp_path_factory.mktemp("xpt") / "LLCP2023.XPT"
+    write_xport(df, path, name="LLCP2023")
+    return df, path
+
+
+def assert_matches_read_sas(ours, theirs):
+    # pd.read_sas decodes an exact IBM zero as 2**-260 instead of 0.0
+    theirs = theirs.mask(theirs == 2.0**-260, 0.0)
+    pd.testing.assert_frame_equal(ours, theirs)
+
+
+# ------------------------------------------------------------------------------
+# testing read_xport against pd.read_sas
+# ------------------------------------------------------------------------------
+
+
+def test_selected_columns_match_read_sas(llcp_like):
+    _, path = llcp_like
+    expected = pd.read_sas(path, format="xport", encoding="utf-8")[KEEP_2023]
+    assert_matches_read_sas(read_xport(path, KEEP_2023), expected)
+
+
+def test_all_columns_match_read_sas(llcp_like):
+    df, path = llcp_like
+    expected = pd.read_sas(path, format="xport", encoding="utf-8")
+    result = read_xport(path)
+    assert list(result.columns) == list(df.columns)
+    assert_matches_read_sas(result, expected)
+
+
+def test_round_trip_is_exact_and_keeps_missing(tmp_path):
+    df = pd.DataFrame(
+        {
+            "A": [0.0, -3.25, 1 / 3, 5e70, 1e-70, np.nan, 0.1, 5.397605346934028e-79],
+            "B": ["x", "yy", "", " z", None, "zz", "é", "q"],
+        }
+    )
+    path = tmp_path / "t.xpt"
+    write_xport(df, path)
+
+    result = read_xport(path)
+    np.testing.assert_array_equal(result["A"], df["A"])
+    assert result["B"].tolist() == ["x", "yy", "", " z", "", "zz", "é", "q"]
+
+
+def test_short_rows_ignore_blank_padding(tmp_path):
+    # 8-byte rows leave the last card mostly blank
+    df = pd.DataFrame({"A": [1.0, 2.0, 3.0]})
+    path = tmp_path / "t.xpt"
+    write_xport(df, path)
+    assert read_xport_header(path)["n_rows"] == 3
+    assert read_xport(path)["A"].tolist() == [1.0, 2.0, 3.0]
+
+
+def test_read_xport_header_lists_variables(llcp_like):
+    df, path = llcp_like
+    header = read_xport_header(path)
+    assert header["name"] == "LLCP2023"
+    assert header["n_rows"] == len(df)
+    assert [v["name"] for v in header["variables"]] == list(df.columns)
+    idate = next(v for v in header["variables"] if v["name"] == "IDATE")
+    assert idate["type"] == "char" and idate["length"] == 8
+
+
+def test_read_xport_raises_on_unknown_column(llcp_like):
+    _, path = llcp_like
+    with pytest.raises(ValueError, match="NOPE"):
+        read_xport(path, ["DIABETE4", "NOPE"])
+
+
+def test_read_xport_raises_on_non_xport_file(tmp_path):
+    path = tmp_path / "t.csv"
+    path.write_text("a,b\n1,2\n" * 20)
+    with pytest.raises(ValueError, match="not a SAS XPORT"):
+        read_xport(path)
+
+
+# ------------------------------------------------------------------------------
+# testing ibm_to_ieee and ieee_to_ibm
+# ------------------------------------------------------------------------------
+
+
+def test_ibm_known_encodings():
+    # 1.0 = 0x41100000..., -118.625 = 0xC276A000... (IBM's own example)
+    field = np.array(
+        [
+            [0x41, 0x10, 0, 0, 0, 0, 0, 0],
+            [0xC2, 0x76, 0xA0, 0, 0, 0, 0, 0],
+            [0x2E, 0, 0, 0, 0, 0, 0, 0],
+            [0x5F, 0, 0, 0, 0, 0, 0, 0],
+            [0, 0, 0, 0, 0, 0, 0, 0],
+        ],
+        dtype=np.uint8,
+    )
+    result = ibm_to_ieee(field)
+    np.testing.assert_array_equal(result, [1.0, -118.625, np.nan, np.nan, 0.0])
+    np.testing.assert_array_equal(ieee_to_ibm([1.0, -118.625])[:, :3], field[:2, :3])
+
+
+def test_ibm_truncated_fields_are_zero_padded():
+    full = ieee_to_ibm([2.5, 7.0])
+    np.testing.assert_array_equal(ibm_to_ieee(full[:, :3]), [2.5, 7.0])
+
+
+def test_ieee_to_ibm_raises_out_of_range():
+    with pytest.raises(ValueError, match="IBM float range"):
+        ieee_to_ibm([1e300])